@@ -1,35 +1,392 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import requests
 import allure
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from config import config
+from json_stream import StreamedResponse
+from rate_limiter import backoff_delay, parse_retry_after, shared_rate_limiter
+from response_schema import TicketValidator
 
 
-class AviasalesAPI:
-    """Клиент для работы с API Aviasales."""
+class RequestStats:
+    """Статистика HTTP-запросов: задержки и переиспользование соединений."""
 
-    def search_one_way(self, origin: str, destination: str, departure_at: str) -> dict:
-        url = f"{config.API_BASE_URL}prices_for_dates"
-        params = {
-            "origin": origin,
-            "destination": destination,
-            "departure_at": departure_at,
-            "token": config.API_TOKEN
+    def __init__(self):
+        self.latencies = []
+        self.new_connections = 0
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, new_connections: int):
+        with self._lock:
+            self.latencies.append(latency)
+            self.new_connections += new_connections
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def reused_connections(self) -> int:
+        return max(0, self.requests - self.new_connections)
+
+    def percentile(self, percent: float) -> float:
+        """Возвращает перцентиль задержки в секундах (0, если запросов не было)."""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def summary(self) -> dict:
+        total = sum(self.latencies)
+        return {
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "reused_connections": self.reused_connections,
+            "total_time": total,
+            "avg_latency": total / self.requests if self.requests else 0.0,
+            "p50_latency": self.percentile(50),
+            "p95_latency": self.percentile(95),
         }
 
+    def report(self) -> str:
+        s = self.summary()
+        return (f"Запросов: {s['requests']}, новых соединений: {s['new_connections']}, "
+                f"переиспользовано: {s['reused_connections']}, "
+                f"средняя задержка: {s['avg_latency'] * 1000:.1f} мс, "
+                f"p95: {s['p95_latency'] * 1000:.1f} мс")
+
+
+class AviasalesAPI:
+    """Клиент для работы с API Aviasales.
+
+    Все запросы идут через одну долгоживущую сессию с пулом keep-alive
+    соединений, поэтому TCP/TLS-рукопожатие выполняется один раз на соединение,
+    а не на каждый запрос. Запросы идут на config.API_BASE_URL, если клиенту
+    не задан свой base_url.
+    """
+
+    def __init__(self, pool_size: int = None, retries: int = None, timeout: float = None,
+                 cache=None, rate_limiter=None, throttle_retries: int = None,
+                 base_url: str = None):
+        self.base_url = base_url
+        self.timeout = config.API_TIMEOUT if timeout is None else timeout
+        pool_size = config.API_POOL_SIZE if pool_size is None else pool_size
+        retries = config.API_RETRIES if retries is None else retries
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=0.3,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({"GET"}),
+            # Retry-After и ответы 429 обрабатывает ограничитель частоты
+            respect_retry_after_header=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                              max_retries=retry)
+        self.session = requests.Session()
+        self.session.headers.update({"Connection": "keep-alive"})
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.stats = RequestStats()
+        self._pool_connections = {}
+        self._pool_lock = threading.Lock()
+        self.cache = cache
+        # По умолчанию ограничитель частоты общий для всех клиентов процесса
+        self.rate_limiter = rate_limiter or shared_rate_limiter()
+        self.throttle_retries = (config.API_THROTTLE_RETRIES if throttle_retries is None
+                                 else throttle_retries)
+
+    def close(self):
+        """Закрывает сессию и все соединения пула."""
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _get(self, endpoint: str, params: dict) -> dict:
+        """Выполняет GET-запрос через общую сессию и учитывает его в статистике.
+
+        Если подключён кэш, успешные ответы берутся из него и сохраняются в него.
+        Перед запросом берётся токен ограничителя частоты; на ответ 429 запрос
+        повторяется с экспоненциальной задержкой, а ограничитель снижает скорость.
+        """
         with allure.step(f"API запрос: {params}"):
-            response = requests.get(url, params=params, timeout=10)
-            return response.json()
+            if self.cache is not None:
+                cached = self.cache.get(endpoint, params)
+                if cached is not None:
+                    return cached
 
-    def search_round_trip(self, origin: str, destination: str,
-                          departure_at: str, return_at: str) -> dict:
-        url = f"{config.API_BASE_URL}prices_for_dates"
+            response = self._request(endpoint, params)
+            data = response.json()
+
+            if self.cache is not None and response.ok and data.get("success"):
+                self.cache.set(endpoint, params, data)
+            return data
+
+    def _request(self, endpoint: str, params: dict, stream: bool = False):
+        """Отправляет запрос с учётом ограничителя частоты и повторов после 429.
+
+        С stream=True возвращается ответ, тело которого ещё не прочитано.
+        """
+        url = f"{self.base_url or config.API_BASE_URL}{endpoint}"
+        for attempt in range(self.throttle_retries + 1):
+            self.rate_limiter.acquire(endpoint)
+            start = time.perf_counter()
+            response = self.session.get(url, params=params, timeout=self.timeout, stream=stream)
+            self.stats.record(time.perf_counter() - start,
+                              new_connections=self._new_connections(response))
+            if response.status_code != 429:
+                self.rate_limiter.on_success(endpoint)
+                break
+            self.rate_limiter.on_throttle(
+                endpoint, parse_retry_after(response.headers.get("Retry-After")))
+            if attempt < self.throttle_retries:
+                # Соединение возвращается в пул, даже если тело 429 не читалось
+                response.close()
+                time.sleep(backoff_delay(attempt))
+        return response
+
+    def _new_connections(self, response) -> int:
+        """Возвращает число соединений, открытых пулом urllib3 с прошлого ответа."""
+        pool = getattr(response.raw, "_pool", None)
+        if pool is None:
+            return 1
+        with self._pool_lock:
+            opened = pool.num_connections - self._pool_connections.get(pool, 0)
+            self._pool_connections[pool] = pool.num_connections
+        return opened
+
+    @staticmethod
+    def build_search(origin: str, destination: str, departure_at: str,
+                     return_at: str = None, limit: int = None, page: int = None) -> tuple:
+        """Собирает endpoint и параметры запроса prices_for_dates.
+
+        Единая точка построения запроса для синхронного и асинхронного клиентов.
+        """
         params = {
             "origin": origin,
             "destination": destination,
             "departure_at": departure_at,
-            "return_at": return_at,
-            "token": config.API_TOKEN
         }
+        if return_at is not None:
+            params["return_at"] = return_at
+        if limit is not None:
+            params["limit"] = limit
+        if page is not None:
+            params["page"] = page
+        params["token"] = config.API_TOKEN
+        return "prices_for_dates", params
 
-        with allure.step(f"API запрос: {params}"):
-            response = requests.get(url, params=params, timeout=10)
-            return response.json()
\ No newline at end of file
+    def search(self, origin: str, destination: str, departure_at: str,
+               return_at: str = None, limit: int = None, page: int = None) -> dict:
+        """Поиск в одну сторону или туда-обратно (если указан return_at)."""
+        return self._get(*self.build_search(origin, destination, departure_at,
+                                            return_at, limit, page))
+
+    def search_one_way(self, origin: str, destination: str, departure_at: str,
+                       limit: int = None, page: int = None) -> dict:
+        return self.search(origin, destination, departure_at, limit=limit, page=page)
+
+    def search_round_trip(self, origin: str, destination: str,
+                          departure_at: str, return_at: str,
+                          limit: int = None, page: int = None) -> dict:
+        return self.search(origin, destination, departure_at, return_at, limit, page)
+
+    def stream_search(self, origin: str, destination: str, departure_at: str,
+                      return_at: str = None, limit: int = None, page: int = None,
+                      validate: bool = True) -> StreamedResponse:
+        """Как search(), но билеты из data разбираются по мере чтения тела ответа.
+
+        Подходит для больших ответов: в памяти одновременно только чанк тела
+        и текущий билет. Билеты проверяются по схеме endpoint (validator
+        ответа собирает нарушения). Если подключён кэш и ответ в нём есть,
+        тот же разбор идёт по закэшированному ответу без запроса; сам потоковый
+        ответ в кэш не сохраняется, так как целиком в памяти не держится.
+        Ответ нужно дочитать или закрыть:
+
+            with api.stream_search("MOW", "LED", "2026-02") as response:
+                for ticket in response:
+                    ...
+            assert response.get("success") and not response.validator.violations
+        """
+        endpoint, params = self.build_search(origin, destination, departure_at,
+                                             return_at, limit, page)
+        validator = TicketValidator(endpoint) if validate else None
+        with allure.step(f"API запрос (потоковый разбор): {params}"):
+            if self.cache is not None:
+                cached = self.cache.get(endpoint, params)
+                if cached is not None:
+                    return StreamedResponse.from_data(cached, validator=validator)
+            response = self._request(endpoint, params, stream=True)
+        return StreamedResponse.from_response(response, config.API_STREAM_CHUNK_SIZE,
+                                              validator=validator)
+
+    def iter_prices(self, origin: str, destination: str, departure_at: str,
+                    return_at: str = None, page_size: int = 100, max_items: int = None):
+        """Лениво перебирает билеты prices_for_dates постранично.
+
+        Пока вызывающий код обрабатывает текущую страницу, следующая загружается
+        в фоне. В памяти одновременно не больше двух страниц; если перебор
+        прерван, ненужная предзагрузка отменяется.
+
+        С max_items запрашивается столько билетов, сколько нужно: страницы
+        берутся одинакового размера, а последняя уменьшается до остатка, если
+        её смещение делится на остаток (API считает смещение как
+        (page - 1) * limit). Иначе лишних билетов запрашивается меньше,
+        чем страниц: для max_items=250, page_size=100 — три страницы по 84.
+        """
+        if max_items is not None:
+            pages = -(-max_items // page_size)
+            page_size = -(-max_items // pages)
+
+        def fetch(page: int, limit: int) -> dict:
+            return self.search(origin, destination, departure_at, return_at,
+                               limit=limit, page=page)
+
+        def next_request(page: int, fetched: int) -> tuple:
+            """(page, limit) запроса, следующего за страницей page."""
+            left = None if max_items is None else max_items - fetched
+            if left is not None and left < page_size and fetched % left == 0:
+                return fetched // left + 1, left
+            return page + 1, page_size
+
+        executor = ThreadPoolExecutor(max_workers=1)
+        page, limit, fetched = 1, page_size, 0
+        remaining = max_items
+        future = executor.submit(fetch, page, limit)
+        try:
+            while future is not None:
+                response = future.result()
+                if not response.get("success"):
+                    raise RuntimeError(f"API вернул ошибку на странице {page}: {response}")
+                data = response.get("data", [])
+                fetched += len(data)
+
+                future = None
+                has_more = len(data) == limit
+                needs_more = remaining is None or remaining > len(data)
+                if has_more and needs_more:
+                    page, limit = next_request(page, fetched)
+                    future = executor.submit(fetch, page, limit)
+
+                for ticket in data:
+                    yield ticket
+                    if remaining is not None:
+                        remaining -= 1
+                        if remaining == 0:
+                            return
+        finally:
+            if future is not None:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+
+class SearchResult:
+    """Результат одного запроса из пакета: ответ API либо ошибка."""
+
+    def __init__(self, index: int, query, response: dict = None, error: Exception = None):
+        self.index = index
+        self.query = query
+        self.response = response
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self):
+        status = "ok" if self.ok else f"error={self.error!r}"
+        return f"SearchResult(index={self.index}, query={self.query!r}, {status})"
+
+
+class AsyncAviasalesAPI:
+    """Асинхронный клиент для пакетного поиска с ограничением параллелизма.
+
+    Запросы выполняются синхронным AviasalesAPI в пуле потоков, поэтому
+    построение URL и параметров, пул соединений и статистика общие для обоих клиентов.
+    Запрос задаётся кортежем (origin, destination, departure_at[, return_at])
+    или словарём с теми же ключами. Пул потоков принадлежит клиенту
+    и закрывается в close() без ожидания начатых запросов.
+    """
+
+    def __init__(self, client: AviasalesAPI = None):
+        self._owns_client = client is None
+        self.client = AviasalesAPI() if client is None else client
+        self._executor = None
+        self._max_workers = 0
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        if self._owns_client:
+            self.client.close()
+
+    def _executor_for(self, concurrency: int) -> ThreadPoolExecutor:
+        """Пул потоков клиента не меньше concurrency (при нехватке заменяется на больший)."""
+        if self._executor is None or self._max_workers < concurrency:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+            self._executor = ThreadPoolExecutor(max_workers=concurrency)
+            self._max_workers = concurrency
+        return self._executor
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+    @staticmethod
+    def _query_args(query) -> dict:
+        if isinstance(query, dict):
+            return query
+        return dict(zip(("origin", "destination", "departure_at", "return_at"), query))
+
+    async def _run(self, executor, semaphore, index: int, query) -> SearchResult:
+        loop = asyncio.get_running_loop()
+        async with semaphore:
+            try:
+                kwargs = self._query_args(query)
+                response = await loop.run_in_executor(
+                    executor, lambda: self.client.search(**kwargs))
+                return SearchResult(index, query, response=response)
+            except Exception as error:
+                return SearchResult(index, query, error=error)
+
+    async def iter_completed(self, queries, concurrency: int = 10):
+        """Выдаёт результаты по мере завершения запросов (порядок не сохраняется).
+
+        Ошибка отдельного запроса не прерывает пакет: она возвращается
+        в SearchResult.error. Если перебор прерван, ещё не начатые запросы
+        отменяются, а цикл событий не ждёт уже выполняющихся.
+        """
+        queries = list(queries)
+        semaphore = asyncio.Semaphore(concurrency)
+        executor = self._executor_for(concurrency)
+        tasks = [asyncio.ensure_future(self._run(executor, semaphore, index, query))
+                 for index, query in enumerate(queries)]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def search_many(self, queries, concurrency: int = 10) -> list:
+        """Выполняет все запросы и возвращает результаты в порядке входных запросов."""
+        queries = list(queries)
+        results = [None] * len(queries)
+        async for result in self.iter_completed(queries, concurrency):
+            results[result.index] = result
+        return results
@@ -0,0 +1,86 @@
+import json
+import os
+
+import allure
+import pytest
+
+from config import config
+
+# Метрики, для которых меньше — лучше; для остальных лучше больше
+LOWER_IS_BETTER = ("p50_ms", "p95_ms", "p99_ms", "peak_rss_mb", "peak_mem_kb")
+HIGHER_IS_BETTER = ("rps",)
+
+
+class BaselineStore:
+    """Базовые значения метрик бенчмарков в JSON-файле и проверка регрессий."""
+
+    def __init__(self, path: str, threshold: float, update: bool, noise_ms: float = 0.0):
+        self.path = path
+        self.threshold = threshold
+        self.noise_ms = noise_ms
+        self.update = update
+        self.changed = False
+        self.baselines = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as file:
+                self.baselines = json.load(file)
+
+    def check(self, scenario: str, metrics: dict) -> list:
+        """Сравнивает метрики с базой и возвращает описания регрессий.
+
+        С обновлением (--benchmark-update) текущие значения становятся новой
+        базой. Изменения задержки меньше noise_ms миллисекунд считаются шумом
+        измерения.
+        """
+        baseline = self.baselines.get(scenario)
+        if self.update:
+            self.baselines[scenario] = metrics
+            self.changed = True
+            return []
+        if baseline is None:
+            # База машинно-зависима и не хранится в git: без неё сравнивать
+            # не с чем, а молча записать первый прогон значит никогда не упасть
+            pytest.skip(f"Нет базы для сценария {scenario} в {self.path}: "
+                        f"запишите её прогоном с --benchmark-update")
+
+        regressions = []
+        for name in LOWER_IS_BETTER + HIGHER_IS_BETTER:
+            old, new = baseline.get(name), metrics.get(name)
+            if not old or new is None:
+                continue
+            if name.endswith("_ms") and new - old < self.noise_ms:
+                continue
+            change = (new - old) / old if name in LOWER_IS_BETTER else (old - new) / old
+            if change > self.threshold:
+                regressions.append(f"{name}: {old:.2f} -> {new:.2f} "
+                                   f"(хуже на {change:.0%}, порог {self.threshold:.0%})")
+        return regressions
+
+    def save(self):
+        if self.changed:
+            with open(self.path, "w", encoding="utf-8") as file:
+                json.dump(self.baselines, file, ensure_ascii=False, indent=1, sort_keys=True)
+
+
+@pytest.fixture(scope="session")
+def benchmark_baseline(request):
+    """Хранилище базовых метрик; обновлённые значения сохраняются в конце сессии."""
+    threshold = request.config.getoption("--benchmark-threshold")
+    store = BaselineStore(config.BENCHMARK_BASELINE,
+                          config.BENCHMARK_THRESHOLD if threshold is None else threshold,
+                          request.config.getoption("--benchmark-update"),
+                          config.BENCHMARK_NOISE_MS)
+    yield store
+    store.save()
+
+
+@pytest.fixture
+def benchmark_report(benchmark_baseline):
+    """Прикладывает метрики сценария к отчёту Allure и проверяет регрессии."""
+    def report(scenario: str, metrics: dict):
+        allure.attach(json.dumps(metrics, ensure_ascii=False, indent=1),
+                      name=f"Метрики: {scenario}", attachment_type=allure.attachment_type.JSON)
+        regressions = benchmark_baseline.check(scenario, metrics)
+        assert not regressions, f"Регрессия производительности в {scenario}: " + \
+            "; ".join(regressions)
+    return report
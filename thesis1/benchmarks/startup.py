@@ -0,0 +1,95 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+MODES = {
+    "api": ["-m", "api", "--api-mode=replay"],
+    "ui": ["-m", "ui"],
+}
+
+# Каждый замер — отдельный процесс pytest с этим модулем в роли плагина
+# (-p benchmarks.startup): плагин записывает время окончания сбора тестов
+# и окончания подготовки первого теста, считая от запуска процесса,
+# после чего прогон останавливается
+_START_ENV = "STARTUP_BENCHMARK_T0"
+_RESULT_ENV = "STARTUP_BENCHMARK_RESULT"
+
+
+def _write_result(**values):
+    path = os.environ.get(_RESULT_ENV)
+    if not path:
+        return
+    try:
+        with open(path, encoding="utf-8") as file:
+            result = json.load(file)
+    except (OSError, ValueError):
+        result = {}
+    result.update(values)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(result, file)
+
+
+def _elapsed() -> float:
+    return time.time() - float(os.environ[_START_ENV])
+
+
+def pytest_collection_finish(session):
+    if _START_ENV in os.environ:
+        _write_result(collected_s=_elapsed(), tests=len(session.items),
+                      selenium_at_collection="selenium" in sys.modules)
+
+
+def pytest_runtest_logreport(report):
+    if _START_ENV in os.environ and report.when == "setup":
+        _write_result(first_test_s=_elapsed(), first_test_ok=report.passed,
+                      selenium_at_first_test="selenium" in sys.modules)
+
+
+def pytest_runtest_teardown(item):
+    if _START_ENV in os.environ:
+        item.session.shouldstop = "замер времени запуска завершён"
+
+
+def measure(mode: str) -> dict:
+    """Один прогон pytest в режиме mode; возвращает записанные плагином замеры."""
+    with tempfile.TemporaryDirectory() as workdir:
+        result_path = os.path.join(workdir, "result.json")
+        env = dict(os.environ, **{_RESULT_ENV: result_path, _START_ENV: repr(time.time())})
+        subprocess.run([sys.executable, "-m", "pytest", "-q", "-p", "benchmarks.startup",
+                        "-p", "no:cacheprovider", *MODES[mode]],
+                       env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            with open(result_path, encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Время сбора тестов и до первого теста")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--mode", nargs="+", choices=sorted(MODES), default=sorted(MODES))
+    args = parser.parse_args()
+
+    for mode in args.mode:
+        runs = [measure(mode) for _ in range(args.runs)]
+        collected = [run["collected_s"] for run in runs if "collected_s" in run]
+        first = [run["first_test_s"] for run in runs if "first_test_s" in run]
+        last = runs[-1]
+        print(f"{mode}: тестов {last.get('tests', 0)}, "
+              f"сбор {statistics.median(collected) * 1000:.0f} мс" if collected
+              else f"{mode}: сбор тестов не завершился")
+        if first:
+            status = "" if last.get("first_test_ok") else " (подготовка теста упала)"
+            print(f"  до первого теста {statistics.median(first) * 1000:.0f} мс{status}")
+        print(f"  Selenium загружен: при сборе {last.get('selenium_at_collection')}, "
+              f"к первому тесту {last.get('selenium_at_first_test')}")
+
+
+if __name__ == "__main__":
+    main()
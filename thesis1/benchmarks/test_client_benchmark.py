@@ -0,0 +1,114 @@
+import asyncio
+import os
+import threading
+import time
+
+import allure
+import pytest
+
+from api_client import AsyncAviasalesAPI, RequestStats
+from config import config
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# (параллельность, билетов в ответе), задаются BENCHMARK_SCENARIOS
+SCENARIOS = config.BENCHMARK_SCENARIOS
+WARMUP_REQUESTS = 10
+
+
+def current_rss_mb():
+    """Текущий RSS процесса в МиБ: из /proc на Linux, иначе пиковый из resource."""
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        pass
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class RssSampler:
+    """Фоновый замер пикового RSS за время выполнения блока with."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.peak = current_rss_mb()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            rss = current_rss_mb()
+            if rss is not None and (self.peak is None or rss > self.peak):
+                self.peak = rss
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+
+def run_round(client, async_client, query, concurrency: int) -> dict:
+    """Один замер: BENCHMARK_REQUESTS запросов с заданной параллельностью."""
+    client.stats = RequestStats()
+    with RssSampler() as rss:
+        start = time.perf_counter()
+        results = asyncio.run(async_client.search_many(
+            [query] * config.BENCHMARK_REQUESTS, concurrency))
+        elapsed = time.perf_counter() - start
+    assert all(result.ok for result in results), [r for r in results if not r.ok][:3]
+    return {
+        "requests": client.stats.requests,
+        "p50_ms": client.stats.percentile(50) * 1000,
+        "p95_ms": client.stats.percentile(95) * 1000,
+        "p99_ms": client.stats.percentile(99) * 1000,
+        "rps": client.stats.requests / elapsed,
+        "peak_rss_mb": rss.peak,
+    }
+
+
+def best_of(rounds: list) -> dict:
+    """Лучшее значение каждой метрики по раундам: так меньше влияет шум машины."""
+    best = dict(rounds[0])
+    for metrics in rounds[1:]:
+        for name, value in metrics.items():
+            if value is None or name == "requests":
+                continue
+            better = max if name == "rps" else min
+            best[name] = better(best[name], value)
+    return best
+
+
+@allure.epic("Бенчмарки API клиента")
+class TestClientBenchmark:
+    """Задержка и пропускная способность AviasalesAPI против локального стаба."""
+
+    @allure.title("Пропускная способность клиента")
+    @pytest.mark.parametrize("concurrency,response_size", SCENARIOS)
+    def test_client_throughput(self, stub_api, benchmark_report, concurrency, response_size):
+        """Выполняет BENCHMARK_ROUNDS раундов по BENCHMARK_REQUESTS запросов.
+
+        Замеряются p50/p95/p99 задержки, запросов в секунду и пиковый RSS;
+        лучшие по раундам значения сравниваются с базой из BENCHMARK_BASELINE.
+        """
+        client = stub_api(response_size=response_size, pool_size=concurrency)
+        async_client = AsyncAviasalesAPI(client)
+        query = (config.ORIGIN_CITY, config.DESTINATION_CITY, config.DEPARTURE_DATE)
+
+        with allure.step("Прогрев соединений"):
+            asyncio.run(async_client.search_many([query] * WARMUP_REQUESTS, concurrency))
+
+        rounds = []
+        for number in range(config.BENCHMARK_ROUNDS):
+            with allure.step(f"Раунд {number + 1}: {config.BENCHMARK_REQUESTS} запросов, "
+                             f"параллельность {concurrency}"):
+                rounds.append(run_round(client, async_client, query, concurrency))
+
+        benchmark_report(f"concurrency={concurrency},size={response_size}", best_of(rounds))
@@ -0,0 +1,90 @@
+import time
+import tracemalloc
+
+import allure
+import pytest
+
+from config import config
+
+# Билетов в ответе: от обычного ответа до очень большого
+SIZES = [1000, 5000, 20000]
+# Во сколько раз пик памяти потокового разбора может вырасти от меньшего
+# ответа к большему (при полном разборе он растёт пропорционально размеру)
+FLAT_FACTOR = 2.0
+
+
+def peak_memory(function) -> tuple:
+    """Результат и пик памяти Python (по tracemalloc) за время выполнения function."""
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return result, peak, elapsed
+
+
+def full_decode(client, query) -> int:
+    response = client.search(*query)
+    assert response.get("success") == True
+    return len(response["data"])
+
+
+def streamed_decode(client, query) -> tuple:
+    with client.stream_search(*query) as response:
+        count = sum(1 for _ in response)
+    assert response.get("success") == True
+    return count, response.validator
+
+
+@pytest.fixture(scope="module")
+def measurements(stub_api):
+    """Пики памяти обоих способов разбора для каждого размера из SIZES."""
+    results = {}
+    for size in SIZES:
+        client = stub_api(response_size=size, pool_size=1)
+        query = (config.ORIGIN_CITY, config.DESTINATION_CITY, config.DEPARTURE_MONTH)
+        # Прогрев: стаб генерирует и кэширует тело, соединение открывается
+        full_decode(client, query)
+
+        count, full_peak, full_time = peak_memory(lambda: full_decode(client, query))
+        (streamed, validator), stream_peak, stream_time = peak_memory(
+            lambda: streamed_decode(client, query))
+        results[size] = {
+            "tickets": count,
+            "streamed_tickets": streamed,
+            "violations": validator.violations,
+            "full_peak_kb": full_peak / 1024,
+            "peak_mem_kb": stream_peak / 1024,
+            "full_ms": full_time * 1000,
+            "stream_ms": stream_time * 1000,
+        }
+    return results
+
+
+@allure.epic("Бенчмарки API клиента")
+class TestStreamingBenchmark:
+    """Пик памяти при разборе больших ответов: response.json() против stream_search()."""
+
+    @allure.title("Потоковый разбор отдаёт те же билеты и проверяет их по схеме")
+    @pytest.mark.parametrize("size", SIZES)
+    def test_stream_memory(self, measurements, benchmark_report, size):
+        result = measurements[size]
+        assert result["streamed_tickets"] == result["tickets"] == size
+        assert not result["violations"], result["violations"][:5]
+        benchmark_report(f"stream,size={size}",
+                         {name: value for name, value in result.items()
+                          if name in ("peak_mem_kb", "full_peak_kb")})
+
+    @allure.title("Пик памяти потокового разбора не растёт с размером ответа")
+    def test_stream_memory_flat(self, measurements):
+        smallest, largest = measurements[SIZES[0]], measurements[SIZES[-1]]
+        allure.attach("\n".join(
+            f"{size}: полный разбор {result['full_peak_kb']:.0f} КиБ / {result['full_ms']:.0f} мс, "
+            f"потоковый {result['peak_mem_kb']:.0f} КиБ / {result['stream_ms']:.0f} мс"
+            for size, result in measurements.items()),
+            name="Пик памяти по размерам ответа", attachment_type=allure.attachment_type.TEXT)
+        assert largest["peak_mem_kb"] <= smallest["peak_mem_kb"] * FLAT_FACTOR, measurements
+        assert largest["peak_mem_kb"] < largest["full_peak_kb"], measurements
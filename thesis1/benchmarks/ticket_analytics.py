@@ -0,0 +1,110 @@
+import argparse
+import random
+import statistics
+import time
+import tracemalloc
+
+from tickets import TicketSet
+
+AIRLINES = ["SU", "DP", "S7", "U6", "FV", "UT", "N4", "5N", "WZ", "EO"]
+
+
+def generate_tickets(count: int, seed: int = 1) -> list:
+    """Синтетические билеты в формате поля data ответа prices_for_dates."""
+    rng = random.Random(seed)
+    tickets = []
+    for _ in range(count):
+        day = rng.randint(1, 28)
+        transfers = rng.choice((0, 0, 0, 1, 1, 2))
+        price = int(rng.lognormvariate(8.5, 0.35)) + transfers * 1500
+        tickets.append({
+            "origin": "MOW",
+            "destination": "LED",
+            "price": price,
+            "airline": rng.choice(AIRLINES),
+            "flight_number": str(rng.randint(10, 6999)),
+            "departure_at": f"2026-02-{day:02d}T{rng.randint(0, 23):02d}:"
+                            f"{rng.randint(0, 59):02d}:00+03:00",
+            "transfers": transfers,
+            "duration": 85 + transfers * rng.randint(90, 400),
+        })
+    return tickets
+
+
+def dict_analytics(tickets: list) -> dict:
+    """Те же расчёты циклами по словарям — базовая линия для сравнения."""
+    cheapest = {}
+    for ticket in tickets:
+        day = ticket["departure_at"][:10]
+        if day not in cheapest or ticket["price"] < cheapest[day]:
+            cheapest[day] = ticket["price"]
+
+    per_airline = {}
+    for ticket in tickets:
+        total, count = per_airline.get(ticket["airline"], (0, 0))
+        per_airline[ticket["airline"]] = (total + ticket["price"], count + 1)
+    mean_by_airline = {airline: total / count for airline, (total, count) in per_airline.items()}
+
+    prices = sorted(ticket["price"] for ticket in tickets)
+    # inclusive — та же линейная интерполяция, что у np.percentile в price_stats
+    q1, median, q3 = statistics.quantiles(prices, n=4, method="inclusive")
+    spread = 1.5 * (q3 - q1)
+    outliers = [ticket for ticket in tickets
+                if ticket["price"] < q1 - spread or ticket["price"] > q3 + spread]
+    return {"cheapest": cheapest, "mean_by_airline": mean_by_airline,
+            "median": median, "outliers": len(outliers)}
+
+
+def columnar_analytics(ticket_set: TicketSet) -> dict:
+    stats = ticket_set.price_stats()
+    return {"cheapest": ticket_set.cheapest_per_day(),
+            "mean_by_airline": ticket_set.group_by("airline", "price", "mean"),
+            "median": stats["p50"],
+            "outliers": len(ticket_set.outliers())}
+
+
+def measure(function, *args) -> tuple:
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def traced(function, *args) -> tuple:
+    """Результат и объём памяти, выделенной под него (по tracemalloc)."""
+    tracemalloc.start()
+    result = function(*args)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Сравнение аналитики цен: словари против колоночного TicketSet")
+    parser.add_argument("--count", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    tickets, dict_bytes = traced(generate_tickets, args.count)
+    ticket_set, build_time = measure(TicketSet.from_tickets, tickets)
+    dict_result, dict_time = measure(dict_analytics, tickets)
+    columnar_result, query_time = measure(columnar_analytics, ticket_set)
+    # Честное сравнение: словари уже есть, колонки ещё нужно из них построить
+    columnar_time = build_time + query_time
+
+    assert dict_result["cheapest"] == columnar_result["cheapest"]
+    assert dict_result["outliers"] == columnar_result["outliers"]
+    assert dict_result["median"] == columnar_result["median"]
+    for airline, mean in dict_result["mean_by_airline"].items():
+        assert abs(mean - columnar_result["mean_by_airline"][airline]) < 1e-6 * mean
+
+    print(f"Билетов: {args.count:,}")
+    print(f"Память: словари {dict_bytes / 2**20:.1f} МиБ, "
+          f"колонки {ticket_set.nbytes / 2**20:.1f} МиБ")
+    print(f"Аналитика на словарях: {dict_time:.3f} с")
+    print(f"Аналитика на колонках: {columnar_time:.3f} с вместе с построением TicketSet "
+          f"(ускорение x{dict_time / columnar_time:.1f}): построение {build_time:.3f} с, "
+          f"расчёты {query_time:.3f} с (x{dict_time / query_time:.1f})")
+
+
+if __name__ == "__main__":
+    main()
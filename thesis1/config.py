@@ -1,17 +1,187 @@
 import os
-from dotenv import load_dotenv
 
-load_dotenv()
+
+def _load_env_file():
+    """Загружает .env из папки проекта или выше по дереву, если файл есть.
+
+    python-dotenv импортируется только при наличии файла: в CI переменные
+    задаются окружением, и импорт конфигурации не тянет лишних модулей.
+    """
+    directory = os.path.dirname(os.path.abspath(__file__))
+    while True:
+        path = os.path.join(directory, ".env")
+        if os.path.isfile(path):
+            from dotenv import load_dotenv
+            load_dotenv(path)
+            return
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return
+        directory = parent
+
+
+_load_env_file()
 
 
 class Config:
     # URL сайта для UI тестов
-    BASE_URL = "https://www.aviasales.ru"
+    # (можно подменить копией страницы, см. опцию --site-dir)
+    BASE_URL = os.getenv("BASE_URL", "https://www.aviasales.ru")
+
+    # Бюджеты производительности страниц: ttfb_ms, dom_content_loaded_ms,
+    # load_ms, lcp_ms, transfer_size_kb, resource_count. При превышении
+    # AviasalesPage.open() роняет тест (PERFORMANCE_BUDGETS_ENABLED=0 — только отчёт)
+    PERFORMANCE_BUDGETS = {
+        "main": {"ttfb_ms": 2000, "dom_content_loaded_ms": 8000, "transfer_size_kb": 15000},
+    }
+    PERFORMANCE_BUDGETS_ENABLED = os.getenv("PERFORMANCE_BUDGETS_ENABLED", "1") == "1"
 
     # URL API из документации Travelpayouts
     API_BASE_URL = "https://api.travelpayouts.com/aviasales/v3/"
     API_TOKEN = os.getenv("API_TOKEN")
 
+    # Настройки HTTP-клиента API: таймаут (сек), размер пула keep-alive
+    # соединений и число повторов при ошибках 502/503/504
+    API_TIMEOUT = float(os.getenv("API_TIMEOUT", "10"))
+    API_POOL_SIZE = int(os.getenv("API_POOL_SIZE", "10"))
+    API_RETRIES = int(os.getenv("API_RETRIES", "3"))
+    # Размер чанка (байт) при потоковом разборе ответа (stream_search)
+    API_STREAM_CHUNK_SIZE = int(os.getenv("API_STREAM_CHUNK_SIZE", "65536"))
+
+    # Кэш ответов API: off — выключен, memory — LRU в памяти,
+    # disk — память + SQLite-файл API_CACHE_PATH (сохраняется между запусками)
+    API_CACHE = os.getenv("API_CACHE", "off")
+    API_CACHE_PATH = os.getenv(
+        "API_CACHE_PATH",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), ".api_cache.sqlite"),
+    )
+    API_CACHE_SIZE = int(os.getenv("API_CACHE_SIZE", "1024"))
+    # Время жизни записей кэша по endpoint (сек): цены меняются за минуты
+    API_CACHE_TTL = {"prices_for_dates": 300}
+
+    # Ограничение частоты запросов к API (запросов в секунду) по endpoint.
+    # Скорость подстраивается под ответы 429; API_THROTTLE_RETRIES — число
+    # повторов после 429. Если задана папка API_RATE_LIMIT_DIR, ограничение
+    # общее для всех процессов на машине
+    API_RATE_LIMITS = {"prices_for_dates": 10.0}
+    API_RATE_LIMIT_DEFAULT = float(os.getenv("API_RATE_LIMIT_DEFAULT", "10"))
+    API_RATE_LIMIT_DIR = os.getenv("API_RATE_LIMIT_DIR", "")
+    API_THROTTLE_RETRIES = int(os.getenv("API_THROTTLE_RETRIES", "5"))
+
+    # Режим работы с API: live — настоящий API, record — запросы идут через
+    # локальный прокси и записываются в кассету, replay — ответы отдаёт
+    # локальный стаб из кассеты (без сети и токена), synthetic — стаб
+    # генерирует ответы для любого маршрута
+    API_MODE = os.getenv("API_MODE", "live")
+    CASSETTE_PATH = os.getenv(
+        "CASSETTE_PATH",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "tests", "cassettes", "api.json"),
+    )
+    # Искусственная задержка ответов стаба (сек), например для нагрузочных тестов
+    STUB_LATENCY = float(os.getenv("STUB_LATENCY", "0"))
+    # Квота стаба (запросов в секунду, 0 — без ограничения): сверх неё
+    # стаб отвечает 429 с заголовком Retry-After, как настоящий API
+    STUB_QUOTA = float(os.getenv("STUB_QUOTA", "0"))
+
+    # Бенчмарки API клиента: файл базовых метрик, допустимое ухудшение
+    # (0.3 = 30%), число запросов и число повторов каждого сценария
+    BENCHMARK_BASELINE = os.getenv(
+        "BENCHMARK_BASELINE",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "baseline.json"),
+    )
+    BENCHMARK_THRESHOLD = float(os.getenv("BENCHMARK_THRESHOLD", "0.3"))
+    BENCHMARK_REQUESTS = int(os.getenv("BENCHMARK_REQUESTS", "200"))
+    BENCHMARK_ROUNDS = int(os.getenv("BENCHMARK_ROUNDS", "3"))
+    # Изменение задержки меньше этого значения (мс) считается шумом
+    BENCHMARK_NOISE_MS = float(os.getenv("BENCHMARK_NOISE_MS", "2"))
+    # Сценарии бенчмарка клиента через запятую: «параллельность x билетов в ответе»
+    BENCHMARK_SCENARIOS = [
+        tuple(int(value) for value in scenario.split("x"))
+        for scenario in os.getenv("BENCHMARK_SCENARIOS", "1x10,8x10,8x1000,32x100").split(",")
+        if scenario
+    ]
+
+    # Пул браузеров для UI тестов: off — новый Chrome на каждый тест,
+    # session — «тёплые» экземпляры на сессию; после DRIVER_MAX_USES тестов
+    # экземпляр перезапускается
+    DRIVER_POOL = os.getenv("DRIVER_POOL", "off")
+    DRIVER_MAX_USES = int(os.getenv("DRIVER_MAX_USES", "20"))
+
+    # chromedriver: явный путь к бинарнику (CHROMEDRIVER_PATH) либо путь,
+    # найденный webdriver-manager и запомненный в CHROMEDRIVER_CACHE_PATH.
+    # Запомненный путь используется без обращения к сети CHROMEDRIVER_CACHE_TTL
+    # секунд, а при недоступной сети — и дольше
+    CHROMEDRIVER_PATH = os.getenv("CHROMEDRIVER_PATH", "")
+    CHROMEDRIVER_CACHE_PATH = os.getenv(
+        "CHROMEDRIVER_CACHE_PATH",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), ".chromedriver.json"),
+    )
+    CHROMEDRIVER_CACHE_TTL = float(os.getenv("CHROMEDRIVER_CACHE_TTL", "86400"))
+
+    # Профили блокировки сетевых запросов браузера: full — ничего не
+    # блокируется, functional — все запросы к сторонним хостам и, по шаблонам
+    # URL для Network.setBlockedURLs («*» — любая последовательность символов),
+    # аналитика, реклама, шрифты, картинки и видео, в том числе с сайта
+    # страницы. Сторонний хост — не сайт страницы BASE_URL и не его поддомен.
+    # NETWORK_ALLOWLIST — URL или хосты через запятую, которые считаются
+    # своими (например, CDN сайта на другом домене) и не попадают под шаблоны
+    NETWORK_PROFILES = {
+        "full": {"block_third_party": False, "blocked_urls": []},
+        "functional": {
+            "block_third_party": True,
+            "blocked_urls": [
+                "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+                "*googlesyndication.com*", "*mc.yandex.ru*", "*an.yandex.ru*",
+                "*yandex.ru/ads*", "*top-fwz1.mail.ru*", "*vk.com/rtrg*", "*facebook.net*",
+                "*connect.facebook.com*", "*hotjar.com*", "*criteo.com*", "*adriver.ru*",
+                "*sentry.io*", "*amplitude.com*",
+                "*.woff", "*.woff2", "*.ttf", "*.otf",
+                "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.ico",
+                "*.mp4", "*.webm", "*.mp3",
+            ],
+        },
+    }
+    NETWORK_PROFILE = os.getenv("NETWORK_PROFILE", "full")
+    NETWORK_ALLOWLIST = [url for url in os.getenv("NETWORK_ALLOWLIST", "").split(",") if url]
+    # Трафик тестов в профиле full — база для расчёта сэкономленного
+    NETWORK_HISTORY_PATH = os.getenv(
+        "NETWORK_HISTORY_PATH",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), ".network_history.json"),
+    )
+
+    # Проверки UI по HTML без браузера (TieredAviasalesPage): если HTML,
+    # отданного сервером, хватает, Chrome не запускается. UI_STATIC_TIER=0 —
+    # все проверки в браузере
+    UI_STATIC_TIER = os.getenv("UI_STATIC_TIER", "1") == "1"
+    STATIC_TIMEOUT = float(os.getenv("STATIC_TIMEOUT", "10"))
+    STATIC_USER_AGENT = os.getenv(
+        "STATIC_USER_AGENT",
+        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/120.0 Safari/537.36",
+    )
+
+    # Файл, в котором запоминается сработавший селектор каждого локатора
+    SELECTOR_CACHE_PATH = os.getenv(
+        "SELECTOR_CACHE_PATH",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), ".selector_cache.json"),
+    )
+
+    # Бюджет ожидания на одно действие страницы (сек) и интервалы опроса:
+    # опрос начинается с WAIT_POLL_INITIAL и замедляется до WAIT_POLL_MAX
+    WAIT_BUDGET = float(os.getenv("WAIT_BUDGET", "10"))
+    WAIT_POLL_INITIAL = float(os.getenv("WAIT_POLL_INITIAL", "0.05"))
+    WAIT_POLL_MAX = float(os.getenv("WAIT_POLL_MAX", "0.5"))
+
+    # Матрица маршрутов для tests/test_routes.py: CSV с колонками origin,
+    # destination (IATA-коды), сколько маршрутов взять (0 — все) и сколько
+    # запросов выполнять параллельно при предзагрузке ответов
+    ROUTES_CSV = os.getenv(
+        "ROUTES_CSV",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "tests", "data", "routes.csv"),
+    )
+    ROUTES_LIMIT = int(os.getenv("ROUTES_LIMIT", "0"))
+    ROUTES_CONCURRENCY = int(os.getenv("ROUTES_CONCURRENCY", "8"))
+
     # Тестовые данные (взяты из задания курсовой)
     # IATA-коды городов:
     # MOW = Москва (все аэропорты)
@@ -1,25 +1,184 @@
+import json
+import sys
 import pytest
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
 
 
-@pytest.fixture
-def driver():
-    """Фикстура для инициализации WebDriver."""
+pytest_plugins = ["sharding", "profiler"]
+
+_api_clients = []
+_network_histories = []
+_route_responses = []
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--api-cache", choices=("off", "memory", "disk"), default=None,
+        help="Кэш ответов API: off, memory или disk (по умолчанию API_CACHE из .env)",
+    )
+    parser.addoption(
+        "--api-mode", choices=("live", "record", "replay", "synthetic"), default=None,
+        help="live - настоящий API, record - запись кассеты, replay - ответы из кассеты, "
+             "synthetic - сгенерированные ответы (по умолчанию API_MODE из .env)",
+    )
+    parser.addoption(
+        "--stub-latency", type=float, default=None,
+        help="Искусственная задержка ответов локального стаба в секундах",
+    )
+    parser.addoption(
+        "--stub-quota", type=float, default=None,
+        help="Квота локального стаба, запросов в секунду (сверх неё - ответ 429)",
+    )
+    parser.addoption(
+        "--site-dir", default=None,
+        help="Папка с сохранённой копией сайта: UI тесты пойдут на локальный сервер с ней",
+    )
+    parser.addoption(
+        "--benchmark", action="store_true",
+        help="Запустить бенчмарки из папки benchmarks (по умолчанию пропускаются)",
+    )
+    parser.addoption(
+        "--benchmark-update", action="store_true",
+        help="Записать результаты бенчмарков как новые базовые значения",
+    )
+    parser.addoption(
+        "--benchmark-threshold", type=float, default=None,
+        help="Допустимое ухудшение метрик бенчмарков, доля (по умолчанию BENCHMARK_THRESHOLD)",
+    )
+    parser.addoption(
+        "--network-profile", default=None,
+        help="Профиль блокировки запросов браузера из config.NETWORK_PROFILES: "
+             "full или functional (по умолчанию NETWORK_PROFILE из .env)",
+    )
+    parser.addoption(
+        "--driver-pool", choices=("off", "session"), default=None,
+        help="off - новый браузер на каждый UI тест, session - пул браузеров на сессию "
+             "(по умолчанию DRIVER_POOL из .env)",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "ui: UI тесты")
+    config.addinivalue_line("markers", "api: API тесты")
+    config.addinivalue_line("markers", "isolated: тесту нужен отдельный новый браузер")
+    config.addinivalue_line("markers", "benchmark: бенчмарки (запускаются с --benchmark)")
+    config.addinivalue_line("markers", "route_query(name): запрос матрицы маршрутов, "
+                                       "ответ на который проверяет тест")
+
+
+def _create_driver(host_rules: str = None):
+    """Запускает новый экземпляр headless Chrome.
+
+    Selenium импортируется здесь, а не в начале файла: прогоны без UI тестов
+    (например, pytest -m api) его не загружают. host_rules — правило
+    --host-resolver-rules профиля сети (блокировка сторонних хостов).
+    """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from driver_binary import resolve_chromedriver
+
     options = webdriver.ChromeOptions()
     options.add_argument("--headless=new")  # Новый headless режим
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-dev-shm-usage")
     options.add_argument("--window-size=1920,1080")
     options.add_argument("--disable-blink-features=AutomationControlled")
+    # Журнал событий DevTools: по нему считается трафик и заблокированные запросы
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    if host_rules:
+        options.add_argument(f"--host-resolver-rules={host_rules}")
+
+    # Путь к chromedriver ищется один раз на процесс и запоминается на диске
+    service = Service(resolve_chromedriver() or None)
+    # Неявное ожидание не используется: все ожидания идут через WaitPolicy
+    # с общим бюджетом на действие страницы
+    return webdriver.Chrome(service=service, options=options)
+
+
+@pytest.fixture(scope="session")
+def driver_pool(request, network_profile):
+    """Пул браузеров на сессию (при xdist — на воркер); None, если пул выключен."""
+    from config import config
+    from driver_pool import DriverPool
+    mode = request.config.getoption("--driver-pool") or config.DRIVER_POOL
+    if mode == "off":
+        yield None
+        return
+    host_rules = network_profile.host_rules
+    pool = DriverPool(lambda: _create_driver(host_rules), max_uses=config.DRIVER_MAX_USES)
+    yield pool
+    pool.close()
+
 
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=options)
-    driver.implicitly_wait(10)
+@pytest.fixture(scope="session")
+def network_profile(request, local_site):
+    """Профиль блокировки запросов: имя, свои сайты, правило host-resolver-rules
+    и шаблоны URL для Network.setBlockedURLs.
 
-    yield driver
-    driver.quit()
+    Свои сайты — сайт страницы (с --site-dir — локальной копии) и
+    NETWORK_ALLOWLIST; если профиль не блокирует сторонние хосты, сайты
+    и правило — None. Шаблоны, задевающие NETWORK_ALLOWLIST, отбрасываются.
+    """
+    from config import config
+    from network_filter import (NetworkProfile, blocked_patterns, first_party_sites,
+                                host_resolver_rules)
+    name = request.config.getoption("--network-profile") or config.NETWORK_PROFILE
+    if name not in config.NETWORK_PROFILES:
+        raise pytest.UsageError(f"Неизвестный профиль сети {name!r}, "
+                                f"доступны: {', '.join(config.NETWORK_PROFILES)}")
+    profile = config.NETWORK_PROFILES[name]
+    patterns = blocked_patterns(profile.get("blocked_urls", []), config.NETWORK_ALLOWLIST)
+    if not profile.get("block_third_party"):
+        return NetworkProfile(name, None, None, patterns)
+    sites = first_party_sites(config.BASE_URL, config.NETWORK_ALLOWLIST)
+    return NetworkProfile(name, sites, host_resolver_rules(sites), patterns)
+
+
+@pytest.fixture(scope="session")
+def network_history():
+    """История трафика UI тестов для расчёта экономии от блокировки запросов."""
+    from config import config
+    from network_filter import NetworkHistory
+    history = NetworkHistory(config.NETWORK_HISTORY_PATH)
+    _network_histories.append(history)
+    yield history
+    history.save()
+
+
+@pytest.fixture
+def driver(request, driver_pool, network_profile, network_history):
+    """Фикстура для инициализации WebDriver.
+
+    С включённым пулом браузер берётся из него и возвращается после теста.
+    Тесты с маркером isolated всегда получают новый браузер. Запросы к
+    сторонним хостам и запросы под шаблоны профиля --network-profile браузер
+    не выполняет, а трафик теста прикладывается к отчёту Allure.
+    """
+    from network_filter import apply_network_profile, collect_traffic
+    profile, sites, host_rules, patterns = network_profile
+    pooled = driver_pool is not None and not request.node.get_closest_marker("isolated")
+    driver = driver_pool.acquire() if pooled else _create_driver(host_rules)
+    traffic = None
+    try:
+        apply_network_profile(driver, patterns)
+        collect_traffic(driver)  # сбрасываем журнал от предыдущего теста
+
+        yield driver
+
+        import allure
+        traffic = collect_traffic(driver, sites)
+        result = network_history.record(request.node.nodeid, profile, traffic)
+        result["blocked_urls"] = traffic["blocked_urls"]
+        allure.attach(json.dumps(result, ensure_ascii=False, indent=1),
+                      name="Сетевой трафик", attachment_type=allure.attachment_type.JSON)
+    finally:
+        # Браузер возвращается в пул или закрывается, даже если учёт трафика упал
+        if pooled:
+            if traffic is None:
+                # Тест упал: origin открытых страниц берутся из оставшегося журнала
+                traffic = collect_traffic(driver)
+            driver_pool.release(driver, traffic["origins"])
+        else:
+            driver.quit()
 
 
 @pytest.fixture
@@ -29,17 +188,216 @@ def aviasales_page(driver):
     return AviasalesPage(driver)
 
 
+@pytest.fixture(scope="session")
+def static_http():
+    """HTTP-сессия для проверок UI по HTML без браузера."""
+    import requests
+    session = requests.Session()
+    yield session
+    session.close()
+
+
 @pytest.fixture
-def api_client():
-    """Фикстура для создания клиента API."""
+def tiered_page(request, static_http):
+    """Проверки главной страницы: сначала по HTML, браузер — только при необходимости.
+
+    Фикстура driver (и запуск Chrome) запрашивается лениво, при первой
+    проверке, которой не хватило HTML.
+    """
+    from pages.static_page import StaticPage
+    from pages.tiered_page import TieredAviasalesPage
+    return TieredAviasalesPage(lambda: request.getfixturevalue("aviasales_page"),
+                               static_page=StaticPage(session=static_http))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def api_stub(request):
+    """Поднимает локальный стаб API в режимах record/replay.
+
+    На время сессии config.API_BASE_URL указывает на стаб, поэтому через него
+    идут и запросы AviasalesAPI, и прямые вызовы requests.get в тестах.
+    """
+    from config import config
+    mode = request.config.getoption("--api-mode") or config.API_MODE
+    if mode == "live":
+        yield None
+        return
+
+    from stub_server import Cassette, StubServer
+    latency = request.config.getoption("--stub-latency")
+    quota = config.STUB_QUOTA if request.config.getoption("--stub-quota") is None \
+        else request.config.getoption("--stub-quota")
+    stub = StubServer(Cassette(config.CASSETTE_PATH), mode=mode,
+                      latency=config.STUB_LATENCY if latency is None else latency,
+                      quota=quota)
+    original = (config.API_BASE_URL, config.API_RATE_LIMITS, config.API_RATE_LIMIT_DEFAULT)
+    config.API_BASE_URL = stub.start()
+    if mode != "record" and not quota:
+        # Ограничитель настроен на квоту настоящего API; стаб без квоты
+        # отвечает сам, и ждать токенов незачем
+        config.API_RATE_LIMITS = {}
+        config.API_RATE_LIMIT_DEFAULT = 1000.0
+    yield stub
+    config.API_BASE_URL, config.API_RATE_LIMITS, config.API_RATE_LIMIT_DEFAULT = original
+    stub.stop()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def local_site(request):
+    """С опцией --site-dir раздаёт копию сайта локально и направляет на неё UI тесты."""
+    site_dir = request.config.getoption("--site-dir")
+    if not site_dir:
+        yield None
+        return
+
+    from config import config
+    from stub_server import StaticSiteServer
+    server = StaticSiteServer(site_dir)
+    original_url = config.BASE_URL
+    config.BASE_URL = server.start()
+    yield server
+    config.BASE_URL = original_url
+    server.stop()
+
+
+@pytest.fixture(scope="session")
+def rate_limiter(api_stub):
+    """Ограничитель частоты запросов сессии.
+
+    Создаётся после api_stub, поэтому учитывает снятые им для стаба
+    ограничения config.API_RATE_LIMITS независимо от порядка фикстур.
+    """
+    from rate_limiter import RateLimiter
+    return RateLimiter.from_config()
+
+
+@pytest.fixture(scope="session")
+def api_client(request, api_stub, rate_limiter):
+    """Фикстура клиента API: одна сессия с пулом соединений на весь прогон.
+
+    Режим кэша ответов задаётся опцией --api-cache (off/memory/disk).
+    """
+    from api_client import AviasalesAPI
+    from response_cache import create_cache
+    client = AviasalesAPI(cache=create_cache(request.config.getoption("--api-cache")),
+                          rate_limiter=rate_limiter)
+    _api_clients.append(client)
+    yield client
+    client.close()
+
+
+@pytest.fixture(scope="module")
+def stub_api():
+    """Фабрика клиентов AviasalesAPI, каждый — против своего локального стаба.
+
+    stub_api(mode, quota, latency, response_size, **options) запускает
+    StubServer (в режиме replay — с кассетой CASSETTE_PATH) и возвращает
+    AviasalesAPI(base_url=...) с параметрами options; стаб доступен как
+    client.stub. Без явного rate_limiter ограничитель частоты запросы не
+    тормозит. Клиенты и стабы закрываются после модуля тестов.
+    """
     from api_client import AviasalesAPI
-    return AviasalesAPI()
+    from config import config
+    from rate_limiter import RateLimiter
+    from stub_server import Cassette, StubServer
+    started = []
 
+    def factory(mode: str = "synthetic", quota: float = 0.0, latency: float = 0.0,
+                response_size: int = 30, **options):
+        cassette = Cassette(config.CASSETTE_PATH) if mode == "replay" else None
+        stub = StubServer(cassette, mode=mode, latency=latency, quota=quota,
+                          response_size=response_size)
+        options.setdefault("rate_limiter", RateLimiter(default_rate=1e9))
+        client = AviasalesAPI(base_url=stub.start(), **options)
+        client.stub = stub
+        started.append(client)
+        return client
 
-def pytest_collection_modifyitems(items):
-    """Автоматическая маркировка тестов."""
+    yield factory
+    for client in started:
+        client.close()
+        client.stub.stop()
+
+
+@pytest.fixture(scope="session")
+def async_api_client(api_client):
+    """Фикстура асинхронного клиента API поверх общей сессии api_client."""
+    from api_client import AsyncAviasalesAPI
+    return AsyncAviasalesAPI(client=api_client)
+
+
+@pytest.fixture(scope="session")
+def route_responses(request, api_client):
+    """Общие ответы API для матрицы маршрутов.
+
+    При первом обращении параллельно загружает ответы для всех собранных
+    тестов с маркером route_query (по одному запросу на уникальную пару
+    «маршрут, запрос»), дальше тесты берут ответы из памяти.
+    """
+    from config import config
+    from route_matrix import RouteResponses
+    responses = RouteResponses(api_client)
+    needed = set()
+    for item in request.session.items:
+        marker = item.get_closest_marker("route_query")
+        callspec = getattr(item, "callspec", None)
+        if marker is not None and callspec is not None and "route" in callspec.params:
+            needed.add((callspec.params["route"], marker.args[0]))
+    responses.prefetch(sorted(needed), concurrency=config.ROUTES_CONCURRENCY)
+    _route_responses.append(responses)
+    return responses
+
+
+@pytest.fixture
+def route_response(request, route, route_responses):
+    """Ответ API на запрос из маркера route_query теста для его маршрута.
+
+    В режиме replay маршруты, которых нет в кассете, пропускаются.
+    """
+    response = route_responses.get(route, request.node.get_closest_marker("route_query").args[0])
+    if response.get("cassette_miss"):
+        pytest.skip(f"ответ не записан в кассету (--api-mode=record): {response.get('error')}")
+    return response
+
+
+def pytest_collection_modifyitems(config, items):
+    """Автоматическая маркировка тестов по имени модуля."""
+    skip_benchmark = pytest.mark.skip(reason="бенчмарки запускаются с опцией --benchmark")
     for item in items:
-        if "test_ui" in item.nodeid:
+        module = item.path.name
+        if module == "test_ui.py":
             item.add_marker(pytest.mark.ui)
-        elif "test_api" in item.nodeid:
-            item.add_marker(pytest.mark.api)
\ No newline at end of file
+        elif module in ("test_api.py", "test_routes.py"):
+            item.add_marker(pytest.mark.api)
+        elif item.nodeid.startswith("benchmarks/"):
+            item.add_marker(pytest.mark.benchmark)
+            if not config.getoption("--benchmark"):
+                item.add_marker(skip_benchmark)
+
+
+def pytest_terminal_summary(terminalreporter):
+    """Выводит статистику API-клиента, время ожиданий и сетевой трафик UI тестов."""
+    wait_policy = sys.modules.get("pages.wait_policy")
+    if wait_policy is not None and wait_policy.wait_metrics.actions:
+        terminalreporter.write_sep("-", "Ожидания по действиям страницы")
+        for line in wait_policy.wait_metrics.report():
+            terminalreporter.write_line(line)
+    tiered_page = sys.modules.get("pages.tiered_page")
+    if tiered_page is not None and tiered_page.tier_stats.checks:
+        terminalreporter.write_sep("-", "Уровни UI проверок")
+        for line in tiered_page.tier_stats.report():
+            terminalreporter.write_line(line)
+    for history in _network_histories:
+        if history.results:
+            terminalreporter.write_sep("-", "Сетевой трафик UI тестов")
+            for line in history.report():
+                terminalreporter.write_line(line)
+    for client in _api_clients:
+        if client.stats.requests or client.cache is not None:
+            terminalreporter.write_sep("-", "Статистика API-клиента")
+            terminalreporter.write_line(client.stats.report())
+            if client.cache is not None:
+                terminalreporter.write_line(client.cache.stats.report())
+            terminalreporter.write_line(client.rate_limiter.report())
+    for responses in _route_responses:
+        terminalreporter.write_line(responses.report())
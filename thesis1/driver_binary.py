@@ -0,0 +1,75 @@
+import glob
+import json
+import os
+import time
+
+from config import config
+
+_resolved = {}
+
+
+def resolve_chromedriver() -> str:
+    """Путь к chromedriver, найденный один раз на процесс.
+
+    Порядок: CHROMEDRIVER_PATH; путь, запомненный в CHROMEDRIVER_CACHE_PATH
+    не дольше CHROMEDRIVER_CACHE_TTL секунд назад; webdriver-manager (может
+    обращаться к сети) с сохранением результата. Если webdriver-manager
+    недоступен или нет сети, используется запомненный путь любой давности или
+    последний скачанный драйвер из кэша webdriver-manager (~/.wdm). Пустая
+    строка — драйвер не найден, Selenium будет искать его сам (Selenium Manager).
+    """
+    if "chromedriver" not in _resolved:
+        _resolved["chromedriver"] = _resolve()
+    return _resolved["chromedriver"]
+
+
+def _resolve() -> str:
+    if config.CHROMEDRIVER_PATH:
+        return config.CHROMEDRIVER_PATH
+
+    cached = _load_cached()
+    if cached and time.time() - cached["resolved_at"] < config.CHROMEDRIVER_CACHE_TTL:
+        return cached["path"]
+
+    try:
+        from webdriver_manager.chrome import ChromeDriverManager
+        path = ChromeDriverManager().install()
+    except Exception:
+        # Нет сети или webdriver-manager: подойдёт уже скачанный драйвер
+        if cached:
+            return cached["path"]
+        return _latest_downloaded()
+    _save_cached(path)
+    return path
+
+
+def _load_cached() -> dict:
+    try:
+        with open(config.CHROMEDRIVER_CACHE_PATH, encoding="utf-8") as file:
+            cached = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if not os.path.isfile(cached.get("path", "")):
+        return None
+    return cached
+
+
+def _save_cached(path: str):
+    tmp_path = f"{config.CHROMEDRIVER_CACHE_PATH}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump({"path": path, "resolved_at": time.time()}, file)
+        os.replace(tmp_path, config.CHROMEDRIVER_CACHE_PATH)
+    except OSError:
+        pass
+
+
+def _latest_downloaded() -> str:
+    """Самый свежий chromedriver в кэше webdriver-manager."""
+    root = os.environ.get("WDM_LOCAL_PATH") or os.path.join(os.path.expanduser("~"), ".wdm")
+    candidates = [path for path in glob.glob(os.path.join(root, "drivers", "chromedriver", "**",
+                                                          "chromedriver*"), recursive=True)
+                  if os.path.isfile(path) and not path.endswith((".zip", ".chromedriver"))]
+    if not candidates:
+        return ""
+    return max(candidates, key=os.path.getmtime)
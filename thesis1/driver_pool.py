@@ -0,0 +1,86 @@
+class DriverPool:
+    """Пул «тёплых» экземпляров WebDriver на сессию pytest.
+
+    При pytest-xdist каждый воркер — отдельный процесс, поэтому пул
+    получается свой на каждый воркер. Между тестами браузер очищается
+    (вкладки, cookies, хранилища), а после max_uses тестов или падения
+    браузера экземпляр закрывается и при следующем запросе создаётся новый.
+    """
+
+    def __init__(self, factory, max_uses: int = 20):
+        self.factory = factory
+        self.max_uses = max_uses
+        self.created = 0
+        self.recycled = 0
+        self._idle = []
+        self._uses = {}
+
+    def acquire(self):
+        """Возвращает свободный живой браузер или запускает новый."""
+        while self._idle:
+            driver = self._idle.pop()
+            if self._is_alive(driver):
+                return driver
+            self._discard(driver)
+        driver = self.factory()
+        self.created += 1
+        self._uses[driver] = 0
+        return driver
+
+    def release(self, driver, origins=()):
+        """Возвращает браузер в пул либо закрывает его, если он отслужил или упал.
+
+        origins — origin страниц, открытых за тест (см. collect_traffic):
+        их хранилища очищаются вместе с хранилищем текущей страницы.
+        """
+        self._uses[driver] = self._uses.get(driver, 0) + 1
+        if self._uses[driver] >= self.max_uses or not self._reset(driver, origins):
+            self._discard(driver)
+            return
+        self._idle.append(driver)
+
+    def close(self):
+        """Закрывает все браузеры пула."""
+        while self._idle:
+            self._discard(self._idle.pop())
+
+    def _discard(self, driver):
+        self._uses.pop(driver, None)
+        self.recycled += 1
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _is_alive(driver) -> bool:
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _reset(driver, origins=()) -> bool:
+        """Приводит браузер к состоянию «как новый»; False — если браузер не отвечает."""
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+
+            origins = set(origins)
+            origins.add(driver.execute_script("return window.location.origin"))
+            for origin in sorted(origin for origin in origins if origin and origin != "null"):
+                driver.execute_cdp_cmd("Storage.clearDataForOrigin", {
+                    "origin": origin,
+                    "storageTypes": "local_storage,session_storage,indexeddb,"
+                                    "websql,cache_storage,service_workers",
+                })
+            # Cookies очищаются сразу для всех доменов
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            driver.get("about:blank")
+            return True
+        except Exception:
+            return False
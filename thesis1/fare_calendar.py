@@ -0,0 +1,143 @@
+from datetime import date, timedelta
+
+from response_cache import ResponseCache
+
+
+def date_range(start, end) -> list:
+    """Список дат «YYYY-MM-DD» от start до end включительно."""
+    start, end = _as_date(start), _as_date(end)
+    return [(start + timedelta(days=offset)).isoformat()
+            for offset in range((end - start).days + 1)]
+
+
+def _as_date(value) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+class FareCalendar:
+    """Матрица минимальных цен «дата вылета × дата возвращения».
+
+    prices[(departure, return)] — минимальная цена или None, если билетов нет.
+    Для поиска в одну сторону дата возвращения равна None.
+    """
+
+    def __init__(self, departure_days: list, return_days: list):
+        self.departure_days = departure_days
+        self.return_days = return_days
+        self.prices = {cell: None for cell in self.cells()}
+        self.calls = 0
+        self.month_calls = 0
+        self.day_calls = 0
+
+    def cells(self) -> list:
+        if self.return_days is None:
+            return [(departure, None) for departure in self.departure_days]
+        return [(departure, back) for departure in self.departure_days
+                for back in self.return_days if back >= departure]
+
+    @property
+    def naive_calls(self) -> int:
+        """Число запросов при переборе каждой пары дат по отдельности."""
+        return len(self.prices)
+
+    def matrix(self) -> list:
+        """Строки по датам вылета, столбцы по датам возвращения."""
+        if self.return_days is None:
+            return [[self.prices[(departure, None)]] for departure in self.departure_days]
+        return [[self.prices.get((departure, back)) for back in self.return_days]
+                for departure in self.departure_days]
+
+    def report(self) -> str:
+        filled = sum(price is not None for price in self.prices.values())
+        return (f"Ячеек: {len(self.prices)}, с ценой: {filled}, запросов: {self.calls} "
+                f"(по месяцам {self.month_calls}, по дням {self.day_calls}) "
+                f"вместо {self.naive_calls} при полном переборе")
+
+
+class FareCalendarSweeper:
+    """Строит календарь цен за минимальное число запросов к prices_for_dates.
+
+    1. Запросы по месяцам (departure_at и return_at вида «YYYY-MM», как
+       в test_search_by_month) заполняют все ячейки, для которых нашлись билеты.
+    2. Для дат вылета с незаполненными ячейками делается один запрос на строку
+       (конкретный день вылета × месяц возвращения).
+    3. Отдельные ячейки запрашиваются, только если ответ по строке упёрся
+       в limit и мог не вместить все билеты.
+
+    Ответы отсортированы по цене, поэтому цена ячейки из усечённого ответа
+    уже минимальна: пропущенные билеты дороже показанных. Одинаковые запросы
+    выполняются один раз.
+    """
+
+    def __init__(self, client, limit: int = 1000):
+        self.client = client
+        self.limit = limit
+        self._responses = {}
+
+    def sweep(self, origin: str, destination: str, departure_days, return_days=None) -> FareCalendar:
+        """Заполняет календарь для списков дат вылета и возвращения (или только вылета)."""
+        departure_days = sorted(_as_date(day).isoformat() for day in departure_days)
+        if return_days is not None:
+            return_days = sorted(_as_date(day).isoformat() for day in return_days)
+        calendar = FareCalendar(departure_days, return_days)
+
+        # Шаг 1: по месяцам
+        for departure_month, return_month in self._month_pairs(calendar):
+            self._fill(calendar, origin, destination, departure_month, return_month)
+
+        # Шаг 2: по строкам (день вылета × месяц возвращения)
+        truncated_rows = set()
+        for departure, return_month in self._empty_rows(calendar):
+            if not self._fill(calendar, origin, destination, departure, return_month):
+                truncated_rows.add((departure, return_month))
+
+        # Шаг 3: по ячейкам, только там, где ответ по строке был усечён
+        if calendar.return_days is not None:
+            for departure, back in calendar.cells():
+                if calendar.prices[(departure, back)] is None \
+                        and (departure, back[:7]) in truncated_rows:
+                    self._fill(calendar, origin, destination, departure, back)
+        return calendar
+
+    @staticmethod
+    def _month_pairs(calendar: FareCalendar) -> list:
+        pairs = {(departure[:7], back[:7] if back else None) for departure, back in calendar.cells()}
+        return sorted(pairs, key=lambda pair: (pair[0], pair[1] or ""))
+
+    @staticmethod
+    def _empty_rows(calendar: FareCalendar) -> list:
+        rows = {(departure, back[:7] if back else None)
+                for (departure, back), price in calendar.prices.items() if price is None}
+        return sorted(rows, key=lambda row: (row[0], row[1] or ""))
+
+    def _fill(self, calendar: FareCalendar, origin: str, destination: str,
+              departure_at: str, return_at: str = None) -> bool:
+        """Запрашивает цены и заполняет ячейки; False, если ответ упёрся в limit."""
+        response = self._search(calendar, origin, destination, departure_at, return_at)
+        data = response.get("data", [])
+        for ticket in data:
+            cell = (ticket["departure_at"][:10],
+                    ticket["return_at"][:10] if return_at and ticket.get("return_at") else None)
+            if cell in calendar.prices:
+                current = calendar.prices[cell]
+                if current is None or ticket["price"] < current:
+                    calendar.prices[cell] = ticket["price"]
+        return len(data) < self.limit
+
+    def _search(self, calendar: FareCalendar, origin: str, destination: str,
+                departure_at: str, return_at: str = None) -> dict:
+        endpoint, params = self.client.build_search(origin, destination, departure_at,
+                                                    return_at, limit=self.limit)
+        key = ResponseCache.key(endpoint, params)
+        if key not in self._responses:
+            response = self.client.search(origin, destination, departure_at, return_at,
+                                          limit=self.limit)
+            if not response.get("success"):
+                raise RuntimeError(f"API вернул ошибку: {response}")
+            self._responses[key] = response
+            calendar.calls += 1
+            if len(departure_at) == 7:
+                calendar.month_calls += 1
+            else:
+                calendar.day_calls += 1
+        return self._responses[key]
@@ -0,0 +1,163 @@
+import codecs
+import json
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = ",]}:" + _WHITESPACE
+
+
+class StreamDecodeError(ValueError):
+    """Тело ответа не является ожидаемым JSON-объектом."""
+
+
+class StreamedResponse:
+    """JSON-объект ответа, массив array_key которого разбирается по мере чтения тела.
+
+    Итерация отдаёт элементы массива по одному. В памяти держится только
+    ещё не разобранный хвост тела (примерно один чанк и один элемент),
+    поэтому расход памяти не зависит от размера ответа. Остальные поля
+    верхнего уровня (success, currency, error) попадают в fields по мере
+    чтения; поля, идущие после массива, известны только после итерации.
+    Если задан validator, каждый элемент перед выдачей проверяется им.
+    """
+
+    def __init__(self, chunks, array_key: str = "data", validator=None,
+                 close=None, status_code: int = None):
+        self.array_key = array_key
+        self.validator = validator
+        self.status_code = status_code
+        self.fields = {}
+        self.items = 0
+        self._chunks = iter(chunks)
+        self._close = close
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self._started = False
+        self._array_seen = False
+
+    @classmethod
+    def from_response(cls, response, chunk_size: int, array_key: str = "data",
+                      validator=None) -> "StreamedResponse":
+        """Потоковый разбор ответа requests, полученного с stream=True."""
+        return cls(response.iter_content(chunk_size), array_key, validator,
+                   close=response.close, status_code=response.status_code)
+
+    @classmethod
+    def from_data(cls, data: dict, array_key: str = "data",
+                  validator=None) -> "StreamedResponse":
+        """Тот же интерфейс над уже разобранным ответом (например, из кэша)."""
+        return cls([json.dumps(data, ensure_ascii=False)], array_key, validator,
+                   status_code=200)
+
+    def close(self):
+        """Закрывает ответ; непрочитанный остаток тела отбрасывается."""
+        if self._close is not None:
+            self._close()
+            self._close = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def get(self, name: str, default=None):
+        return self.fields.get(name, default)
+
+    def read(self) -> dict:
+        """Дочитывает ответ и возвращает его целиком, как response.json()."""
+        items = list(self)
+        if self.array_key in self.fields or not self._array_seen:
+            return dict(self.fields)
+        return {**self.fields, self.array_key: items}
+
+    def _fill(self) -> bool:
+        """Дописывает в буфер следующий чанк; False, если тело закончилось."""
+        if self._eof:
+            return False
+        for chunk in self._chunks:
+            text = self._decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+            if text:
+                self._buffer = self._buffer[self._pos:] + text
+                self._pos = 0
+                return True
+        self._buffer = self._buffer[self._pos:] + self._decoder.decode(b"", final=True)
+        self._pos = 0
+        self._eof = True
+        self.close()
+        return False
+
+    def _peek(self) -> str:
+        """Следующий непробельный символ без сдвига позиции ("" в конце тела)."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, chars: str) -> str:
+        char = self._peek()
+        if not char or char not in chars:
+            raise StreamDecodeError(
+                f"Ожидался один из символов {chars!r}, получено {char or 'конец тела'!r}")
+        self._pos += 1
+        return char
+
+    def _value(self):
+        """Разбирает следующее JSON-значение, дочитывая тело, пока оно не полное."""
+        self._peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as error:
+                if not self._fill():
+                    raise StreamDecodeError(f"Некорректный JSON: {error}") from error
+                continue
+            # Число в конце буфера может продолжаться в следующем чанке («12.» + «5»,
+            # «1.5e» + «3»): значение принимается, только если за ним идёт
+            # разделитель или тело закончилось, иначе буфер дочитывается
+            # и значение разбирается заново
+            if self._eof or (end < len(self._buffer) and self._buffer[end] in _DELIMITERS):
+                self._pos = end
+                return value
+            self._fill()
+
+    def __iter__(self):
+        if self._started:
+            raise RuntimeError("Ответ уже прочитан")
+        self._started = True
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self._value()
+            if not isinstance(key, str):
+                raise StreamDecodeError(f"Ожидался ключ объекта, получено {key!r}")
+            self._expect(":")
+            if key == self.array_key and self._peek() == "[":
+                self._pos += 1
+                self._array_seen = True
+                yield from self._array()
+            else:
+                self.fields[key] = self._value()
+            if self._expect(",}") == "}":
+                break
+        self.close()
+
+    def _array(self):
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            item = self._value()
+            if self.validator is not None:
+                self.validator.check(item, self.items)
+            self.items += 1
+            yield item
+            if self._expect(",]") == "]":
+                return
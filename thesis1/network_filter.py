@@ -0,0 +1,195 @@
+import json
+import os
+import threading
+from collections import namedtuple
+from fnmatch import fnmatchcase
+from urllib.parse import urlsplit
+
+# Профиль сети сессии: имя, свои сайты и правило host-resolver-rules (None,
+# если сторонние хосты не блокируются) и шаблоны для Network.setBlockedURLs
+NetworkProfile = namedtuple("NetworkProfile", "name sites host_rules patterns")
+
+# Ошибка запросов к хостам, отключённым правилом host_resolver_rules
+BLOCKED_ERROR = "net::ERR_NAME_NOT_RESOLVED"
+
+
+def site_of(host: str) -> str:
+    """Сайт хоста: две последние метки домена (для IP и localhost — сам хост).
+
+    Приближение без списка публичных суффиксов: для хостов вида *.co.uk
+    сайтом окажется co.uk. Для сайтов Aviasales и локальных стабов этого хватает.
+    """
+    host = (host or "").lower().rstrip(".")
+    if not host or host == "localhost" or ":" in host or host.replace(".", "").isdigit():
+        return host
+    return ".".join(host.split(".")[-2:])
+
+
+def first_party_sites(origin: str, allowlist: list = ()) -> list:
+    """Сайты, запросы к которым не считаются сторонними.
+
+    Это сайт страницы (origin) и записи allowlist: URL или хосты
+    (например, собственный CDN на другом домене), вместе с поддоменами.
+    """
+    sites = [site_of(urlsplit(origin).hostname)]
+    for entry in allowlist:
+        host = urlsplit(entry).hostname if "://" in entry else entry
+        if host and host.lower() not in sites:
+            sites.append(host.lower())
+    return sites
+
+
+def is_third_party(url: str, sites: list) -> bool:
+    """Запрос к хосту вне sites (и их поддоменов)."""
+    host = (urlsplit(url).hostname or "").lower()
+    if not host:
+        return False
+    return not any(host == site or host.endswith("." + site) for site in sites)
+
+
+def origin_of(url: str) -> str:
+    """Origin страницы по URL; для about:, data: и т.п. — пустая строка."""
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.netloc:
+        return ""
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def host_resolver_rules(sites: list) -> str:
+    """Правило Chrome --host-resolver-rules, блокирующее все сторонние хосты.
+
+    Network.setBlockedURLs понимает только шаблоны «что блокировать»,
+    а «всё, кроме своего сайта» ими не выразить. Поэтому сторонние хосты
+    не резолвятся (запрос падает с net::ERR_NAME_NOT_RESOLVED), а сайт
+    страницы, его поддомены и allowlist исключены из правила. Блокируются
+    и сторонние картинки, шрифты и видео; свои ресурсы сайта (в том числе
+    логотип) загружаются.
+    """
+    rules = ["MAP * ~NOTFOUND", "EXCLUDE localhost"]
+    for site in sites:
+        rules += [f"EXCLUDE {site}", f"EXCLUDE *.{site}"]
+    return ", ".join(rules)
+
+
+def blocked_patterns(patterns: list, allowlist: list = ()) -> list:
+    """Шаблоны URL профиля без тех, что задели бы запись из allowlist.
+
+    Network.setBlockedURLs не умеет исключения, поэтому allowlist
+    применяется заранее: шаблон, под который попадает разрешённый URL
+    (для записи-хоста — https://хост/), в браузер не передаётся.
+    """
+    urls = [entry if "://" in entry else f"https://{entry}/" for entry in allowlist]
+    return [pattern for pattern in patterns
+            if not any(fnmatchcase(url, pattern) for url in urls)]
+
+
+def apply_network_profile(driver, patterns: list):
+    """Включает в браузере блокировку запросов по шаблонам (пустой список — снимает её)."""
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+
+
+def collect_traffic(driver, sites: list = None) -> dict:
+    """Сетевой трафик с прошлого вызова по журналу performance браузера.
+
+    Журнал при чтении очищается, поэтому вызов перед тестом сбрасывает
+    счётчики, а после теста возвращает трафик самого теста. Заблокированными
+    считаются запросы, отклонённые по шаблонам Network.setBlockedURLs, и,
+    если передан sites, запросы к сторонним хостам (см. host_resolver_rules).
+    origins — origin загруженных документов (страниц и фреймов), их хранилища
+    DriverPool очищает перед следующим тестом.
+    """
+    traffic = {"requests": 0, "bytes": 0, "blocked": 0, "blocked_urls": [], "origins": []}
+    try:
+        entries = driver.get_log("performance")
+    except Exception:
+        return traffic
+
+    urls = {}
+    origins = set()
+    for entry in entries:
+        message = json.loads(entry["message"])["message"]
+        method, params = message.get("method"), message.get("params", {})
+        if method == "Network.requestWillBeSent":
+            traffic["requests"] += 1
+            urls[params["requestId"]] = params["request"]["url"]
+            if params.get("type") == "Document":
+                origins.add(origin_of(params["request"]["url"]))
+        elif method == "Network.loadingFinished":
+            traffic["bytes"] += int(params.get("encodedDataLength", 0))
+        elif method == "Network.loadingFailed" and (
+                params.get("blockedReason")
+                or (sites is not None and params.get("errorText") == BLOCKED_ERROR
+                    and is_third_party(urls.get(params["requestId"], ""), sites))):
+            traffic["blocked"] += 1
+            traffic["blocked_urls"].append(urls.get(params["requestId"], ""))
+    # Заблокированные запросы тоже проходят через requestWillBeSent
+    traffic["requests"] -= traffic["blocked"]
+    traffic["origins"] = sorted(origin for origin in origins if origin)
+    return traffic
+
+
+class NetworkHistory:
+    """Трафик тестов в профиле full и экономия в остальных профилях.
+
+    После каждого прогона в профиле full трафик теста запоминается в файле;
+    в других профилях сэкономленные запросы и байты считаются от этой базы.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.results = []
+        self._baseline = {}
+        self._updated = {}
+        self._lock = threading.Lock()
+        try:
+            with open(path, encoding="utf-8") as file:
+                self._baseline = json.load(file)
+        except (OSError, ValueError):
+            pass
+
+    def record(self, test_id: str, profile: str, traffic: dict) -> dict:
+        """Запоминает трафик теста и возвращает его вместе с экономией."""
+        result = {"test": test_id, "profile": profile,
+                  "requests": traffic["requests"], "bytes": traffic["bytes"],
+                  "blocked": traffic["blocked"]}
+        with self._lock:
+            if profile == "full":
+                self._updated[test_id] = {"requests": traffic["requests"],
+                                          "bytes": traffic["bytes"]}
+            elif test_id in self._baseline:
+                base = self._baseline[test_id]
+                result["requests_saved"] = base["requests"] - traffic["requests"]
+                result["bytes_saved"] = base["bytes"] - traffic["bytes"]
+            self.results.append(result)
+        return result
+
+    def save(self):
+        """Дописывает трафик профиля full в файл истории."""
+        if not self._updated:
+            return
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                history = json.load(file)
+        except (OSError, ValueError):
+            history = {}
+        history.update(self._updated)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(history, file, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def report(self) -> list:
+        lines = []
+        for result in self.results:
+            line = (f"{result['test']} [{result['profile']}]: запросов {result['requests']}, "
+                    f"{result['bytes'] / 1024:.0f} КиБ, заблокировано {result['blocked']}")
+            if "bytes_saved" in result:
+                line += (f", сэкономлено {result['requests_saved']} запросов "
+                         f"и {result['bytes_saved'] / 1024:.0f} КиБ")
+            lines.append(line)
+        saved = [result for result in self.results if "bytes_saved" in result]
+        if saved:
+            lines.append(f"Итого сэкономлено: {sum(r['requests_saved'] for r in saved)} запросов, "
+                         f"{sum(r['bytes_saved'] for r in saved) / 2**20:.1f} МиБ")
+        return lines
@@ -1,65 +1,178 @@
+import json
 import allure
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from config import config
+from pages.locators import LOCATORS
+from pages.performance import (PerformanceBudgetExceeded, check_budget,
+                               collect_performance, enable_cdp_metrics)
+from pages.selector_cache import default_selector_cache
+from pages.wait_policy import WaitPolicy, WaitTimeout, page_action
+
+# Собирает сведения о всех элементах, подходящих под список CSS-селекторов,
+# за один вызов: для каждого элемента возвращается компактная запись
+# [элемент, селектор, тег, текст, видим, доступен, x, y, ширина, высота].
+# Элемент, подходящий под несколько селекторов, попадает в ответ один раз
+# (с первым из них). С stopAtVisible=true перебор останавливается на первом
+# видимом элементе. Некорректные селекторы пропускаются.
+QUERY_ELEMENTS_SCRIPT = """
+var selectors = arguments[0], stopAtVisible = arguments[1], textLimit = arguments[2];
+var records = [], seen = new Set();
+function isVisible(el) {
+    var style = window.getComputedStyle(el);
+    return style.visibility !== 'hidden' && style.display !== 'none'
+        && !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+}
+for (var i = 0; i < selectors.length; i++) {
+    var elements;
+    try { elements = document.querySelectorAll(selectors[i]); } catch (e) { continue; }
+    for (var j = 0; j < elements.length; j++) {
+        var el = elements[j];
+        if (seen.has(el)) continue;
+        seen.add(el);
+        var visible = isVisible(el), rect = el.getBoundingClientRect();
+        var enabled = !el.disabled && el.getAttribute('aria-disabled') !== 'true';
+        var text = (visible ? el.innerText : el.textContent) || el.value || '';
+        records.push([el, selectors[i], el.tagName.toLowerCase(),
+                      text.trim().slice(0, textLimit), visible, enabled,
+                      rect.x, rect.y, rect.width, rect.height]);
+        if (stopAtVisible && visible) return records;
+    }
+}
+return records;
+"""
+
+
+class ElementInfo:
+    """Запись о найденном элементе из одного пакетного запроса к странице."""
+
+    __slots__ = ("element", "selector", "tag", "text", "visible", "enabled", "rect")
+
+    def __init__(self, element, selector, tag, text, visible, enabled, x, y, width, height):
+        self.element = element
+        self.selector = selector
+        self.tag = tag
+        self.text = text
+        self.visible = visible
+        self.enabled = enabled
+        self.rect = {"x": x, "y": y, "width": width, "height": height}
+
+    @property
+    def clickable(self) -> bool:
+        return self.visible and self.enabled
+
+    def __repr__(self):
+        return f"ElementInfo({self.tag}, {self.selector!r}, {self.text[:30]!r}, visible={self.visible})"
 
 
 class AviasalesPage:
     """Page Object для главной страницы Aviasales."""
 
-    def __init__(self, driver):
+    # Имя страницы в config.PERFORMANCE_BUDGETS
+    PAGE_NAME = "main"
+    # Длина текста элемента в записях query_elements
+    TEXT_LIMIT = 200
+    # Слова, по которым кнопка поиска ищется среди всех кнопок страницы
+    SEARCH_BUTTON_WORDS = ("найти", "search")
+
+    # Варианты CSS-селекторов для каждого элемента страницы (pages/locators.py)
+    LOCATORS = LOCATORS
+
+    def __init__(self, driver, selector_cache=None, waits: WaitPolicy = None):
         self.driver = driver
-        self.wait = WebDriverWait(driver, 10)
+        self.waits = waits or WaitPolicy(driver)
+        self.selector_cache = selector_cache or default_selector_cache()
+        self.performance = None
+
+    def find_first(self, name: str, visible: bool = False):
+        """Находит элемент по списку селекторов локатора name.
+
+        Все селекторы проверяются одним скриптом в браузере, поэтому каждая
+        попытка — один запрос к WebDriver, а ожидание ограничено бюджетом
+        текущего действия. Первым проверяется селектор, сработавший в прошлый раз.
+        Возвращает None, если элемент так и не появился (причина —
+        в self.waits.last_timeout).
+        """
+        selectors = self.selector_cache.order(name, self.LOCATORS[name])
+
+        def first_match(driver):
+            records = self.query_elements(selectors, stop_at_visible=True)
+            for record in records:
+                if record.visible:
+                    return record
+            return None if visible or not records else records[0]
+
+        try:
+            record = self.waits.until(first_match, f"элемент '{name}'")
+        except WaitTimeout:
+            self.selector_cache.record_miss(name)
+            return None
+        self.selector_cache.record(name, record.selector)
+        return record.element
+
+    def query_elements(self, selectors: list, stop_at_visible: bool = False) -> list:
+        """Сведения обо всех элементах под селекторами за один запрос к WebDriver.
+
+        Возвращает список ElementInfo (видимость, доступность, текст,
+        размеры) в порядке селекторов. Вместо отдельных вызовов
+        is_displayed(), is_enabled() и text для каждого элемента.
+        """
+        records = self.driver.execute_script(QUERY_ELEMENTS_SCRIPT, selectors,
+                                             stop_at_visible, self.TEXT_LIMIT) or []
+        return [ElementInfo(*record) for record in records]
 
     @allure.step("Открыть главную страницу")
+    @page_action
     def open(self):
-        """Открывает главную страницу Aviasales."""
-        self.driver.get("https://www.aviasales.ru")
+        """Открывает главную страницу Aviasales и замеряет скорость загрузки.
+
+        Метрики загрузки прикладываются к шагу Allure и сохраняются
+        в self.performance. Если они превышают бюджет страницы из
+        config.PERFORMANCE_BUDGETS, бросается PerformanceBudgetExceeded.
+        """
+        enable_cdp_metrics(self.driver)
+        self.driver.get(config.BASE_URL)
         # Ждем загрузки страницы
-        self.wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+        self.waits.until(EC.presence_of_element_located((By.TAG_NAME, "body")),
+                         "загрузка страницы")
+
+        self.performance = collect_performance(self.driver)
+        allure.attach(json.dumps(self.performance, ensure_ascii=False, indent=1),
+                      name="Производительность страницы",
+                      attachment_type=allure.attachment_type.JSON)
+        violations = check_budget(self.performance,
+                                  config.PERFORMANCE_BUDGETS.get(self.PAGE_NAME, {}))
+        if violations and config.PERFORMANCE_BUDGETS_ENABLED:
+            raise PerformanceBudgetExceeded(
+                f"Превышен бюджет производительности страницы '{self.PAGE_NAME}': "
+                + "; ".join(violations))
 
     @allure.step("Получить заголовок страницы")
+    @page_action
     def get_title(self):
         """Возвращает заголовок страницы."""
         return self.driver.title
 
     @allure.step("Получить поле 'Откуда'")
+    @page_action
     def get_origin_field(self):
         """Находит поле ввода для города отправления."""
-        # Пробуем разные селекторы
-        selectors = [
-            "input[placeholder*='Откуда']",
-            "input[placeholder*='откуда']",
-            "[data-test-id='origin']",
-            "#origin",
-            ".origin-field input"
-        ]
-        for selector in selectors:
-            try:
-                return self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
-            except:
-                continue
-        raise Exception("Не удалось найти поле 'Откуда'")
+        field = self.find_first("origin")
+        if field is None:
+            raise Exception(f"Не удалось найти поле 'Откуда': {self.waits.last_timeout}")
+        return field
 
     @allure.step("Получить поле 'Куда'")
+    @page_action
     def get_destination_field(self):
         """Находит поле ввода для города назначения."""
-        # Пробуем разные селекторы
-        selectors = [
-            "input[placeholder*='Куда']",
-            "input[placeholder*='куда']",
-            "[data-test-id='destination']",
-            "#destination",
-            ".destination-field input"
-        ]
-        for selector in selectors:
-            try:
-                return self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
-            except:
-                continue
-        raise Exception("Не удалось найти поле 'Куда'")
+        field = self.find_first("destination")
+        if field is None:
+            raise Exception(f"Не удалось найти поле 'Куда': {self.waits.last_timeout}")
+        return field
 
     @allure.step("Заполнить поле 'Откуда'")
+    @page_action
     def set_origin(self, city):
         """Заполняет поле 'Откуда' указанным городом."""
         field = self.get_origin_field()
@@ -67,6 +180,7 @@ class AviasalesPage:
         field.send_keys(city)
 
     @allure.step("Заполнить поле 'Куда'")
+    @page_action
     def set_destination(self, city):
         """Заполняет поле 'Куда' указанным городом."""
         field = self.get_destination_field()
@@ -74,72 +188,61 @@ class AviasalesPage:
         field.send_keys(city)
 
     @allure.step("Нажать поиск")
+    @page_action
     def search(self):
-        """Нажимает кнопку поиска билетов."""
-        # Ищем кнопку поиска разными способами
-        selectors = [
-            "button[type='submit']",
-            "button:contains('Найти')",
-            ".search-button",
-            "[data-test-id='search-button']",
-            "button.search-btn"
-        ]
-
-        for selector in selectors:
-            try:
-                buttons = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                for button in buttons:
-                    if button.is_displayed() and button.is_enabled():
-                        self.wait.until(EC.element_to_be_clickable(button))
-                        button.click()
-                        return
-            except:
-                continue
-
-        # Если не нашли, пробуем найти по тексту
-        buttons = self.driver.find_elements(By.TAG_NAME, "button")
-        for button in buttons:
-            if button.is_displayed() and button.is_enabled():
-                text = button.text.lower()
-                if "найти" in text or "search" in text:
-                    self.wait.until(EC.element_to_be_clickable(button))
-                    button.click()
-                    return
+        """Нажимает кнопку поиска билетов.
+
+        Кандидаты — элементы локатора search_button, а если среди них нет
+        доступной кнопки, то любая кнопка со словом «Найти» или «Search».
+        Все кандидаты проверяются одним запросом к странице. Если доступная
+        кнопка не появилась за бюджет действия, бросает WaitTimeout.
+        """
+        selectors = self.selector_cache.order("search_button", self.LOCATORS["search_button"])
+
+        def pick_button(driver):
+            records = self.query_elements(selectors + ["button"])
+            for record in records:
+                if record.clickable and record.selector != "button":
+                    return record
+            for record in records:
+                if record.clickable and any(word in record.text.lower()
+                                            for word in self.SEARCH_BUTTON_WORDS):
+                    return record
+            return None
+
+        try:
+            button = self.waits.until(pick_button, "кнопка поиска доступна")
+        except WaitTimeout:
+            self.selector_cache.record_miss("search_button")
+            raise
+        if button.selector != "button":
+            self.selector_cache.record("search_button", button.selector)
+        button.element.click()
 
     @allure.step("Получить URL")
+    @page_action
     def get_url(self):
         """Возвращает текущий URL страницы."""
         return self.driver.current_url
 
+    @allure.step("Дождаться смены URL")
+    @page_action
+    def wait_for_url_change(self, url):
+        """Ждёт, пока текущий URL станет отличаться от url."""
+        self.waits.until(lambda driver: driver.current_url != url, f"URL отличается от {url}")
+
     @allure.step("Найти футер")
+    @page_action
     def find_footer(self):
         """Находит футер сайта."""
-        selectors = [
-            "footer",
-            ".footer",
-            "[data-test-id='footer']",
-            "div.footer"
-        ]
-        for selector in selectors:
-            try:
-                return self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
-            except:
-                continue
-        raise Exception("Не удалось найти футер")
+        footer = self.find_first("footer")
+        if footer is None:
+            raise Exception(f"Не удалось найти футер: {self.waits.last_timeout}")
+        return footer
 
     @allure.step("Получить логотип")
+    @page_action
     def find_logo(self):
         """Находит логотип сайта."""
-        selectors = [
-            "a[href='/']",
-            ".logo",
-            "[data-test-id='logo']",
-            "img[alt*='Aviasales']",
-            "img[alt*='логотип']"
-        ]
-        for selector in selectors:
-            try:
-                return self.wait.until(EC.visibility_of_element_located((By.CSS_SELECTOR, selector)))
-            except:
-                continue
-        return None
+        return self.find_first("logo", visible=True)
+
@@ -0,0 +1,38 @@
+# Варианты CSS-селекторов для каждого элемента главной страницы.
+# Общие для браузерного Page Object и для проверок по HTML без браузера,
+# поэтому здесь нет импортов Selenium
+LOCATORS = {
+    "origin": [
+        "input[placeholder*='Откуда']",
+        "input[placeholder*='откуда']",
+        "[data-test-id='origin']",
+        "#origin",
+        ".origin-field input"
+    ],
+    "destination": [
+        "input[placeholder*='Куда']",
+        "input[placeholder*='куда']",
+        "[data-test-id='destination']",
+        "#destination",
+        ".destination-field input"
+    ],
+    "footer": [
+        "footer",
+        ".footer",
+        "[data-test-id='footer']",
+        "div.footer"
+    ],
+    "search_button": [
+        "button[type='submit']",
+        ".search-button",
+        "[data-test-id='search-button']",
+        "button.search-btn"
+    ],
+    "logo": [
+        "a[href='/']",
+        ".logo",
+        "[data-test-id='logo']",
+        "img[alt*='Aviasales']",
+        "img[alt*='логотип']"
+    ],
+}
@@ -0,0 +1,73 @@
+from selenium.common.exceptions import WebDriverException
+
+# Собирает Navigation Timing, сводку Resource Timing и Largest Contentful Paint.
+# LCP приходит в PerformanceObserver асинхронно, поэтому скрипт асинхронный:
+# ответ отдаётся после первого отчёта LCP или через 1 секунду.
+PERFORMANCE_SCRIPT = """
+var done = arguments[arguments.length - 1], finished = false, lcp = null;
+function finish() {
+    if (finished) return;
+    finished = true;
+    var nav = performance.getEntriesByType('navigation')[0] || {};
+    var resources = performance.getEntriesByType('resource');
+    var byType = {}, transfer = nav.transferSize || 0;
+    resources.forEach(function (r) {
+        var t = byType[r.initiatorType] || (byType[r.initiatorType] = {count: 0, transfer_size: 0});
+        t.count += 1;
+        t.transfer_size += r.transferSize || 0;
+        transfer += r.transferSize || 0;
+    });
+    done({
+        ttfb_ms: nav.responseStart,
+        dom_content_loaded_ms: nav.domContentLoadedEventEnd,
+        load_ms: nav.loadEventEnd,
+        lcp_ms: lcp,
+        document_transfer_size: nav.transferSize,
+        transfer_size_kb: transfer / 1024,
+        resource_count: resources.length,
+        resources_by_type: byType
+    });
+}
+try {
+    new PerformanceObserver(function (list) {
+        var entries = list.getEntries();
+        var last = entries[entries.length - 1];
+        lcp = last.renderTime || last.loadTime || last.startTime;
+        finish();
+    }).observe({type: 'largest-contentful-paint', buffered: true});
+} catch (e) {}
+setTimeout(finish, 1000);
+"""
+
+
+class PerformanceBudgetExceeded(AssertionError):
+    """Метрики загрузки страницы превысили бюджет."""
+
+
+def enable_cdp_metrics(driver):
+    """Включает сбор метрик Chrome DevTools Protocol (до загрузки страницы)."""
+    try:
+        driver.execute_cdp_cmd("Performance.enable", {})
+    except (AttributeError, WebDriverException):
+        pass
+
+
+def collect_performance(driver) -> dict:
+    """Метрики загрузки текущей страницы: тайминги браузера и метрики CDP."""
+    metrics = driver.execute_async_script(PERFORMANCE_SCRIPT) or {}
+    try:
+        cdp = driver.execute_cdp_cmd("Performance.getMetrics", {})
+        metrics["cdp"] = {item["name"]: item["value"] for item in cdp.get("metrics", [])}
+    except (AttributeError, WebDriverException):
+        metrics["cdp"] = {}
+    return metrics
+
+
+def check_budget(metrics: dict, budget: dict) -> list:
+    """Возвращает описания метрик, превысивших бюджет (пустой список — всё в норме)."""
+    violations = []
+    for name, limit in budget.items():
+        value = metrics.get(name)
+        if value is not None and value > limit:
+            violations.append(f"{name} = {value:.0f}, бюджет {limit}")
+    return violations
@@ -0,0 +1,73 @@
+import json
+import os
+import threading
+
+from config import config
+
+
+class SelectorCache:
+    """Запоминает, какой селектор сработал для каждого локатора в прошлый раз.
+
+    Кэш хранится в JSON-файле между запусками: при следующем поиске
+    сработавший селектор проверяется первым, а остальные варианты остаются
+    запасными на случай, если вёрстка изменится.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path
+        # Результаты поиска по локаторам: hits — сработал запомненный селектор,
+        # fallbacks — пришлось перебрать запасные, misses — элемент не найден
+        self.lookups = {}
+        self._winners = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as file:
+                    self._winners = json.load(file)
+            except ValueError:
+                self._winners = {}
+
+    def order(self, name: str, selectors: list) -> list:
+        """Возвращает селекторы локатора, начиная с сработавшего в прошлый раз."""
+        winner = self._winners.get(name)
+        if winner not in selectors:
+            return list(selectors)
+        return [winner] + [selector for selector in selectors if selector != winner]
+
+    def record(self, name: str, selector: str):
+        """Запоминает сработавший селектор и сохраняет кэш, если он изменился."""
+        with self._lock:
+            if self._winners.get(name) == selector:
+                self._count(name, "hits")
+                return
+            self._count(name, "fallbacks")
+            self._winners[name] = selector
+            if self.path:
+                with open(self.path, "w", encoding="utf-8") as file:
+                    json.dump(self._winners, file, ensure_ascii=False, indent=1, sort_keys=True)
+
+    def record_miss(self, name: str):
+        """Отмечает, что ни один селектор локатора не сработал."""
+        with self._lock:
+            self._count(name, "misses")
+
+    def _count(self, name: str, outcome: str):
+        stats = self.lookups.setdefault(name, {"hits": 0, "fallbacks": 0, "misses": 0})
+        stats[outcome] += 1
+
+    def report(self) -> str:
+        parts = [f"{name}: попаданий {stats['hits']}, запасной селектор {stats['fallbacks']}, "
+                 f"не найден {stats['misses']}"
+                 for name, stats in sorted(self.lookups.items())]
+        return "Кэш селекторов: " + "; ".join(parts)
+
+
+_default_cache = None
+
+
+def default_selector_cache() -> SelectorCache:
+    """Общий кэш селекторов процесса, хранящийся в config.SELECTOR_CACHE_PATH."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = SelectorCache(config.SELECTOR_CACHE_PATH)
+    return _default_cache
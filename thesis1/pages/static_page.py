@@ -0,0 +1,300 @@
+import re
+from html.parser import HTMLParser
+
+import requests
+
+from config import config
+from pages.locators import LOCATORS
+
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+             "meta", "param", "source", "track", "wbr"}
+# Содержимое этих тегов браузер не показывает как текст
+NON_TEXT_TAGS = {"script", "style", "template", "noscript"}
+
+
+class UnsupportedSelector(ValueError):
+    """Селектор нельзя проверить по HTML без браузера (псевдоклассы и т.п.)."""
+
+
+class StaticUnavailable(Exception):
+    """Страницу не удалось получить или разобрать без браузера."""
+
+
+class Node:
+    """Элемент разобранного HTML: тег, атрибуты и содержимое (узлы и строки)."""
+
+    __slots__ = ("tag", "attrs", "parent", "content")
+
+    def __init__(self, tag: str, attrs: dict, parent=None):
+        self.tag = tag
+        self.attrs = attrs
+        self.parent = parent
+        self.content = []
+
+    @property
+    def children(self) -> list:
+        return [item for item in self.content if isinstance(item, Node)]
+
+    @property
+    def text(self) -> str:
+        """Текст элемента без содержимого script/style, с нормализованными пробелами."""
+        parts = []
+        self._collect_text(parts)
+        return " ".join("".join(parts).split())
+
+    def _collect_text(self, parts: list):
+        for item in self.content:
+            if isinstance(item, str):
+                parts.append(item)
+            elif item.tag not in NON_TEXT_TAGS:
+                item._collect_text(parts)
+
+    def iter(self):
+        """Все элементы-потомки в порядке документа."""
+        for child in self.children:
+            yield child
+            yield from child.iter()
+
+    @property
+    def hidden(self) -> bool:
+        """Скрыт ли элемент разметкой (сам или через предка).
+
+        Без браузера стили из CSS-файлов не применяются, поэтому учитываются
+        только атрибут hidden, type="hidden" и встроенный display:none /
+        visibility:hidden.
+        """
+        node = self
+        while node is not None and node.tag != "#document":
+            style = node.attrs.get("style", "").replace(" ", "").lower()
+            if ("hidden" in node.attrs or node.attrs.get("type") == "hidden"
+                    or "display:none" in style or "visibility:hidden" in style):
+                return True
+            node = node.parent
+        return False
+
+    def is_displayed(self) -> bool:
+        """Как WebElement.is_displayed(), но по разметке (см. hidden)."""
+        return not self.hidden
+
+    def __repr__(self):
+        return f"Node(<{self.tag}>, {self.attrs})"
+
+
+class _TreeBuilder(HTMLParser):
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Node("#document", {})
+        self._stack = [self.root]
+
+    def handle_starttag(self, tag, attrs):
+        node = Node(tag, {name: value or "" for name, value in attrs}, self._stack[-1])
+        self._stack[-1].content.append(node)
+        if tag not in VOID_TAGS:
+            self._stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        node = Node(tag, {name: value or "" for name, value in attrs}, self._stack[-1])
+        self._stack[-1].content.append(node)
+
+    def handle_endtag(self, tag):
+        # Незакрытые вложенные теги закрываются вместе с родителем, лишние — игнорируются
+        for index in range(len(self._stack) - 1, 0, -1):
+            if self._stack[index].tag == tag:
+                del self._stack[index:]
+                return
+
+    def handle_data(self, data):
+        self._stack[-1].content.append(data)
+
+
+def parse_html(html: str) -> Node:
+    """Разбирает HTML в дерево Node; возвращает корень документа."""
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+
+# Простые CSS-селекторы: тег, #id, .класс, [атрибут], [атрибут=значение]
+# с операторами = ~= |= ^= $= *=, комбинаторы «пробел» и «>»
+_COMPOUND = re.compile(r"(\*|[a-zA-Z][\w-]*)?((?:#[\w-]+|\.[\w-]+|\[[^\]]+\])*)$")
+_PART = re.compile(r"#([\w-]+)|\.([\w-]+)|\[([^\]]+)\]")
+_ATTRIBUTE = re.compile(
+    r"""^\s*([\w:-]+)\s*(?:([~|^$*]?=)\s*(?:'([^']*)'|"([^"]*)"|([^\s'"]+))\s*(i)?)?\s*$""")
+
+
+def _tokenize(selector: str) -> list:
+    """Разбивает селектор на простые части и комбинаторы (вне кавычек и скобок)."""
+    tokens, current, quote, depth = [], "", None, 0
+    for char in selector.strip():
+        if quote:
+            current += char
+            quote = None if char == quote else quote
+        elif char in "'\"":
+            current += char
+            quote = char
+        elif char == "[":
+            depth += 1
+            current += char
+        elif char == "]":
+            depth -= 1
+            current += char
+        elif depth == 0 and (char.isspace() or char == ">"):
+            if current:
+                tokens.append(current)
+                current = ""
+            if char == ">":
+                tokens.append(">")
+        else:
+            current += char
+    if current:
+        tokens.append(current)
+    return tokens
+
+
+def _compile_compound(text: str):
+    match = _COMPOUND.match(text)
+    if not match or not text:
+        raise UnsupportedSelector(text)
+    tag, parts = match.group(1), match.group(2)
+    checks = []
+    if tag and tag != "*":
+        checks.append(lambda node, tag=tag.lower(): node.tag == tag)
+    for element_id, class_name, attribute in _PART.findall(parts):
+        if element_id:
+            checks.append(lambda node, value=element_id: node.attrs.get("id") == value)
+        elif class_name:
+            checks.append(lambda node, value=class_name:
+                          value in node.attrs.get("class", "").split())
+        else:
+            checks.append(_compile_attribute(attribute))
+    return lambda node: all(check(node) for check in checks)
+
+
+def _compile_attribute(text: str):
+    match = _ATTRIBUTE.match(text)
+    if not match:
+        raise UnsupportedSelector(f"[{text}]")
+    name, operator = match.group(1).lower(), match.group(2)
+    value = next((group for group in match.group(3, 4, 5) if group is not None), None)
+    ignore_case = bool(match.group(6))
+
+    def check(node):
+        if name not in node.attrs:
+            return False
+        if operator is None:
+            return True
+        actual, expected = node.attrs[name], value
+        if ignore_case:
+            actual, expected = actual.lower(), expected.lower()
+        if operator == "=":
+            return actual == expected
+        if operator == "~=":
+            return expected in actual.split()
+        if operator == "|=":
+            return actual == expected or actual.startswith(expected + "-")
+        if operator == "^=":
+            return bool(expected) and actual.startswith(expected)
+        if operator == "$=":
+            return bool(expected) and actual.endswith(expected)
+        return bool(expected) and expected in actual
+    return check
+
+
+def select(root: Node, selector: str) -> list:
+    """Элементы документа под CSS-селектор в порядке документа.
+
+    Поддерживается подмножество CSS, которого хватает для LOCATORS; для
+    остального (псевдоклассы, «+», «~», списки через запятую) бросается
+    UnsupportedSelector.
+    """
+    tokens = _tokenize(selector)
+    if not tokens or tokens[0] == ">" or tokens[-1] == ">":
+        raise UnsupportedSelector(selector)
+    steps, combinator = [], " "
+    for token in tokens:
+        if token == ">":
+            combinator = ">"
+            continue
+        steps.append((combinator, _compile_compound(token)))
+        combinator = " "
+
+    def matches(node, index):
+        combinator, check = steps[index]
+        if not check(node):
+            return False
+        if index == 0:
+            return True
+        parent = node.parent
+        if combinator == ">":
+            return parent is not None and parent.tag != "#document" and matches(parent, index - 1)
+        while parent is not None and parent.tag != "#document":
+            if matches(parent, index - 1):
+                return True
+            parent = parent.parent
+        return False
+
+    return [node for node in root.iter() if matches(node, len(steps) - 1)]
+
+
+class StaticPage:
+    """Главная страница, полученная обычным HTTP-запросом и разобранная без браузера.
+
+    Использует те же LOCATORS, что и AviasalesPage. Годится для проверок,
+    которым хватает HTML, отданного сервером: заголовок, наличие элементов
+    и их текст. Разметка, которую достраивает JavaScript, здесь не видна.
+    """
+
+    LOCATORS = LOCATORS
+
+    def __init__(self, url: str = None, session: requests.Session = None,
+                 selector_cache=None):
+        self.url = url
+        self.session = session or requests.Session()
+        self.selector_cache = selector_cache
+        self.document = None
+
+    def open(self):
+        """Загружает и разбирает страницу; StaticUnavailable, если это не удалось."""
+        url = self.url or config.BASE_URL
+        try:
+            response = self.session.get(url, timeout=config.STATIC_TIMEOUT,
+                                        headers={"User-Agent": config.STATIC_USER_AGENT})
+        except requests.RequestException as error:
+            raise StaticUnavailable(f"{url}: {error}") from error
+        if response.status_code != 200 or "html" not in response.headers.get("Content-Type", ""):
+            raise StaticUnavailable(f"{url}: HTTP {response.status_code}, "
+                                    f"{response.headers.get('Content-Type')}")
+        if response.encoding is None or response.encoding.lower() == "iso-8859-1":
+            response.encoding = response.apparent_encoding or "utf-8"
+        self.document = parse_html(response.text)
+        return self
+
+    def get_title(self) -> str:
+        titles = select(self.document, "title")
+        return titles[0].text if titles else ""
+
+    def find_first(self, name: str, visible: bool = False):
+        """Первый элемент по списку селекторов локатора name (или None).
+
+        Селекторы проверяются в том же порядке, что и в браузере. С visible=True
+        пропускаются элементы, скрытые разметкой. Если ни один селектор не сработал,
+        а часть из них проверить без браузера нельзя, бросается UnsupportedSelector.
+        """
+        selectors = self.LOCATORS[name]
+        if self.selector_cache is not None:
+            selectors = self.selector_cache.order(name, selectors)
+        unsupported = []
+        for selector in selectors:
+            try:
+                nodes = select(self.document, selector)
+            except UnsupportedSelector:
+                unsupported.append(selector)
+                continue
+            for node in nodes:
+                if not (visible and node.hidden):
+                    return node
+        if unsupported:
+            raise UnsupportedSelector(", ".join(unsupported))
+        return None
@@ -0,0 +1,124 @@
+import threading
+
+import allure
+
+from config import config
+from pages.static_page import StaticPage, StaticUnavailable, UnsupportedSelector
+
+TIER_NAMES = {"html": "HTML без браузера", "browser": "браузер"}
+
+
+class TierStats:
+    """Какой уровень обслужил каждую проверку и почему проверки уходили в браузер."""
+
+    def __init__(self):
+        self.checks = {}
+        self._lock = threading.Lock()
+
+    def record(self, check: str, tier: str, reason: str = None):
+        with self._lock:
+            stats = self.checks.setdefault(check, {"html": 0, "browser": 0, "reasons": {}})
+            stats[tier] += 1
+            if reason:
+                stats["reasons"][reason] = stats["reasons"].get(reason, 0) + 1
+
+    def report(self) -> list:
+        lines = []
+        for check, stats in sorted(self.checks.items()):
+            line = f"{check}: HTML {stats['html']}, браузер {stats['browser']}"
+            if stats["reasons"]:
+                line += " (" + "; ".join(f"{reason}: {count}"
+                                         for reason, count in stats["reasons"].items()) + ")"
+            lines.append(line)
+        return lines
+
+
+tier_stats = TierStats()
+
+
+class TieredAviasalesPage:
+    """Проверки главной страницы с двумя уровнями: HTML без браузера и браузер.
+
+    Сначала проверка выполняется по HTML, полученному обычным HTTP-запросом
+    (StaticPage, те же LOCATORS). В браузер (AviasalesPage) она уходит,
+    если страницу не удалось получить, селектор нельзя проверить без браузера
+    или элемент не нашёлся в HTML (например, его достраивает JavaScript).
+    Браузер запускается только при первом таком переходе. Уровень каждой
+    проверки записывается в self.tiers, в отчёт Allure и в tier_stats.
+    """
+
+    def __init__(self, browser_page_factory, static_page: StaticPage = None,
+                 static_tier: bool = None, stats: TierStats = None):
+        self.browser_page_factory = browser_page_factory
+        self.static_page = static_page or StaticPage()
+        self.static_tier = config.UI_STATIC_TIER if static_tier is None else static_tier
+        self.stats = tier_stats if stats is None else stats
+        self.tiers = {}
+        self._browser_page = None
+        self._static_error = None
+
+    @property
+    def browser_page(self):
+        """AviasalesPage с открытой главной страницей (браузер запускается при первом обращении)."""
+        if self._browser_page is None:
+            self._browser_page = self.browser_page_factory()
+            self._browser_page.open()
+        return self._browser_page
+
+    def _static(self) -> StaticPage:
+        if self._static_error is not None:
+            raise self._static_error
+        if self.static_page.document is None:
+            try:
+                self.static_page.open()
+            except StaticUnavailable as error:
+                self._static_error = error
+                raise
+        return self.static_page
+
+    def _check(self, check: str, static_check, browser_check):
+        """Выполняет проверку по HTML, а если это не удалось — в браузере."""
+        if not self.static_tier:
+            reason = "уровень HTML выключен"
+        else:
+            try:
+                result = static_check(self._static())
+                if result is not None:
+                    return self._served(check, "html", result)
+                reason = "не найдено в HTML"
+            except StaticUnavailable:
+                reason = "HTML недоступен"
+            except UnsupportedSelector:
+                reason = "селектор требует браузера"
+        return self._served(check, "browser", browser_check(self.browser_page), reason)
+
+    def _served(self, check: str, tier: str, result, reason: str = None):
+        self.tiers[check] = tier
+        self.stats.record(check, tier, reason)
+        title = f"Уровень проверки: {TIER_NAMES[tier]}"
+        if reason:
+            title += f" ({reason})"
+        with allure.step(title):
+            pass
+        return result
+
+    @allure.step("Получить заголовок страницы")
+    def get_title(self) -> str:
+        return self._check("title",
+                           lambda page: page.get_title() or None,
+                           lambda page: page.get_title())
+
+    @allure.step("Найти футер")
+    def find_footer(self):
+        """Футер с текстом: Node из HTML или WebElement из браузера."""
+        def static_check(page):
+            footer = page.find_first("footer")
+            return footer if footer is not None and footer.text else None
+        return self._check("footer", static_check, lambda page: page.find_footer())
+
+    @allure.step("Получить логотип")
+    def find_logo(self):
+        """Видимый логотип: Node из HTML или WebElement из браузера (или None)."""
+        return self._check("logo",
+                           lambda page: page.find_first("logo", visible=True),
+                           lambda page: page.find_logo())
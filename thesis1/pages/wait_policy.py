@@ -0,0 +1,162 @@
+import functools
+import threading
+import time
+from contextlib import contextmanager
+
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
+
+from config import config
+
+
+class WaitTimeout(TimeoutException):
+    """Истёк бюджет ожидания действия; сообщение объясняет, чего и сколько ждали."""
+
+
+class WaitMetrics:
+    """Время ожиданий по действиям страницы, общее для всех Page Object сессии."""
+
+    def __init__(self):
+        self.actions = {}
+        self._lock = threading.Lock()
+
+    def record(self, action: str, total: float, waited: float, polls: int, timeouts: int):
+        with self._lock:
+            stats = self.actions.setdefault(action, {
+                "calls": 0, "total_time": 0.0, "wait_time": 0.0, "polls": 0, "timeouts": 0,
+            })
+            stats["calls"] += 1
+            stats["total_time"] += total
+            stats["wait_time"] += waited
+            stats["polls"] += polls
+            stats["timeouts"] += timeouts
+
+    def report(self) -> list:
+        """Строки отчёта, отсортированные по времени ожидания."""
+        lines = []
+        for action, stats in sorted(self.actions.items(),
+                                    key=lambda entry: entry[1]["wait_time"], reverse=True):
+            lines.append(f"{action}: вызовов {stats['calls']}, всего {stats['total_time']:.2f} с, "
+                         f"ожидание {stats['wait_time']:.2f} с, опросов {stats['polls']}, "
+                         f"таймаутов {stats['timeouts']}")
+        return lines
+
+
+wait_metrics = WaitMetrics()
+
+
+class _Action:
+
+    def __init__(self, name: str, deadline: float):
+        self.name = name
+        self.deadline = deadline
+        self.waited = 0.0
+        self.polls = 0
+        self.timeouts = 0
+
+
+class WaitPolicy:
+    """Политика ожиданий с общим бюджетом времени на действие страницы.
+
+    Все ожидания внутри одного действия (в том числе вложенных вызовов
+    методов Page Object) расходуют один бюджет, поэтому худшее время действия
+    ограничено budget секундами. Опрос условия сначала частый, затем интервал
+    растёт в backoff раз до max_poll. Неявное ожидание WebDriver при этом
+    не используется.
+    """
+
+    IGNORED_EXCEPTIONS = (NoSuchElementException, StaleElementReferenceException)
+
+    def __init__(self, driver, budget: float = None, initial_poll: float = None,
+                 max_poll: float = None, backoff: float = 1.5, metrics: WaitMetrics = None):
+        self.driver = driver
+        self.budget = config.WAIT_BUDGET if budget is None else budget
+        self.initial_poll = config.WAIT_POLL_INITIAL if initial_poll is None else initial_poll
+        self.max_poll = config.WAIT_POLL_MAX if max_poll is None else max_poll
+        self.backoff = backoff
+        self.metrics = wait_metrics if metrics is None else metrics
+        self.last_timeout = None
+        self._action = None
+
+    @contextmanager
+    def action(self, name: str, budget: float = None):
+        """Открывает действие страницы с собственным бюджетом ожидания.
+
+        Вложенное действие продолжает расходовать бюджет внешнего.
+        """
+        if self._action is not None:
+            yield self._action
+            return
+
+        start = time.monotonic()
+        self._action = _Action(name, start + (self.budget if budget is None else budget))
+        try:
+            yield self._action
+        finally:
+            action, self._action = self._action, None
+            self.metrics.record(action.name, time.monotonic() - start,
+                                action.waited, action.polls, action.timeouts)
+
+    def remaining(self) -> float:
+        if self._action is None:
+            return self.budget
+        return max(0.0, self._action.deadline - time.monotonic())
+
+    def until(self, condition, description: str):
+        """Ждёт, пока condition(driver) вернёт истинное значение, и возвращает его.
+
+        При исчерпании бюджета бросает WaitTimeout с описанием ожидания,
+        числом опросов и последней ошибкой условия.
+        """
+        with self.action(description):
+            action = self._action
+            start = time.monotonic()
+            interval = self.initial_poll
+            polls = 0
+            last_error = None
+            try:
+                while True:
+                    polls += 1
+                    try:
+                        value = condition(self.driver)
+                        if value:
+                            return value
+                    except self.IGNORED_EXCEPTIONS as error:
+                        last_error = error
+
+                    remaining = action.deadline - time.monotonic()
+                    if remaining <= 0:
+                        action.timeouts += 1
+                        self.last_timeout = self._explain(action, description, start,
+                                                          polls, last_error)
+                        raise WaitTimeout(self.last_timeout)
+                    time.sleep(min(interval, remaining))
+                    interval = min(interval * self.backoff, self.max_poll)
+            finally:
+                action.waited += time.monotonic() - start
+                action.polls += polls
+
+    def _explain(self, action: _Action, description: str, start: float, polls: int,
+                 last_error) -> str:
+        waited = time.monotonic() - start
+        reason = (f"не дождались «{description}» в действии «{action.name}»: "
+                  f"ждали {waited:.2f} с, опросов {polls}, бюджет действия {self.budget:.1f} с")
+        if waited < 0.01:
+            reason += " (бюджет израсходован предыдущими ожиданиями)"
+        if last_error is not None:
+            reason += f"; последняя ошибка: {type(last_error).__name__}: {str(last_error).strip()}"
+        else:
+            reason += "; условие возвращало ложное значение"
+        return reason
+
+
+def page_action(method):
+    """Выполняет метод Page Object как одно действие с общим бюджетом ожидания."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.waits.action(method.__name__):
+            return method(self, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,320 @@
+import glob
+import heapq
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+import allure_commons
+import pytest
+
+PROFILE_FILE = "step_profile.folded"
+# Сколько строк выводить в разделах «самые долгие»
+TOP = 10
+# Параметры, подставленные в заголовок шага: словари и списки (например,
+# параметры API запроса вместе с token) и пары token=значение
+STEP_PARAMS = re.compile(r"\{.*\}|\[.*\]", re.S)
+TOKEN_VALUE = re.compile(r"(token[=:]\s*)[^\s&,;]+", re.I)
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("profiler", "профилирование шагов")
+    group.addoption("--profile-steps", action="store_true", default=False,
+                    help="Замерять время шагов allure.step, команд WebDriver и HTTP-запросов")
+    group.addoption("--profile-output", default=PROFILE_FILE, metavar="PATH",
+                    help=f"Файл стеков для flame graph (по умолчанию {PROFILE_FILE})")
+
+
+def step_name(title: str) -> str:
+    """Заголовок шага без подставленных параметров: «API запрос: {…}».
+
+    Так одинаковые шаги с разными параметрами суммируются в отчёте,
+    а token не попадает ни в отчёт, ни в файл стеков.
+    """
+    return TOKEN_VALUE.sub(r"\1***", STEP_PARAMS.sub("{…}", title))
+
+
+class _Frame:
+    __slots__ = ("kind", "name", "start", "children", "in_wait")
+
+    def __init__(self, kind: str, name: str, in_wait: bool):
+        self.kind = kind
+        self.name = name
+        self.start = time.perf_counter()
+        self.children = 0.0
+        self.in_wait = in_wait
+
+
+class StepProfiler:
+    """Профилировщик прогона: тесты, шаги Allure, ожидания, команды WebDriver и HTTP.
+
+    Вложенные вызовы образуют стек (тест → шаг → ожидание → команда WebDriver).
+    Для каждого кадра считается полное и собственное время, собственное время
+    копится по стекам в формате folded stacks (flamegraph.pl, speedscope).
+    Фоновые потоки (пакетный поиск, предзагрузка страниц) относятся к тесту,
+    который шёл в момент вызова.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.stats = {}
+        self.slowest = []
+        self.folded = {}
+        self.test_time = 0.0
+        self.wait_time = 0.0
+        self.act_time = 0.0
+        self.current_test = None
+        self._steps = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._originals = []
+
+    def _stack(self) -> list:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        if not stack:
+            self._local.prefix = []
+            if threading.current_thread() is not threading.main_thread() and self.current_test:
+                self._local.prefix = [self.current_test,
+                                      f"поток {threading.current_thread().name}"]
+        return stack
+
+    def push(self, kind: str, name: str) -> _Frame:
+        stack = self._stack()
+        in_wait = bool(stack) and (stack[-1].in_wait or stack[-1].kind == "wait")
+        frame = _Frame(kind, name, in_wait)
+        stack.append(frame)
+        return frame
+
+    def pop(self, frame: _Frame):
+        duration = time.perf_counter() - frame.start
+        stack = self._stack()
+        depth = stack.index(frame) if frame in stack else len(stack)
+        names = self._local.prefix + [self._label(item) for item in stack[:depth]] \
+            + [self._label(frame)]
+        del stack[depth:]
+        if stack:
+            stack[-1].children += duration
+        self_time = max(0.0, duration - frame.children)
+
+        key = (frame.kind, frame.name)
+        with self._lock:
+            stats = self.stats.setdefault(key, [0, 0.0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += duration
+            stats[2] += self_time
+            stats[3] = max(stats[3], duration)
+            stack_key = ";".join(names)
+            self.folded[stack_key] = self.folded.get(stack_key, 0.0) + self_time
+            if frame.kind != "test":
+                heapq.heappush(self.slowest, (duration, frame.kind, frame.name,
+                                              self.current_test or ""))
+                if len(self.slowest) > TOP:
+                    heapq.heappop(self.slowest)
+            if frame.kind == "test":
+                self.test_time += duration
+            elif frame.kind == "wait" and not frame.in_wait:
+                self.wait_time += duration
+            elif frame.kind in ("webdriver", "http") and not frame.in_wait:
+                self.act_time += duration
+
+    @contextmanager
+    def frame(self, kind: str, name: str):
+        frame = self.push(kind, name)
+        try:
+            yield frame
+        finally:
+            self.pop(frame)
+
+    @staticmethod
+    def _label(frame: _Frame) -> str:
+        name = frame.name.replace(";", ",").replace("\n", " ")
+        return name if frame.kind in ("test", "step") else f"{frame.kind}:{name}"
+
+    # Хуки allure: вызываются для каждого allure.step, даже без --alluredir
+
+    @allure_commons.hookimpl
+    def start_step(self, uuid, title, params):
+        self._steps[uuid] = self.push("step", step_name(title))
+
+    @allure_commons.hookimpl
+    def stop_step(self, uuid, exc_type, exc_val, exc_tb):
+        frame = self._steps.pop(uuid, None)
+        if frame is not None:
+            self.pop(frame)
+
+    # Хуки pytest
+
+    def pytest_collection_finish(self, session):
+        if any(item.get_closest_marker("ui") for item in session.items):
+            self.install_browser()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item):
+        self.current_test = item.nodeid
+        with self.frame("test", item.nodeid):
+            yield
+        self.current_test = None
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_setup(self, item):
+        with self.frame("step", "setup"):
+            yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        with self.frame("step", "call"):
+            yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_teardown(self, item):
+        with self.frame("step", "teardown"):
+            yield
+
+    def install(self):
+        """Подключается к allure и оборачивает HTTP-запросы requests."""
+        allure_commons.plugin_manager.register(self, "step-profiler")
+        profiler = self
+
+        import requests
+        original_send = requests.Session.send
+
+        def send(session, request, **kwargs):
+            with profiler.frame("http", f"{request.method} {urlsplit(request.url).path}"):
+                return original_send(session, request, **kwargs)
+        self._patch(requests.Session, "send", send)
+
+    def install_browser(self):
+        """Оборачивает команды WebDriver и ожидания WaitPolicy.
+
+        Вызывается, только если в прогоне есть UI тесты, чтобы не загружать
+        Selenium ради API тестов.
+        """
+        if any(name == "until" for _, name, _ in self._originals):
+            return
+        try:
+            from selenium.webdriver.remote.webdriver import WebDriver
+            from pages.wait_policy import WaitPolicy
+        except ImportError:
+            return
+        profiler = self
+        original_execute = WebDriver.execute
+        original_until = WaitPolicy.until
+
+        def execute(driver, driver_command, params=None):
+            with profiler.frame("webdriver", driver_command):
+                return original_execute(driver, driver_command, params)
+
+        def until(policy, condition, description):
+            with profiler.frame("wait", description):
+                return original_until(policy, condition, description)
+        self._patch(WebDriver, "execute", execute)
+        self._patch(WaitPolicy, "until", until)
+
+    def _patch(self, owner, name: str, replacement):
+        self._originals.append((owner, name, owner.__dict__[name]))
+        setattr(owner, name, replacement)
+
+    def uninstall(self):
+        if allure_commons.plugin_manager.is_registered(self):
+            allure_commons.plugin_manager.unregister(self)
+        for owner, name, original in reversed(self._originals):
+            setattr(owner, name, original)
+        self._originals.clear()
+
+    def merge_shards(self):
+        """Добавляет стеки, записанные процессами-шардами, и удаляет их файлы."""
+        for path in glob.glob(f"{self.path}.shard-*"):
+            self.folded_load(path)
+            os.remove(path)
+
+    def folded_load(self, path: str):
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                stack, _, value = line.rstrip("\n").rpartition(" ")
+                if stack:
+                    self.folded[stack] = self.folded.get(stack, 0.0) + int(value) / 1e6
+
+    def write_folded(self):
+        """Записывает собственное время по стекам в микросекундах."""
+        with open(self.path, "w", encoding="utf-8") as file:
+            for stack, seconds in sorted(self.folded.items()):
+                micros = int(seconds * 1e6)
+                if micros:
+                    file.write(f"{stack} {micros}\n")
+
+    def report(self) -> list:
+        lines = []
+        if self.test_time:
+            other = max(0.0, self.test_time - self.wait_time - self.act_time)
+            lines.append(f"Время тестов {self.test_time:.2f} с: ожидания {self.wait_time:.2f} с "
+                         f"({self.wait_time / self.test_time:.0%}), команды WebDriver и HTTP "
+                         f"вне ожиданий {self.act_time:.2f} с "
+                         f"({self.act_time / self.test_time:.0%}), прочее {other:.2f} с")
+
+        steps = [(key, stats) for key, stats in self.stats.items() if key[0] != "test"]
+        steps.sort(key=lambda entry: entry[1][1], reverse=True)
+        if steps:
+            lines.append("Самые долгие шаги (суммарно):")
+        for (kind, name), (calls, total, self_time, longest) in steps[:TOP]:
+            lines.append(f"  {kind}: {name} — вызовов {calls}, всего {total:.2f} с, "
+                         f"собственное {self_time:.2f} с, максимум {longest:.2f} с")
+
+        if self.slowest:
+            lines.append("Самые долгие вызовы:")
+        for duration, kind, name, test in sorted(self.slowest, reverse=True):
+            lines.append(f"  {duration:.2f} с {kind}: {name} ({test})")
+        return lines
+
+
+class StepProfilerPlugin:
+
+    def __init__(self, config, profiler: StepProfiler):
+        self.config = config
+        self.profiler = profiler
+
+    @property
+    def is_sharded(self) -> bool:
+        return (self.config.getoption("--shard-id", default=None) is None
+                and (self.config.getoption("--shards", default=0) or 0) > 1)
+
+    def pytest_sessionfinish(self, session):
+        if self.is_sharded:
+            self.profiler.merge_shards()
+        self.profiler.write_folded()
+
+    def pytest_terminal_summary(self, terminalreporter):
+        terminalreporter.write_sep("-", "Профиль шагов")
+        for line in self.profiler.report():
+            terminalreporter.write_line(line)
+        selector_cache = _selector_cache()
+        if selector_cache is not None and selector_cache.lookups:
+            terminalreporter.write_line(selector_cache.report())
+        terminalreporter.write_line(f"Стеки для flame graph: {self.profiler.path} "
+                                    f"(flamegraph.pl {self.profiler.path} > profile.svg "
+                                    f"или speedscope.app)")
+
+    def pytest_unconfigure(self, config):
+        self.profiler.uninstall()
+
+
+def _selector_cache():
+    module = sys.modules.get("pages.selector_cache")
+    return module._default_cache if module is not None else None
+
+
+def pytest_configure(config):
+    if not config.getoption("--profile-steps"):
+        return
+    path = config.getoption("--profile-output")
+    shard_id = config.getoption("--shard-id", default=None)
+    if shard_id is not None:
+        path = f"{path}.shard-{shard_id}"
+    profiler = StepProfiler(path)
+    profiler.install()
+    config.pluginmanager.register(profiler, "step-profiler-hooks")
+    config.pluginmanager.register(StepProfilerPlugin(config, profiler), "step-profiler")
@@ -0,0 +1,197 @@
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+
+from config import config
+
+try:
+    import fcntl
+except ImportError:  # Windows: ограничение действует только внутри процесса
+    fcntl = None
+
+
+class TokenBucket:
+    """Корзина токенов с адаптивной скоростью (AIMD).
+
+    rate — токенов в секунду, capacity — размер всплеска. После ответа 429
+    скорость уменьшается вдвое и корзина «замирает» на Retry-After секунд,
+    после каждого успешного ответа скорость понемногу растёт обратно
+    до max_rate. Если задан state_path, состояние хранится в файле под
+    блокировкой и корзина общая для всех процессов на машине.
+    """
+
+    def __init__(self, rate: float, capacity: float = None, min_rate: float = None,
+                 increase: float = None, state_path: str = None):
+        self.max_rate = rate
+        self.min_rate = min_rate if min_rate is not None else max(rate * 0.05, 0.1)
+        self.increase = increase if increase is not None else rate * 0.05
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.state_path = state_path if fcntl is not None else None
+        self.throttled = 0
+        self.waited = 0.0
+        self._lock = threading.Lock()
+        self._state = {"tokens": self.capacity, "updated": time.time(),
+                       "rate": rate, "paused_until": 0.0}
+
+    @property
+    def rate(self) -> float:
+        with self._locked_state() as state:
+            return state["rate"]
+
+    @contextmanager
+    def _locked_state(self):
+        """Состояние корзины под блокировкой потока (и файла, если корзина общая)."""
+        with self._lock:
+            if self.state_path is None:
+                yield self._state
+                return
+            with open(self.state_path + ".lock", "a+") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    try:
+                        with open(self.state_path, encoding="utf-8") as file:
+                            self._state = json.load(file)
+                    except (OSError, ValueError):
+                        pass
+                    yield self._state
+                    with open(self.state_path, "w", encoding="utf-8") as file:
+                        json.dump(self._state, file)
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _refill(self, state: dict, now: float):
+        elapsed = max(0.0, now - state["updated"])
+        state["tokens"] = min(self.capacity, state["tokens"] + elapsed * state["rate"])
+        state["updated"] = now
+
+    def try_acquire(self) -> float:
+        """Берёт токен, если он есть; иначе возвращает, сколько секунд подождать."""
+        with self._locked_state() as state:
+            now = time.time()
+            if state["paused_until"] > now:
+                return state["paused_until"] - now
+            self._refill(state, now)
+            if state["tokens"] >= 1:
+                state["tokens"] -= 1
+                return 0.0
+            return (1 - state["tokens"]) / state["rate"]
+
+    def acquire(self) -> float:
+        """Ждёт токен и возвращает время ожидания в секундах."""
+        waited = 0.0
+        while True:
+            delay = self.try_acquire()
+            if delay <= 0:
+                with self._lock:
+                    self.waited += waited
+                return waited
+            time.sleep(delay)
+            waited += delay
+
+    def on_throttle(self, retry_after: float = None):
+        """Ответ 429: вдвое снижает скорость и приостанавливает выдачу токенов."""
+        with self._locked_state() as state:
+            now = time.time()
+            self._refill(state, now)
+            state["rate"] = max(self.min_rate, state["rate"] / 2)
+            state["tokens"] = 0.0
+            pause = retry_after if retry_after is not None else 1 / state["rate"]
+            state["paused_until"] = max(state["paused_until"], now + pause)
+            self.throttled += 1
+
+    def on_success(self):
+        """Успешный ответ: скорость растёт на increase, но не выше max_rate."""
+        with self._locked_state() as state:
+            if state["rate"] < self.max_rate:
+                self._refill(state, time.time())
+                state["rate"] = min(self.max_rate, state["rate"] + self.increase)
+
+
+class RateLimiter:
+    """Набор корзин токенов по endpoint API с настраиваемой скоростью для каждого."""
+
+    def __init__(self, rates: dict = None, default_rate: float = 10.0, shared_dir: str = None):
+        self.rates = dict(rates or {})
+        self.default_rate = default_rate
+        self.shared_dir = shared_dir
+        self._buckets = {}
+        self._lock = threading.Lock()
+        if shared_dir:
+            os.makedirs(shared_dir, exist_ok=True)
+
+    @classmethod
+    def from_config(cls) -> "RateLimiter":
+        """Ограничитель с текущими настройками config.API_RATE_LIMIT*."""
+        return cls(config.API_RATE_LIMITS, config.API_RATE_LIMIT_DEFAULT,
+                   config.API_RATE_LIMIT_DIR or None)
+
+    def bucket(self, endpoint: str) -> TokenBucket:
+        with self._lock:
+            if endpoint not in self._buckets:
+                state_path = None
+                if self.shared_dir:
+                    state_path = os.path.join(self.shared_dir, endpoint.replace("/", "_") + ".json")
+                self._buckets[endpoint] = TokenBucket(self.rates.get(endpoint, self.default_rate),
+                                                      state_path=state_path)
+            return self._buckets[endpoint]
+
+    def acquire(self, endpoint: str) -> float:
+        return self.bucket(endpoint).acquire()
+
+    def on_throttle(self, endpoint: str, retry_after: float = None):
+        self.bucket(endpoint).on_throttle(retry_after)
+
+    def on_success(self, endpoint: str):
+        self.bucket(endpoint).on_success()
+
+    def report(self) -> str:
+        parts = [f"{endpoint}: {bucket.rate:.1f} запр/с, 429 получено {bucket.throttled}, "
+                 f"ожидание {bucket.waited:.2f} с"
+                 for endpoint, bucket in sorted(self._buckets.items())]
+        return "Ограничение частоты: " + "; ".join(parts)
+
+
+def parse_retry_after(value) -> float:
+    """Значение заголовка Retry-After в секундах (число секунд или HTTP-дата)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, base: float = 0.2, cap: float = 10.0) -> float:
+    """Экспоненциальная задержка перед повтором со случайным разбросом (full jitter)."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+_shared_limiter = None
+_shared_settings = None
+_shared_lock = threading.Lock()
+
+
+def shared_rate_limiter() -> RateLimiter:
+    """Ограничитель частоты, общий для всех клиентов API в процессе.
+
+    Если задан config.API_RATE_LIMIT_DIR, состояние корзин хранится в файлах
+    этой папки и ограничение действует на все процессы (например, шарды тестов).
+    Настройки config читаются при каждом вызове: если они изменились,
+    создаётся новый ограничитель с новыми настройками.
+    """
+    global _shared_limiter, _shared_settings
+    settings = (sorted(config.API_RATE_LIMITS.items()), config.API_RATE_LIMIT_DEFAULT,
+                config.API_RATE_LIMIT_DIR or None)
+    with _shared_lock:
+        if _shared_limiter is None or settings != _shared_settings:
+            _shared_limiter = RateLimiter.from_config()
+            _shared_settings = settings
+        return _shared_limiter
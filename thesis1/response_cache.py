@@ -0,0 +1,165 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from config import config
+
+
+class CacheStats:
+    """Счётчики попаданий и промахов кэша."""
+
+    def __init__(self):
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    def summary(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def report(self) -> str:
+        s = self.summary()
+        return (f"Кэш: попаданий {s['hits']} (память {s['memory_hits']}, "
+                f"диск {s['disk_hits']}), промахов {s['misses']}, "
+                f"вытеснено {s['evictions']}, hit rate {s['hit_rate']:.0%}")
+
+
+class ResponseCache:
+    """Двухуровневый кэш ответов API: LRU в памяти и (опционально) SQLite на диске.
+
+    Ключ — endpoint и нормализованные параметры запроса без token, поэтому
+    одинаковые запросы с разными токенами попадают в одну запись.
+    Время жизни записи задаётся отдельно для каждого endpoint.
+    """
+
+    IGNORED_PARAMS = ("token",)
+
+    def __init__(self, max_entries: int = 1024, ttl: dict = None, default_ttl: float = 300,
+                 path: str = None, max_disk_entries: int = 10000):
+        self.max_entries = max_entries
+        self.ttl = dict(ttl or {})
+        self.default_ttl = default_ttl
+        self.max_disk_entries = max_disk_entries
+        self.stats = CacheStats()
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, body TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    @classmethod
+    def key(cls, endpoint: str, params: dict) -> str:
+        """Строит ключ кэша из endpoint и параметров запроса."""
+        normalized = {name: str(value) for name, value in params.items()
+                      if name not in cls.IGNORED_PARAMS and value is not None}
+        return endpoint + "?" + json.dumps(normalized, sort_keys=True, ensure_ascii=False)
+
+    def ttl_for(self, endpoint: str) -> float:
+        return self.ttl.get(endpoint, self.default_ttl)
+
+    def get(self, endpoint: str, params: dict):
+        """Возвращает сохранённый ответ или None, если записи нет или она устарела."""
+        key = self.key(endpoint, params)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                body, expires_at = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self.stats.memory_hits += 1
+                    return json.loads(body)
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT body, expires_at FROM responses WHERE key = ?", (key,)).fetchone()
+                if row is not None and row[1] > now:
+                    self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?",
+                                     (now, key))
+                    self._db.commit()
+                    self._remember(key, row[0], row[1])
+                    self.stats.disk_hits += 1
+                    return json.loads(row[0])
+
+            self.stats.misses += 1
+            return None
+
+    def set(self, endpoint: str, params: dict, response: dict):
+        """Сохраняет ответ в память и на диск."""
+        key = self.key(endpoint, params)
+        body = json.dumps(response, ensure_ascii=False)
+        now = time.time()
+        expires_at = now + self.ttl_for(endpoint)
+        with self._lock:
+            self._remember(key, body, expires_at)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, body, expires_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?)", (key, body, expires_at, now))
+                self._evict_disk(now)
+                self._db.commit()
+
+    def _remember(self, key: str, body: str, expires_at: float):
+        self._memory[key] = (body, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.stats.evictions += 1
+
+    def _evict_disk(self, now: float):
+        """Удаляет устаревшие записи и самые давно использованные сверх лимита."""
+        self._db.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+        count = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        overflow = count - self.max_disk_entries
+        if overflow > 0:
+            self._db.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY accessed_at LIMIT ?)", (overflow,))
+            self.stats.evictions += overflow
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+def create_cache(mode: str = None):
+    """Создаёт кэш по режиму off/memory/disk (по умолчанию — config.API_CACHE)."""
+    mode = (mode or config.API_CACHE).lower()
+    if mode == "off":
+        return None
+    if mode not in ("memory", "disk"):
+        raise ValueError(f"Неизвестный режим кэша: {mode}")
+    return ResponseCache(
+        max_entries=config.API_CACHE_SIZE,
+        ttl=config.API_CACHE_TTL,
+        path=config.API_CACHE_PATH if mode == "disk" else None,
+    )
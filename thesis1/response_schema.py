@@ -0,0 +1,101 @@
+import functools
+import re
+
+IATA_CODE = re.compile(r"^[A-Z]{3}$")
+DATE_TIME = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}(:\d{2})?(Z|[+-]\d{2}:?\d{2})?$")
+
+# Поля билета по endpoint: имя -> (допустимые типы, обязательное ли, шаблон строки).
+# Типы сравниваются точно, поэтому True не сойдёт за число
+TICKET_SCHEMAS = {
+    "prices_for_dates": {
+        "origin": ((str,), True, IATA_CODE),
+        "destination": ((str,), True, IATA_CODE),
+        "price": ((int, float), True, None),
+        "departure_at": ((str,), True, DATE_TIME),
+        "return_at": ((str,), False, DATE_TIME),
+        "origin_airport": ((str,), False, IATA_CODE),
+        "destination_airport": ((str,), False, IATA_CODE),
+        "airline": ((str,), False, None),
+        "flight_number": ((str, int), False, None),
+        "transfers": ((int,), False, None),
+        "return_transfers": ((int,), False, None),
+        "duration": ((int,), False, None),
+        "duration_to": ((int,), False, None),
+        "duration_back": ((int,), False, None),
+        "link": ((str,), False, None),
+    },
+}
+
+
+@functools.lru_cache(maxsize=None)
+def compile_schema(endpoint: str) -> tuple:
+    """Схема endpoint в виде готовых проверок (поле, типы, обязательное, match шаблона).
+
+    Компилируется один раз на endpoint; дальше каждый билет проверяется
+    одним проходом по кортежу без разбора описания схемы.
+    """
+    if endpoint not in TICKET_SCHEMAS:
+        raise ValueError(f"Нет схемы билетов для endpoint {endpoint}")
+    return tuple((name, frozenset(types), required, pattern.match if pattern else None)
+                 for name, (types, required, pattern) in TICKET_SCHEMAS[endpoint].items())
+
+
+class TicketValidator:
+    """Проверяет билеты ответа по схеме endpoint и накапливает нарушения.
+
+    В violations хранятся первые max_violations описаний, в violation_count —
+    общее число нарушений, в checked — число проверенных билетов.
+    С required_only=True проверяются только обязательные поля, а
+    необязательные пропускаются, даже если их тип не совпадает со схемой.
+    """
+
+    def __init__(self, endpoint: str, max_violations: int = 100, required_only: bool = False):
+        self.endpoint = endpoint
+        self.max_violations = max_violations
+        self.required_only = required_only
+        self.checks = tuple(check for check in compile_schema(endpoint)
+                            if check[2] or not required_only)
+        self.checked = 0
+        self.violation_count = 0
+        self.violations = []
+
+    def _violation(self, index: int, message: str):
+        self.violation_count += 1
+        if len(self.violations) < self.max_violations:
+            self.violations.append(f"билет {index}: {message}")
+
+    def check(self, ticket, index: int = None) -> bool:
+        """Проверяет один билет; True, если нарушений нет."""
+        index = self.checked if index is None else index
+        self.checked += 1
+        if type(ticket) is not dict:
+            self._violation(index, f"ожидался объект, получено {type(ticket).__name__}")
+            return False
+        valid = True
+        for name, types, required, match in self.checks:
+            if name not in ticket:
+                if required:
+                    self._violation(index, f"нет поля {name}")
+                    valid = False
+                continue
+            value = ticket[name]
+            if type(value) not in types:
+                self._violation(index, f"поле {name}: ожидался "
+                                       f"{'/'.join(sorted(t.__name__ for t in types))}, "
+                                       f"получено {value!r}")
+                valid = False
+            elif match is not None and not match(value):
+                self._violation(index, f"поле {name}: неверный формат {value!r}")
+                valid = False
+        return valid
+
+    def validate(self, tickets) -> list:
+        """Проверяет все билеты и возвращает накопленные нарушения."""
+        for ticket in tickets:
+            self.check(ticket)
+        return self.violations
+
+    def report(self) -> str:
+        scope = " (обязательные поля)" if self.required_only else ""
+        return (f"Схема {self.endpoint}{scope}: проверено билетов {self.checked}, "
+                f"нарушений {self.violation_count}")
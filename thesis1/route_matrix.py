@@ -0,0 +1,108 @@
+import asyncio
+import csv
+import re
+import threading
+
+from api_client import AsyncAviasalesAPI
+from config import config
+from response_cache import ResponseCache
+
+IATA_CODE = re.compile(r"^[A-Z]{3}$")
+
+
+def load_routes(path: str, limit: int = None) -> list:
+    """Маршруты (origin, destination) из CSV с колонками origin и destination.
+
+    Коды приводятся к верхнему регистру, строки с некорректными кодами,
+    маршруты «в себя» и повторы пропускаются. limit — сколько первых
+    маршрутов взять (None или 0 — все).
+    """
+    routes, seen = [], set()
+    with open(path, encoding="utf-8", newline="") as file:
+        for row in csv.DictReader(file):
+            origin = (row.get("origin") or "").strip().upper()
+            destination = (row.get("destination") or "").strip().upper()
+            route = (origin, destination)
+            if (not IATA_CODE.match(origin) or not IATA_CODE.match(destination)
+                    or origin == destination or route in seen):
+                continue
+            seen.add(route)
+            routes.append(route)
+            if limit and len(routes) >= limit:
+                break
+    return routes
+
+
+def route_queries() -> dict:
+    """Запросы, которые проверяются для каждого маршрута, по имени.
+
+    Те же параметры, что в tests/test_api.py, но с маршрутом из CSV.
+    """
+    return {
+        "one_way": {"departure_at": config.DEPARTURE_DATE},
+        "round_trip": {"departure_at": config.DEPARTURE_DATE, "return_at": config.RETURN_DATE},
+        "month": {"departure_at": config.DEPARTURE_MONTH},
+        "limit": {"departure_at": config.DEPARTURE_DATE, "limit": 5},
+    }
+
+
+class RouteResponses:
+    """Ответы API для матрицы маршрутов: каждый уникальный запрос выполняется один раз.
+
+    prefetch() заранее и параллельно (через AsyncAviasalesAPI.search_many)
+    загружает все запросы, нужные тестам; get() отдаёт сохранённый ответ,
+    а недостающий загружает сразу. Разные проверки одного маршрута с одинаковым
+    запросом получают один и тот же ответ.
+    """
+
+    def __init__(self, client, queries: dict = None):
+        self.client = client
+        self.queries = queries or route_queries()
+        self.checks = 0
+        self.fetched = 0
+        self._responses = {}
+        self._lock = threading.Lock()
+
+    def _query(self, route: tuple, name: str) -> dict:
+        origin, destination = route
+        return {"origin": origin, "destination": destination, **self.queries[name]}
+
+    def _key(self, query: dict) -> str:
+        return ResponseCache.key(*self.client.build_search(**query))
+
+    def prefetch(self, needed, concurrency: int = 10):
+        """Параллельно загружает ответы для пар (маршрут, имя запроса), которых ещё нет."""
+        pending = {}
+        for route, name in needed:
+            query = self._query(route, name)
+            key = self._key(query)
+            if key not in self._responses:
+                pending.setdefault(key, query)
+        if not pending:
+            return
+        results = asyncio.run(AsyncAviasalesAPI(self.client).search_many(
+            list(pending.values()), concurrency=concurrency))
+        with self._lock:
+            for key, result in zip(pending, results):
+                # Ошибки не сохраняются: get() повторит запрос и покажет ошибку в тесте
+                if result.ok:
+                    self._responses[key] = result.response
+            self.fetched += len(pending)
+
+    def get(self, route: tuple, name: str) -> dict:
+        """Ответ на запрос name для маршрута route."""
+        query = self._query(route, name)
+        key = self._key(query)
+        with self._lock:
+            self.checks += 1
+            response = self._responses.get(key)
+        if response is None:
+            response = self.client.search(**query)
+            with self._lock:
+                self._responses[key] = response
+                self.fetched += 1
+        return response
+
+    def report(self) -> str:
+        return (f"Матрица маршрутов: проверок {self.checks}, "
+                f"уникальных запросов {len(self._responses)}, запросов к API {self.fetched}")
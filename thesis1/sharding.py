@@ -0,0 +1,298 @@
+import argparse
+import heapq
+import json
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+import pytest
+from config import config
+
+DURATIONS_FILE = ".test_durations.json"
+# Оценка длительности теста без истории, сек (UI тесты на порядки дольше API)
+DEFAULT_DURATIONS = {"ui": 30.0, "api": 1.0}
+DEFAULT_DURATION = 5.0
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("sharding", "параллельный запуск по процессам")
+    group.addoption("--shards", type=int, default=0,
+                    help="Число процессов для параллельного запуска тестов")
+    group.addoption("--durations-file", default=None,
+                    help=f"Файл истории длительностей тестов (по умолчанию {DURATIONS_FILE})")
+    # Служебные опции процессов-воркеров
+    group.addoption("--shard-items", default=None, help=argparse.SUPPRESS)
+    group.addoption("--shard-id", type=int, default=None, help=argparse.SUPPRESS)
+
+
+def load_json(path: str) -> dict:
+    try:
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_json(path: str, data: dict):
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file, ensure_ascii=False, indent=1, sort_keys=True)
+
+
+def shard_path(path: str, shard_id: int) -> str:
+    return f"{path}.shard-{shard_id}"
+
+
+def merge_json(path: str, copies: list):
+    """Сливает в path записи, изменённые в копиях шардов относительно исходного файла."""
+    original = load_json(path)
+    merged = dict(original)
+    for copy in copies:
+        merged.update({key: value for key, value in load_json(copy).items()
+                       if original.get(key) != value})
+    if merged != original:
+        save_json(path, merged)
+
+
+def merge_sqlite(path: str, copies: list):
+    """Переносит в кэш path ответы из копий шардов; при совпадении ключа побеждает свежий."""
+    if not copies:
+        return
+    if not os.path.exists(path):
+        shutil.copyfile(copies[0], path)
+        copies = copies[1:]
+    db = sqlite3.connect(path)
+    try:
+        for copy in copies:
+            db.execute("ATTACH DATABASE ? AS shard", (copy,))
+            db.execute(
+                "INSERT INTO responses SELECT * FROM shard.responses WHERE true "
+                "ON CONFLICT(key) DO UPDATE SET body = excluded.body, "
+                "expires_at = excluded.expires_at, accessed_at = excluded.accessed_at "
+                "WHERE excluded.accessed_at > responses.accessed_at")
+            db.commit()
+            db.execute("DETACH DATABASE shard")
+    finally:
+        db.close()
+
+
+# Файлы, которые тесты дописывают между запусками (переменная config -> слияние).
+# Каждый шард пишет в свою копию файла, после прогона копии сливаются обратно.
+SHARED_FILES = {
+    "SELECTOR_CACHE_PATH": merge_json,
+    "NETWORK_HISTORY_PATH": merge_json,
+    "API_CACHE_PATH": merge_sqlite,
+}
+
+
+def shard_environment(shard_id: int) -> dict:
+    """Окружение воркера: пути общих файлов заменены на копии шарда."""
+    env = dict(os.environ)
+    for name in SHARED_FILES:
+        path = getattr(config, name)
+        copy = shard_path(path, shard_id)
+        if os.path.exists(path):
+            shutil.copyfile(path, copy)
+        env[name] = copy
+    return env
+
+
+def merge_shared_files(shards: int):
+    """Сливает копии общих файлов шардов и удаляет их."""
+    for name, merge in SHARED_FILES.items():
+        path = getattr(config, name)
+        copies = [shard_path(path, shard_id) for shard_id in range(shards)
+                  if os.path.exists(shard_path(path, shard_id))]
+        merge(path, copies)
+        for copy in copies:
+            os.remove(copy)
+
+
+def estimate_duration(item, durations: dict) -> float:
+    """Длительность теста из истории, а без истории — оценка по маркеру."""
+    if item.nodeid in durations:
+        return durations[item.nodeid]
+    for marker, duration in DEFAULT_DURATIONS.items():
+        if item.get_closest_marker(marker):
+            return duration
+    return DEFAULT_DURATION
+
+
+def pack_items(items, shards: int, durations: dict) -> list:
+    """Раскладывает тесты по shards группам: самые долгие — в наименее загруженную."""
+    heap = [(0.0, index, []) for index in range(shards)]
+    ordered = sorted(items, key=lambda item: estimate_duration(item, durations), reverse=True)
+    for item in ordered:
+        load, index, group = heapq.heappop(heap)
+        group.append(item)
+        heapq.heappush(heap, (load + estimate_duration(item, durations), index, group))
+    return [(load, group) for load, _, group in sorted(heap, key=lambda entry: entry[1])]
+
+
+class ShardingPlugin:
+    """Плагин pytest для параллельного запуска тестов в нескольких процессах.
+
+    Длительности тестов сохраняются в файл истории после каждого прогона.
+    С опцией --shards N собранные тесты раскладываются по N процессам
+    упаковкой «сначала самые долгие», каждый процесс запускает свою часть
+    со своим браузером и API-сессией. Истории длительностей, кэши
+    (SHARED_FILES) и результаты Allure шарды пишут в свои копии, которые
+    сливаются после прогона.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.path = config.getoption("--durations-file") or str(config.rootpath / DURATIONS_FILE)
+        self.shard_id = config.getoption("--shard-id")
+        self.measured = {}
+        self.failed = set()
+
+    @property
+    def is_worker(self) -> bool:
+        return self.shard_id is not None
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, config, items):
+        """В процессе-воркере оставляет только тесты его группы."""
+        items_file = config.getoption("--shard-items")
+        if not items_file:
+            return
+        with open(items_file, encoding="utf-8") as file:
+            selected = set(file.read().splitlines())
+        deselected = [item for item in items if item.nodeid not in selected]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = [item for item in items if item.nodeid in selected]
+
+    def pytest_runtest_logreport(self, report):
+        self.measured[report.nodeid] = self.measured.get(report.nodeid, 0.0) + report.duration
+        if report.failed:
+            self.failed.add(report.nodeid)
+
+    def pytest_runtestloop(self, session):
+        shards = self.config.getoption("--shards")
+        if self.is_worker or shards <= 1 or not session.items:
+            return None
+        if session.config.option.collectonly:
+            return None
+
+        groups = [(load, group) for load, group in
+                  pack_items(session.items, shards, load_json(self.path)) if group]
+        session.testsfailed = self._run_shards(session, groups)
+        return True
+
+    def _run_shards(self, session, groups) -> int:
+        """Запускает шарды и возвращает общее число упавших в них тестов."""
+        reporter = session.config.pluginmanager.get_plugin("terminalreporter")
+        alluredir = session.config.getoption("--alluredir", default=None)
+        args = self._worker_args()
+        workdir = tempfile.mkdtemp(prefix="pytest-shards-")
+        processes = []
+        start = time.perf_counter()
+
+        for shard_id, (load, group) in enumerate(groups):
+            items_file = os.path.join(workdir, f"shard-{shard_id}.txt")
+            with open(items_file, "w", encoding="utf-8") as file:
+                file.write("\n".join(item.nodeid for item in group))
+            command = [sys.executable, "-m", "pytest", *args,
+                       f"--shard-items={items_file}", f"--shard-id={shard_id}",
+                       f"--durations-file={shard_path(self.path, shard_id)}"]
+            if alluredir:
+                command.append(f"--alluredir={os.path.join(alluredir, f'.shard-{shard_id}')}")
+            log = open(os.path.join(workdir, f"shard-{shard_id}.log"), "w+", encoding="utf-8")
+            process = subprocess.Popen(command, cwd=str(session.config.invocation_params.dir),
+                                       env=shard_environment(shard_id),
+                                       stdout=log, stderr=subprocess.STDOUT)
+            processes.append((shard_id, load, group, process, log))
+
+        failed = []
+        for shard_id, load, group, process, log in processes:
+            returncode = process.wait()
+            log.seek(0)
+            if reporter:
+                reporter.write_sep("=", f"Шард {shard_id}: {len(group)} тестов, "
+                                        f"оценка {load:.1f} с, код выхода {returncode}")
+                reporter.write(log.read())
+            log.close()
+            shard_failed = self._read_failed(os.path.join(workdir, f"shard-{shard_id}.txt"))
+            if not shard_failed and returncode not in (pytest.ExitCode.OK,
+                                                       pytest.ExitCode.NO_TESTS_COLLECTED):
+                # Шард упал до записи результатов (ошибка сбора, прерывание)
+                shard_failed = [f"шард {shard_id}: код выхода {returncode}"]
+            failed.extend(shard_failed)
+
+        self._merge_durations(len(groups))
+        merge_shared_files(len(groups))
+        if alluredir:
+            self._merge_allure(alluredir, len(groups))
+        shutil.rmtree(workdir, ignore_errors=True)
+        if reporter:
+            reporter.write_sep("=", f"{len(groups)} шардов за {time.perf_counter() - start:.1f} с, "
+                                    f"упало тестов: {len(failed)}")
+            for nodeid in failed:
+                reporter.write_line(f"FAILED {nodeid}")
+        return len(failed)
+
+    @staticmethod
+    def _read_failed(items_file: str) -> list:
+        """Упавшие тесты, записанные воркером рядом с файлом его группы."""
+        try:
+            with open(f"{items_file}.failed", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return []
+
+    def _worker_args(self) -> list:
+        """Аргументы исходного запуска без --shards и --alluredir."""
+        args = list(self.config.invocation_params.args)
+        result = []
+        skip_next = False
+        for arg in args:
+            if skip_next:
+                skip_next = False
+                continue
+            if arg in ("--shards", "--alluredir", "--durations-file"):
+                skip_next = True
+                continue
+            if arg.startswith(("--shards=", "--alluredir=", "--durations-file=")):
+                continue
+            result.append(arg)
+        return result
+
+    def _merge_durations(self, shards: int):
+        durations = load_json(self.path)
+        for shard_id in range(shards):
+            path = shard_path(self.path, shard_id)
+            durations.update(load_json(path))
+            if os.path.exists(path):
+                os.remove(path)
+        save_json(self.path, durations)
+
+    @staticmethod
+    def _merge_allure(alluredir: str, shards: int):
+        """Переносит результаты Allure из папок шардов в общую папку."""
+        for shard_id in range(shards):
+            shard_dir = os.path.join(alluredir, f".shard-{shard_id}")
+            if not os.path.isdir(shard_dir):
+                continue
+            for name in os.listdir(shard_dir):
+                shutil.move(os.path.join(shard_dir, name), os.path.join(alluredir, name))
+            os.rmdir(shard_dir)
+
+    def pytest_sessionfinish(self, session):
+        items_file = self.config.getoption("--shard-items")
+        if self.is_worker and items_file:
+            with open(f"{items_file}.failed", "w", encoding="utf-8") as file:
+                json.dump(sorted(self.failed), file, ensure_ascii=False)
+        if not self.measured or session.config.option.collectonly:
+            return
+        durations = {} if self.is_worker else load_json(self.path)
+        durations.update(self.measured)
+        save_json(self.path, durations)
+
+
+def pytest_configure(config):
+    config.pluginmanager.register(ShardingPlugin(config), "sharding-plugin")
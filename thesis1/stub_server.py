@@ -0,0 +1,298 @@
+import argparse
+import functools
+import json
+import math
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+
+from config import config
+from rate_limiter import TokenBucket
+from response_cache import ResponseCache
+
+
+class Cassette:
+    """Записанные пары запрос/ответ к API, хранящиеся в компактном JSON-файле.
+
+    Запрос идентифицируется endpoint и параметрами без token — тем же ключом,
+    что и в кэше ответов, поэтому кассету можно записать с одним токеном,
+    а воспроизводить с любым.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.interactions = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as file:
+                for item in json.load(file)["interactions"]:
+                    self.interactions[ResponseCache.key(item["endpoint"], item["params"])] = item
+
+    def __len__(self):
+        return len(self.interactions)
+
+    def find(self, endpoint: str, params: dict):
+        return self.interactions.get(ResponseCache.key(endpoint, params))
+
+    def add(self, endpoint: str, params: dict, status: int, body):
+        params = {name: value for name, value in params.items()
+                  if name not in ResponseCache.IGNORED_PARAMS}
+        with self._lock:
+            self.interactions[ResponseCache.key(endpoint, params)] = {
+                "endpoint": endpoint, "params": params, "status": status, "body": body,
+            }
+
+    def save(self):
+        """Сохраняет кассету: одна строка на запрос, без лишних пробелов."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        lines = [json.dumps(self.interactions[key], ensure_ascii=False, separators=(",", ":"))
+                 for key in sorted(self.interactions)]
+        with open(self.path, "w", encoding="utf-8") as file:
+            file.write('{"interactions":[\n' + ",\n".join(lines) + "\n]}\n")
+
+
+def synthetic_response(params: dict, size: int) -> dict:
+    """Ответ prices_for_dates из size сгенерированных билетов для параметров запроса.
+
+    limit и page выбирают страницу, как в API: билеты с (page - 1) * limit.
+    """
+    origin = params.get("origin", "MOW")
+    destination = params.get("destination", "LED")
+    departure_at = params.get("departure_at", "2026-02-01")
+    month = departure_at[:7]
+    start = 0
+    if params.get("limit"):
+        limit = int(params["limit"])
+        start = (int(params.get("page") or 1) - 1) * limit
+        size = min(size, start + limit)
+    data = []
+    for index in range(start, size):
+        day = departure_at if len(departure_at) == 10 else f"{month}-{index % 28 + 1:02d}"
+        ticket = {
+            "origin": origin,
+            "destination": destination,
+            "origin_airport": origin,
+            "destination_airport": destination,
+            "price": 3000 + (index * 7919) % 20000,
+            "airline": ("SU", "DP", "S7", "U6", "FV")[index % 5],
+            "flight_number": str(100 + index % 6900),
+            "departure_at": f"{day}T{index % 24:02d}:{index * 5 % 60:02d}:00+03:00",
+            "transfers": index % 3,
+            "return_transfers": 0,
+            "duration": 85 + (index % 3) * 120,
+            "duration_to": 85 + (index % 3) * 120,
+            "duration_back": 0,
+            "link": f"/search/{origin}{day[8:10]}{day[5:7]}{destination}1?t={index}",
+        }
+        if params.get("return_at"):
+            back = params["return_at"]
+            if len(back) != 10:
+                back = f"{back[:7]}-{index % 28 + 1:02d}"
+            ticket["return_at"] = f"{back}T12:00:00+03:00"
+        data.append(ticket)
+    return {"success": True, "data": data, "currency": "rub"}
+
+
+class StubServer:
+    """Локальный HTTP-сервер, имитирующий Travelpayouts API.
+
+    Режимы:
+    - replay — отвечает из кассеты, незаписанный запрос получает 404;
+    - record — проксирует запрос в настоящий API и записывает ответ в кассету;
+      если API недоступен, стаб отвечает 502 с текстом ошибки и ничего не пишет;
+    - synthetic — на любой запрос отвечает response_size сгенерированными
+      билетами (для нагрузочных тестов и бенчмарков).
+    latency — искусственная задержка каждого ответа в секундах.
+    quota — допустимое число запросов в секунду; сверх него стаб отвечает
+    429 с заголовком Retry-After.
+    """
+
+    def __init__(self, cassette: Cassette = None, mode: str = "replay", upstream: str = None,
+                 latency: float = 0.0, quota: float = 0.0, response_size: int = 30,
+                 host: str = "127.0.0.1", port: int = 0):
+        if mode not in ("replay", "record", "synthetic"):
+            raise ValueError(f"Неизвестный режим стаба: {mode}")
+        self.cassette = cassette
+        self.mode = mode
+        self.upstream = upstream or config.API_BASE_URL
+        self.latency = latency
+        self.response_size = response_size
+        self._synthetic = {}
+        self.quota = TokenBucket(quota, capacity=quota) if quota else None
+        self.requests_served = 0
+        self.requests_throttled = 0
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self) -> str:
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self.mode == "record":
+            self.cassette.save()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def respond(self, endpoint: str, params: dict) -> tuple:
+        """Возвращает (status, body) для запроса к endpoint с параметрами params."""
+        if self.mode == "synthetic":
+            key = ResponseCache.key(endpoint, params)
+            if key not in self._synthetic:
+                # Тело кэшируется готовыми байтами, чтобы ни генерация, ни
+                # кодирование не влияли на замеры времени и памяти
+                self._synthetic[key] = json.dumps(
+                    synthetic_response(params, self.response_size),
+                    ensure_ascii=False).encode("utf-8")
+            return 200, self._synthetic[key]
+
+        if self.mode == "record":
+            try:
+                response = requests.get(f"{self.upstream}{endpoint}", params=params,
+                                        timeout=config.API_TIMEOUT)
+            except requests.RequestException as error:
+                return 502, {"success": False, "upstream_error": True,
+                             "error": f"{type(error).__name__}: {error}"}
+            try:
+                body = response.json()
+            except ValueError:
+                body = response.text
+            if response.status_code != 429:
+                self.cassette.add(endpoint, params, response.status_code, body)
+            return response.status_code, body
+
+        item = self.cassette.find(endpoint, params)
+        if item is None:
+            return 404, {"success": False, "cassette_miss": True,
+                         "error": f"Запрос не записан в кассету: {params}"}
+        return item["status"], item["body"]
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                endpoint = url.path.lstrip("/")
+                params = dict(parse_qsl(url.query, keep_blank_values=True))
+                if stub.quota is not None:
+                    retry_after = stub.quota.try_acquire()
+                    if retry_after > 0:
+                        stub.requests_throttled += 1
+                        self._send(429, {"success": False, "error": "Too Many Requests"},
+                                   {"Retry-After": str(math.ceil(retry_after))})
+                        return
+                if stub.latency:
+                    time.sleep(stub.latency)
+                status, body = stub.respond(endpoint, params)
+                stub.requests_served += 1
+                self._send(status, body)
+
+            def _send(self, status: int, body, headers: dict = None):
+                if isinstance(body, bytes):
+                    data = body
+                else:
+                    payload = body if isinstance(body, str) else json.dumps(body, ensure_ascii=False)
+                    data = payload.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+class StaticSiteServer:
+    """Локальный HTTP-сервер для сохранённой копии сайта (папка с index.html).
+
+    Нужен, чтобы гонять UI тесты и замеры производительности страницы
+    без сети и без влияния внешних серверов.
+    """
+
+    def __init__(self, directory: str, host: str = "127.0.0.1", port: int = 0):
+        handler = functools.partial(_QuietStaticHandler, directory=directory)
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self.base_url
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+class _QuietStaticHandler(SimpleHTTPRequestHandler):
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Локальный стаб Travelpayouts API")
+    parser.add_argument("--cassette", default=config.CASSETTE_PATH)
+    parser.add_argument("--mode", choices=("replay", "record", "synthetic"), default="replay")
+    parser.add_argument("--response-size", type=int, default=30,
+                        help="Число билетов в ответе в режиме synthetic")
+    parser.add_argument("--latency", type=float, default=config.STUB_LATENCY)
+    parser.add_argument("--quota", type=float, default=config.STUB_QUOTA)
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+
+    with StubServer(Cassette(args.cassette), mode=args.mode, latency=args.latency,
+                    quota=args.quota, response_size=args.response_size,
+                    port=args.port) as stub:
+        print(f"Стаб API запущен: {stub.base_url} (режим {args.mode}, "
+              f"записей в кассете: {len(stub.cassette)})")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
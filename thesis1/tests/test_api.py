@@ -1,7 +1,7 @@
 import allure
 import pytest
-import requests
 from config import config
+from response_schema import TicketValidator
 
 
 @allure.epic("API Тесты Aviasales")
@@ -66,11 +66,11 @@ class TestAPI:
             data = response.get("data", [])
             assert isinstance(data, list), "Данные должны быть списком"
 
-            # Если есть данные, проверяем их структуру
-            if len(data) > 0:
-                first_ticket = data[0]
-                assert "price" in first_ticket, "В билете нет цены"
-                assert "departure_at" in first_ticket, "В билете нет даты вылета"
+            # Каждый билет проверяется по обязательным полям схемы
+            # prices_for_dates (цена, дата вылета, ...) и их типам
+            validator = TicketValidator("prices_for_dates", required_only=True)
+            violations = validator.validate(data)
+            assert not violations, f"{validator.report()}: {violations[:5]}"
 
     @allure.title("3. Поиск билетов по месяцу (без конкретной даты)")
     @allure.story("Гибкие параметры поиска")
@@ -81,16 +81,24 @@ class TestAPI:
         Это полезно для поиска самых дешевых билетов в течение месяца.
         Параметр departure_at: "2026-02" (только год и месяц)
         """
-        with allure.step("Отправить запрос с указанием только месяца"):
-            response = api_client.search_one_way(
+        with allure.step("Получить билеты за месяц с потоковым разбором ответа"):
+            # Ответ за месяц самый большой: билеты разбираются по одному
+            # по мере чтения тела и сразу проверяются по схеме
+            with api_client.stream_search(
                 origin=config.ORIGIN_CITY,
                 destination=config.DESTINATION_CITY,
                 departure_at=config.DEPARTURE_MONTH  # "2026-02" - только месяц
-            )
+            ) as response:
+                tickets = sum(1 for _ in response)
 
         with allure.step("Проверить успешность выполнения"):
             assert response.get("success") == True
 
+        with allure.step(f"Проверить билеты по схеме ({tickets} шт.)"):
+            validator = response.validator
+            assert not validator.violations, \
+                f"{validator.report()}: {validator.violations[:5]}"
+
     @allure.title("4. Поиск билетов по кодам аэропортов (Домодедово → Утапао)")
     @allure.story("Работа с кодами аэропортов")
     @pytest.mark.api
@@ -121,25 +129,19 @@ class TestAPI:
     @allure.title("5. Поиск с ограничением количества результатов")
     @allure.story("Пагинация и ограничения")
     @pytest.mark.api
-    def test_search_with_limit(self):
+    def test_search_with_limit(self, api_client):
         """Тест проверяет работу параметра limit.
 
         Параметр limit=5 ограничивает количество возвращаемых результатов.
         Это важно для производительности и пагинации.
         """
         with allure.step("Отправить запрос с limit=5"):
-            url = f"{config.API_BASE_URL}prices_for_dates"
-            params = {
-                "origin": config.ORIGIN_CITY,
-                "destination": config.DESTINATION_CITY,
-                "departure_at": config.DEPARTURE_DATE,
-                "limit": 5,  # Ограничиваем 5 результатами
-                "token": config.API_TOKEN
-            }
-
-            # Отправляем запрос напрямую, так как в api_client нет параметра limit
-            response = requests.get(url, params=params, timeout=10)
-            data = response.json()
+            data = api_client.search_one_way(
+                origin=config.ORIGIN_CITY,
+                destination=config.DESTINATION_CITY,
+                departure_at=config.DEPARTURE_DATE,
+                limit=5  # Ограничиваем 5 результатами
+            )
 
         with allure.step("Проверить успешность выполнения"):
             assert data.get("success") == True
@@ -0,0 +1,189 @@
+import asyncio
+import socket
+
+import allure
+import pytest
+import requests
+from api_client import AsyncAviasalesAPI
+from config import config
+from response_cache import ResponseCache
+from response_schema import TicketValidator
+from stub_server import Cassette, StubServer
+
+ROUTES = [("MOW", "LED"), ("LED", "MOW"), ("MOW", "AER"), ("KZN", "MOW"),
+          ("SVX", "LED"), ("OVB", "MOW"), ("MOW", "KGD"), ("AER", "LED")]
+
+
+@pytest.fixture
+def synthetic_client(stub_api):
+    """AviasalesAPI против стаба со сгенерированными ответами (без повторов и ограничений)."""
+    return stub_api(response_size=20, retries=0)
+
+
+@allure.epic("API клиент")
+class TestAsyncClient:
+    """Пакетный поиск AsyncAviasalesAPI против локального стаба."""
+
+    @allure.title("search_many возвращает результаты в порядке запросов")
+    def test_search_many_keeps_order(self, synthetic_client):
+        queries = [(origin, destination, config.DEPARTURE_DATE) for origin, destination in ROUTES]
+
+        async def run():
+            async with AsyncAviasalesAPI(synthetic_client) as async_client:
+                return await async_client.search_many(queries, concurrency=4)
+        results = asyncio.run(run())
+
+        assert [result.index for result in results] == list(range(len(queries)))
+        for query, result in zip(queries, results):
+            assert result.ok, result
+            assert result.query == query
+            ticket = result.response["data"][0]
+            assert (ticket["origin"], ticket["destination"]) == query[:2]
+
+    @allure.title("Ошибка одного запроса не прерывает пакет")
+    def test_search_many_isolates_failures(self, synthetic_client, monkeypatch):
+        good = {"origin": "MOW", "destination": "LED", "departure_at": config.DEPARTURE_DATE}
+        broken = dict(good, destination="KGD")
+        queries = [good, broken, dict(good, destination="AER"), broken, good]
+        search = synthetic_client.search
+
+        def failing_search(origin, destination, *args, **kwargs):
+            # Запросы на KGD падают до обращения к стабу
+            if destination == "KGD":
+                raise requests.ConnectionError(f"{origin}-{destination}: соединение разорвано")
+            return search(origin, destination, *args, **kwargs)
+        monkeypatch.setattr(synthetic_client, "search", failing_search)
+
+        results = asyncio.run(AsyncAviasalesAPI(synthetic_client).search_many(queries, 2))
+
+        assert [result.ok for result in results] == [True, False, True, False, True]
+        for query, result in zip(queries, results):
+            if result.ok:
+                assert result.response.get("success") == True
+                assert result.response["data"][0]["destination"] == query["destination"]
+            else:
+                assert type(result.error) is requests.ConnectionError, result.error
+                assert str(result.error) == "MOW-KGD: соединение разорвано"
+        assert synthetic_client.stub.requests_served == 3
+
+
+@pytest.fixture
+def paged_client(stub_api, monkeypatch):
+    """Клиент против стаба с 250 билетами; (page, limit) каждого запроса — в client.pages."""
+    client = stub_api(response_size=250, retries=0)
+    client.pages = []
+    search = client.search
+
+    def recording_search(*args, limit=None, page=None, **kwargs):
+        client.pages.append((page, limit))
+        return search(*args, limit=limit, page=page, **kwargs)
+    monkeypatch.setattr(client, "search", recording_search)
+    return client
+
+
+def ticket_numbers(tickets) -> list:
+    """Номера сгенерированных стабом билетов (параметр t в ссылке)."""
+    return [int(ticket["link"].rsplit("t=", 1)[1]) for ticket in tickets]
+
+
+@allure.epic("API клиент")
+class TestIterPrices:
+    """Постраничный перебор AviasalesAPI.iter_prices."""
+
+    @allure.title("Страницы загружаются по мере перебора и идут подряд")
+    def test_lazy_paging(self, paged_client):
+        tickets = paged_client.iter_prices("MOW", "LED", config.DEPARTURE_MONTH, page_size=50)
+        first = next(tickets)
+        # Загружена первая страница и, возможно, предзагружена вторая
+        assert len(paged_client.pages) <= 2
+        rest = list(tickets)
+        assert ticket_numbers([first] + rest) == list(range(250))
+        assert paged_client.pages == [(1, 50), (2, 50), (3, 50), (4, 50), (5, 50), (6, 50)]
+
+    @allure.title("Прерванный перебор не загружает страницы дальше предзагруженной")
+    def test_break_stops_prefetch(self, paged_client):
+        for ticket in paged_client.iter_prices("MOW", "LED", config.DEPARTURE_MONTH,
+                                               page_size=50):
+            break
+        assert paged_client.pages[0] == (1, 50)
+        assert len(paged_client.pages) <= 2
+
+    @allure.title("С max_items загружается не больше нужного")
+    @pytest.mark.parametrize("max_items,page_size,expected", [
+        (250, 100, [(1, 84), (2, 84), (3, 84)]),
+        (200, 150, [(1, 100), (2, 100)]),
+        (150, 100, [(1, 75), (2, 75)]),
+        (30, 100, [(1, 30)]),
+        # Смещение последней страницы делится на остаток: она уменьшается до него
+        (5, 2, [(1, 2), (2, 2), (5, 1)]),
+    ])
+    def test_max_items(self, paged_client, max_items, page_size, expected):
+        tickets = list(paged_client.iter_prices("MOW", "LED", config.DEPARTURE_MONTH,
+                                                page_size=page_size, max_items=max_items))
+        assert ticket_numbers(tickets) == list(range(max_items))
+        assert paged_client.pages == expected
+        # Лишних билетов запрошено меньше, чем страниц
+        requested = sum(limit for _, limit in paged_client.pages)
+        assert max_items <= requested < max_items + len(paged_client.pages)
+
+
+@allure.epic("API клиент")
+class TestStreamSearch:
+    """Потоковый разбор AviasalesAPI.stream_search и кэш ответов."""
+
+    @allure.title("stream_search отдаёт закэшированный ответ без запроса")
+    def test_uses_cache(self, synthetic_client):
+        synthetic_client.cache = ResponseCache()
+        query = (config.ORIGIN_CITY, config.DESTINATION_CITY, config.DEPARTURE_MONTH)
+        expected = synthetic_client.search(*query)
+        requests_before = synthetic_client.stats.requests
+
+        with synthetic_client.stream_search(*query) as response:
+            tickets = list(response)
+
+        assert synthetic_client.stats.requests == requests_before
+        assert synthetic_client.cache.stats.hits == 1
+        assert tickets == expected["data"]
+        assert response.get("success") == True
+        assert response.validator.checked == len(tickets)
+        assert not response.validator.violations
+
+
+@allure.epic("API клиент")
+class TestResponseSchema:
+    """Необязательные поля билетов: test_api проверяет только обязательные."""
+
+    @allure.title("Типы и формат необязательных полей билетов туда-обратно")
+    @pytest.mark.api
+    def test_round_trip_optional_fields(self, api_client):
+        response = api_client.search_round_trip(
+            origin=config.ORIGIN_CITY,
+            destination=config.DESTINATION_CITY,
+            departure_at=config.DEPARTURE_DATE,
+            return_at=config.RETURN_DATE
+        )
+        assert response.get("success") == True
+        validator = TicketValidator("prices_for_dates")
+        violations = validator.validate(response.get("data", []))
+        assert not violations, f"{validator.report()}: {violations[:5]}"
+
+
+@allure.epic("API клиент")
+class TestStubServer:
+    """Запись кассеты, когда настоящий API недоступен."""
+
+    @allure.title("Ошибка соединения с API превращается в 502, а не рвёт соединение")
+    def test_record_upstream_error(self, tmp_path):
+        with socket.socket() as closed:
+            closed.bind(("127.0.0.1", 0))
+            upstream = f"http://127.0.0.1:{closed.getsockname()[1]}/"
+        cassette = Cassette(str(tmp_path / "api.json"))
+
+        with StubServer(cassette, mode="record", upstream=upstream) as stub:
+            response = requests.get(f"{stub.base_url}v3/prices_for_dates",
+                                    params={"origin": "MOW"}, timeout=config.API_TIMEOUT)
+
+        assert response.status_code == 502
+        body = response.json()
+        assert body["upstream_error"] and body["error"].startswith("ConnectionError: ")
+        assert len(cassette) == 0
@@ -0,0 +1,130 @@
+import allure
+import pytest
+from driver_pool import DriverPool
+from selenium.common.exceptions import WebDriverException
+
+
+class FakeDriver:
+    """WebDriver без браузера: запоминает команды; crashed имитирует упавший браузер."""
+
+    def __init__(self, number: int):
+        self.number = number
+        self.crashed = False
+        self.quit_called = False
+        self.commands = []
+        self.cleared_origins = []
+        self.handles = ["main"]
+        self.switch_to = self
+
+    def _command(self, *command):
+        if self.crashed:
+            raise WebDriverException("chrome not reachable")
+        self.commands.append(command)
+
+    @property
+    def current_url(self):
+        self._command("current_url")
+        return "about:blank"
+
+    @property
+    def window_handles(self):
+        self._command("window_handles")
+        return list(self.handles)
+
+    def window(self, handle):
+        self._command("switch", handle)
+
+    def close(self):
+        self._command("close")
+
+    def execute_script(self, script):
+        self._command("script")
+        return "http://localhost"
+
+    def execute_cdp_cmd(self, name, params):
+        self._command("cdp", name)
+        if name == "Storage.clearDataForOrigin":
+            self.cleared_origins.append(params["origin"])
+
+    def get(self, url):
+        self._command("get", url)
+
+    def quit(self):
+        self.quit_called = True
+        if self.crashed:
+            raise WebDriverException("chrome not reachable")
+
+
+@pytest.fixture
+def pool():
+    drivers = []
+
+    def factory():
+        drivers.append(FakeDriver(len(drivers)))
+        return drivers[-1]
+    pool = DriverPool(factory, max_uses=3)
+    pool.drivers = drivers
+    yield pool
+    pool.close()
+
+
+@allure.epic("Пул браузеров")
+class TestDriverPool:
+    """Переиспользование и пересоздание браузеров DriverPool на поддельном драйвере."""
+
+    @allure.title("Браузер переиспользуется и пересоздаётся после max_uses тестов")
+    def test_recycle_after_max_uses(self, pool):
+        used = []
+        for _ in range(7):
+            driver = pool.acquire()
+            used.append(driver.number)
+            pool.release(driver)
+
+        assert used == [0, 0, 0, 1, 1, 1, 2]
+        assert pool.created == 3
+        assert pool.recycled == 2
+        assert [driver.quit_called for driver in pool.drivers] == [True, True, False]
+
+    @allure.title("Между тестами браузер очищается")
+    def test_reset_between_tests(self, pool):
+        driver = pool.acquire()
+        driver.handles.append("popup")
+        pool.release(driver)
+
+        assert ("switch", "popup") in driver.commands and ("close",) in driver.commands
+        assert ("cdp", "Storage.clearDataForOrigin") in driver.commands
+        assert ("cdp", "Network.clearBrowserCookies") in driver.commands
+        assert driver.commands[-1] == ("get", "about:blank")
+        assert driver.cleared_origins == ["http://localhost"]
+        assert pool.acquire() is driver
+
+    @allure.title("Хранилища очищаются для всех открытых за тест origin")
+    def test_reset_clears_visited_origins(self, pool):
+        driver = pool.acquire()
+        pool.release(driver, ["https://www.aviasales.ru", "https://pics.avs.io",
+                              "http://localhost"])
+
+        assert driver.cleared_origins == ["http://localhost", "https://pics.avs.io",
+                                          "https://www.aviasales.ru"]
+        assert driver.commands.count(("cdp", "Network.clearBrowserCookies")) == 1
+
+    @allure.title("Упавший во время теста браузер не возвращается в пул")
+    def test_recycle_on_crash_in_test(self, pool):
+        driver = pool.acquire()
+        driver.crashed = True
+        pool.release(driver)
+
+        assert driver.quit_called
+        assert pool.recycled == 1
+        assert pool.acquire().number == 1
+
+    @allure.title("Браузер, упавший в простое, заменяется при выдаче")
+    def test_recycle_on_crash_while_idle(self, pool):
+        driver = pool.acquire()
+        pool.release(driver)
+        driver.crashed = True
+
+        replacement = pool.acquire()
+        assert replacement is not driver
+        assert driver.quit_called
+        assert (pool.created, pool.recycled) == (2, 1)
@@ -0,0 +1,57 @@
+import allure
+import pytest
+from fare_calendar import FareCalendarSweeper, date_range
+
+# Стаб генерирует по месяцу билеты на дни 1-28: билет номер i — на день i % 28 + 1
+TICKETS = 28
+
+
+def price(index: int) -> int:
+    """Цена билета номер index в ответе стаба (см. stub_server.synthetic_response)."""
+    return 3000 + (index * 7919) % 20000
+
+
+@pytest.fixture
+def stub_client(stub_api):
+    return stub_api(response_size=TICKETS)
+
+
+@allure.epic("Календарь цен")
+class TestFareCalendar:
+    """FareCalendarSweeper против стаба со сгенерированными ответами."""
+
+    @allure.title("Месячный запрос заполняет календарь, дни запрашиваются только для пустых ячеек")
+    def test_one_way_sweep(self, stub_client):
+        sweeper = FareCalendarSweeper(stub_client)
+        calendar = sweeper.sweep("MOW", "LED", date_range("2026-06-01", "2026-06-30"))
+
+        # Один запрос за июнь и по запросу на 29 и 30 июня вместо 30 запросов
+        assert (calendar.calls, calendar.month_calls, calendar.day_calls) == (3, 1, 2)
+        assert calendar.naive_calls == 30
+        for day in range(1, 29):
+            assert calendar.prices[(f"2026-06-{day:02d}", None)] == price(day - 1)
+        cheapest = min(price(index) for index in range(TICKETS))
+        assert calendar.prices[("2026-06-29", None)] == cheapest
+        assert calendar.prices[("2026-06-30", None)] == cheapest
+
+        with allure.step("Повторный обход не делает запросов"):
+            again = sweeper.sweep("MOW", "LED", date_range("2026-06-01", "2026-06-30"))
+            assert again.calls == 0
+            assert again.prices == calendar.prices
+
+    @allure.title("Отдельные ячейки запрашиваются только для строк, упёршихся в limit")
+    def test_round_trip_truncated_rows(self, stub_client):
+        calendar = FareCalendarSweeper(stub_client, limit=3).sweep(
+            "MOW", "LED", date_range("2026-06-01", "2026-06-03"),
+            date_range("2026-06-01", "2026-06-05"))
+
+        # Месяц: ячейки (1,1), (2,2), (3,3). Строки по дням вылета упираются в limit
+        # и дают возвращение 1-3 июня, поэтому ячейки 4-5 июня запрашиваются по одной
+        assert calendar.naive_calls == 12
+        assert (calendar.month_calls, calendar.day_calls) == (1, 3 + 6)
+        first_three = min(price(index) for index in range(3))
+        assert calendar.matrix() == [
+            [first_three, price(1), price(2), first_three, first_three],
+            [None, price(1), price(2), first_three, first_three],
+            [None, None, price(2), first_three, first_three],
+        ]
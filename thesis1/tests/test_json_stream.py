@@ -0,0 +1,54 @@
+import json
+
+import allure
+from json_stream import StreamedResponse
+from response_schema import TicketValidator
+from stub_server import synthetic_response
+
+
+def chunked(body: bytes, size: int) -> list:
+    return [body[index:index + size] for index in range(0, len(body), size)]
+
+
+@allure.epic("Потоковый разбор ответов API")
+class TestJsonStream:
+    """Разбор поля data по частям тела и проверка билетов по схеме."""
+
+    @allure.title("Разбор по чанкам любого размера совпадает с json.loads")
+    def test_matches_json_loads(self):
+        response = synthetic_response({"origin": "MOW", "destination": "LED",
+                                       "departure_at": "2026-02"}, 20)
+        response["note"] = "Москва → Санкт-Петербург"
+        response["total"] = 12345
+        body = json.dumps(response, ensure_ascii=False).encode("utf-8")
+        # Размер 1 режет многобайтовые символы UTF-8 и числа на границе чанков
+        for size in (1, 3, 64, len(body)):
+            assert StreamedResponse(chunked(body, size)).read() == response
+
+    @allure.title("Нарушения схемы собираются по мере разбора билетов")
+    def test_collects_violations(self):
+        tickets = synthetic_response({}, 3)["data"]
+        tickets[1]["price"] = "3000"
+        del tickets[2]["departure_at"]
+        tickets[2]["origin"] = "mow"
+        body = json.dumps({"success": True, "data": tickets}).encode("utf-8")
+
+        validator = TicketValidator("prices_for_dates")
+        response = StreamedResponse(chunked(body, 100), validator=validator)
+        assert len(list(response)) == 3
+        assert response.get("success") == True
+        assert validator.checked == 3
+        assert validator.violations == [
+            "билет 1: поле price: ожидался float/int, получено '3000'",
+            "билет 2: поле origin: неверный формат 'mow'",
+            "билет 2: нет поля departure_at",
+        ]
+
+    @allure.title("Дробные числа и экспонента на границе чанков разбираются целиком")
+    def test_numbers_split_at_every_offset(self):
+        body = (b'{"success":true,"total":12.5,"data":[1.5e3,2,-0.25E-2,7.0,1e+2],'
+                b'"rate":0.125}')
+        expected = json.loads(body)
+        for offset in range(1, len(body)):
+            response = StreamedResponse([body[:offset], body[offset:]])
+            assert response.read() == expected, offset
@@ -0,0 +1,92 @@
+import json
+
+import allure
+from config import config
+from network_filter import (
+    apply_network_profile,
+    blocked_patterns,
+    collect_traffic,
+    first_party_sites,
+    host_resolver_rules,
+    is_third_party,
+)
+
+FUNCTIONAL = config.NETWORK_PROFILES["functional"]["blocked_urls"]
+
+
+class RecordingDriver:
+    """Запоминает команды CDP вместо браузера; журнал performance задаётся заранее."""
+
+    def __init__(self, log: list = ()):
+        self.commands = []
+        self.log = list(log)
+
+    def execute_cdp_cmd(self, name, params):
+        self.commands.append((name, params))
+
+    def get_log(self, name):
+        entries, self.log = self.log, []
+        return entries
+
+
+def request_sent(request_id: str, url: str, kind: str) -> dict:
+    """Запись журнала performance о начале запроса."""
+    message = {"method": "Network.requestWillBeSent",
+               "params": {"requestId": request_id, "type": kind, "request": {"url": url}}}
+    return {"message": json.dumps({"message": message})}
+
+
+@allure.epic("Блокировка сетевых запросов")
+class TestNetworkFilter:
+    """Шаблоны профиля, allowlist и правило сторонних хостов без браузера."""
+
+    @allure.title("Шаблоны, задевающие allowlist, не передаются в браузер")
+    def test_allowlist_drops_matching_patterns(self):
+        allowlist = ["https://cdn.example.com/logo.png", "mc.yandex.ru"]
+        patterns = blocked_patterns(FUNCTIONAL, allowlist)
+
+        assert "*.png" not in patterns
+        assert "*mc.yandex.ru*" not in patterns
+        assert set(FUNCTIONAL) - set(patterns) == {"*.png", "*mc.yandex.ru*"}
+        assert "*.jpg" in patterns and "*google-analytics.com*" in patterns
+
+    @allure.title("Без allowlist шаблоны профиля не меняются")
+    def test_no_allowlist(self):
+        assert blocked_patterns(FUNCTIONAL) == FUNCTIONAL
+        assert blocked_patterns(config.NETWORK_PROFILES["full"]["blocked_urls"]) == []
+
+    @allure.title("Шаблоны включаются через Network.setBlockedURLs")
+    def test_apply_network_profile(self):
+        driver = RecordingDriver()
+        apply_network_profile(driver, ["*.png"])
+        assert driver.commands == [("Network.enable", {}),
+                                   ("Network.setBlockedURLs", {"urls": ["*.png"]})]
+
+    @allure.title("Свои поддомены и allowlist не считаются сторонними хостами")
+    def test_first_party_sites(self):
+        sites = first_party_sites("https://www.aviasales.ru/", ["https://static.avs.io/x.js"])
+
+        assert sites == ["aviasales.ru", "static.avs.io"]
+        assert not is_third_party("https://pics.aviasales.ru/logo.svg", sites)
+        assert not is_third_party("https://static.avs.io/app.js", sites)
+        assert is_third_party("https://mc.yandex.ru/watch/1", sites)
+        assert is_third_party("https://avs.io/other.js", sites)
+
+        rules = host_resolver_rules(sites)
+        assert rules.startswith("MAP * ~NOTFOUND, EXCLUDE localhost")
+        assert "EXCLUDE aviasales.ru, EXCLUDE *.aviasales.ru" in rules
+        assert "EXCLUDE static.avs.io, EXCLUDE *.static.avs.io" in rules
+
+    @allure.title("collect_traffic собирает origin загруженных документов")
+    def test_collect_traffic_origins(self):
+        driver = RecordingDriver([
+            request_sent("1", "https://www.aviasales.ru/search?x=1", "Document"),
+            request_sent("2", "https://www.aviasales.ru/app.js", "Script"),
+            request_sent("3", "https://widget.avs.io:8443/frame", "Document"),
+            request_sent("4", "about:blank", "Document"),
+        ])
+        traffic = collect_traffic(driver)
+
+        assert traffic["requests"] == 4
+        assert traffic["origins"] == ["https://widget.avs.io:8443", "https://www.aviasales.ru"]
+        assert collect_traffic(driver)["origins"] == []
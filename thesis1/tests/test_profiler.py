@@ -0,0 +1,31 @@
+import allure
+from profiler import StepProfiler, step_name
+
+
+@allure.epic("Профилирование шагов")
+class TestStepProfiler:
+    """Имена шагов в профиле: без параметров вызова и без token."""
+
+    @allure.title("Параметры и token убираются из заголовка шага")
+    def test_step_name(self):
+        assert step_name("API запрос: {'origin': 'MOW', 'token': 'secret'}") == "API запрос: {…}"
+        assert step_name("Открыть https://x/?token=secret&y=1") == "Открыть https://x/?token=***&y=1"
+        assert step_name("Нажать поиск") == "Нажать поиск"
+
+    @allure.title("Одинаковые шаги с разными параметрами суммируются")
+    def test_steps_aggregate_without_token(self, tmp_path):
+        profiler = StepProfiler(str(tmp_path / "profile.folded"))
+        for number, origin in enumerate(["MOW", "LED", "AER"]):
+            uuid = f"step-{number}"
+            profiler.start_step(uuid, f"API запрос: {{'origin': '{origin}', 'token': 'secret'}}",
+                                {})
+            profiler.stop_step(uuid, None, None, None)
+
+        assert list(profiler.stats) == [("step", "API запрос: {…}")]
+        assert profiler.stats[("step", "API запрос: {…}")][0] == 3
+
+        profiler.folded = {stack: 1.0 for stack in profiler.folded}
+        profiler.write_folded()
+        content = (tmp_path / "profile.folded").read_text(encoding="utf-8")
+        assert content == "API запрос: {…} 1000000\n"
+        assert "secret" not in "\n".join(profiler.report())
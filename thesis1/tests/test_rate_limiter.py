@@ -0,0 +1,63 @@
+import asyncio
+import allure
+import pytest
+from api_client import AsyncAviasalesAPI
+from config import config
+from rate_limiter import RateLimiter, TokenBucket, shared_rate_limiter
+
+
+@allure.epic("Ограничение частоты запросов")
+class TestRateLimiter:
+    """Проверки ограничителя частоты против локального стаба с квотой."""
+
+    @allure.title("Параллельные запросы сверх квоты выполняются без ошибок")
+    def test_parallel_requests_within_quota(self, stub_api):
+        """Клиент настроен на 50 запр/с, а стаб пропускает только 10 запр/с.
+
+        Ограничитель должен получить 429, снизить скорость и повторить
+        запросы так, чтобы все они завершились успешно.
+        """
+        limiter = RateLimiter({"prices_for_dates": 50})
+        client = stub_api(mode="replay", quota=10, rate_limiter=limiter, throttle_retries=10)
+        stub = client.stub
+        query = (config.ORIGIN_CITY, config.DESTINATION_CITY, config.DEPARTURE_DATE)
+
+        with allure.step("Отправить 25 запросов параллельно"):
+            results = asyncio.run(
+                AsyncAviasalesAPI(client).search_many([query] * 25, concurrency=8))
+
+        with allure.step("Проверить, что все запросы успешны"):
+            assert all(result.ok and result.response.get("success") for result in results), \
+                [result for result in results if not result.ok]
+
+        with allure.step("Проверить, что ограничитель подстроился под квоту"):
+            assert stub.requests_throttled > 0, "Стаб ни разу не ответил 429"
+            assert limiter.bucket("prices_for_dates").rate < 50
+
+    @allure.title("Корзина с файлом состояния общая для нескольких экземпляров")
+    def test_shared_bucket_state(self, tmp_path):
+        """Две корзины с одним файлом состояния ведут себя как одна."""
+        state_path = str(tmp_path / "bucket.json")
+        first = TokenBucket(5, capacity=2, state_path=state_path)
+        second = TokenBucket(5, capacity=2, state_path=state_path)
+
+        assert first.try_acquire() == 0
+        assert second.try_acquire() == 0
+        assert first.try_acquire() > 0, "Токены второй корзины не учтены в первой"
+
+        second.on_throttle(retry_after=0.5)
+        assert first.try_acquire() >= 0.4, "Пауза после 429 не общая для корзин"
+        assert first.rate == pytest.approx(2.5)
+
+    @allure.title("Общий ограничитель следует за изменением настроек")
+    def test_shared_limiter_follows_config(self, monkeypatch):
+        monkeypatch.setattr(config, "API_RATE_LIMITS", {"prices_for_dates": 3.0})
+        first = shared_rate_limiter()
+        assert shared_rate_limiter() is first
+        assert first.bucket("prices_for_dates").max_rate == 3.0
+
+        monkeypatch.setattr(config, "API_RATE_LIMITS", {})
+        monkeypatch.setattr(config, "API_RATE_LIMIT_DEFAULT", 1000.0)
+        second = shared_rate_limiter()
+        assert second is not first
+        assert second.bucket("prices_for_dates").max_rate == 1000.0
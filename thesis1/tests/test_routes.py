@@ -0,0 +1,56 @@
+import allure
+import pytest
+from config import config
+from response_schema import TicketValidator
+from route_matrix import load_routes
+
+ROUTES = load_routes(config.ROUTES_CSV, config.ROUTES_LIMIT)
+
+
+def route_id(route):
+    return "-".join(route)
+
+
+@allure.epic("API Тесты Aviasales")
+@allure.feature("Матрица маршрутов")
+@pytest.mark.parametrize("route", ROUTES, ids=route_id)
+class TestRouteMatrix:
+    """Проверки из tests/test_api.py для каждого маршрута из config.ROUTES_CSV.
+
+    Ответы загружаются заранее и параллельно фикстурой route_responses:
+    проверки одного маршрута с одинаковым запросом делят один HTTP-запрос.
+    """
+
+    @allure.title("Поиск в одну сторону выполнен успешно")
+    @pytest.mark.route_query("one_way")
+    def test_one_way_success(self, route, route_response):
+        assert route_response.get("success") == True, \
+            f"Запрос не выполнен успешно. Ответ: {route_response}"
+
+    @allure.title("В ответе есть данные и валюта")
+    @pytest.mark.route_query("one_way")
+    def test_one_way_structure(self, route, route_response):
+        assert "data" in route_response, "В ответе нет данных о билетах"
+        assert "currency" in route_response, "В ответе не указана валюта"
+
+    @allure.title("Билеты туда-обратно соответствуют схеме")
+    @pytest.mark.route_query("round_trip")
+    def test_round_trip_ticket_fields(self, route, route_response):
+        assert route_response.get("success") == True
+        data = route_response.get("data", [])
+        assert isinstance(data, list), "Данные должны быть списком"
+        validator = TicketValidator("prices_for_dates", required_only=True)
+        violations = validator.validate(data)
+        assert not violations, f"{validator.report()}: {violations[:5]}"
+
+    @allure.title("Поиск по месяцу выполнен успешно")
+    @pytest.mark.route_query("month")
+    def test_month_success(self, route, route_response):
+        assert route_response.get("success") == True
+
+    @allure.title("Ответ не превышает limit")
+    @pytest.mark.route_query("limit")
+    def test_limit_bound(self, route, route_response):
+        assert route_response.get("success") == True
+        results = route_response.get("data", [])
+        assert len(results) <= 5, f"Получено {len(results)} результатов, но limit=5"
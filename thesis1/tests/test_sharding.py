@@ -0,0 +1,150 @@
+import json
+import os
+import sqlite3
+
+import allure
+import pytest
+import sharding
+from response_cache import ResponseCache
+from sharding import ShardingPlugin, merge_json, merge_sqlite, pack_items
+
+
+class FakeItem:
+    """Тест без pytest: nodeid и маркер."""
+
+    def __init__(self, nodeid: str, marker: str = None):
+        self.nodeid = nodeid
+        self.marker = marker
+
+    def get_closest_marker(self, name):
+        return name if name == self.marker else None
+
+
+def nodeids(groups) -> list:
+    return [[item.nodeid for item in group] for _, group in groups]
+
+
+def write_json(path, data):
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file)
+
+
+def read_json(path) -> dict:
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+@allure.epic("Параллельный запуск")
+class TestPackItems:
+    """Раскладка тестов по шардам."""
+
+    @allure.title("Самые долгие тесты идут в наименее загруженный шард")
+    def test_longest_first(self):
+        durations = {"a": 10.0, "b": 7.0, "c": 6.0, "d": 4.0, "e": 3.0}
+        items = [FakeItem(nodeid) for nodeid in "abcde"]
+        groups = pack_items(items, 2, durations)
+
+        assert nodeids(groups) == [["a", "d"], ["b", "c", "e"]]
+        assert [load for load, _ in groups] == [14.0, 16.0]
+
+    @allure.title("Без истории длительность оценивается по маркеру")
+    def test_estimates_for_unknown(self):
+        items = [FakeItem("ui", "ui"), FakeItem("api", "api"), FakeItem("other"),
+                 FakeItem("known", "ui")]
+        groups = pack_items(items, 3, {"known": 0.5})
+
+        assert nodeids(groups) == [["ui"], ["other"], ["api", "known"]]
+        assert [load for load, _ in groups] == [30.0, 5.0, 1.5]
+
+    @allure.title("Шардов больше, чем тестов")
+    def test_more_shards_than_items(self):
+        groups = pack_items([FakeItem("a")], 3, {})
+        assert nodeids(groups) == [["a"], [], []]
+
+
+@allure.epic("Параллельный запуск")
+class TestShardMerge:
+    """Слияние результатов шардов в процессе-координаторе."""
+
+    @pytest.fixture
+    def plugin(self, tmp_path):
+        plugin = ShardingPlugin.__new__(ShardingPlugin)
+        plugin.path = str(tmp_path / ".test_durations.json")
+        return plugin
+
+    @allure.title("Длительности шардов дописываются в общую историю")
+    def test_merge_durations(self, plugin):
+        write_json(plugin.path, {"a": 1.0, "b": 2.0})
+        write_json(f"{plugin.path}.shard-0", {"b": 3.0})
+        write_json(f"{plugin.path}.shard-1", {"c": 4.0})
+
+        plugin._merge_durations(3)
+        assert read_json(plugin.path) == {"a": 1.0, "b": 3.0, "c": 4.0}
+        assert not os.path.exists(f"{plugin.path}.shard-0")
+
+    @allure.title("Упавшие тесты читаются из файла шарда, без файла — пустой список")
+    def test_read_failed(self, tmp_path):
+        items_file = str(tmp_path / "shard-0.txt")
+        write_json(f"{items_file}.failed", ["tests/test_api.py::test_a"])
+
+        assert ShardingPlugin._read_failed(items_file) == ["tests/test_api.py::test_a"]
+        assert ShardingPlugin._read_failed(str(tmp_path / "shard-1.txt")) == []
+
+    @allure.title("Результаты Allure переносятся в общую папку")
+    def test_merge_allure(self, tmp_path):
+        for shard_id in range(2):
+            shard_dir = tmp_path / f".shard-{shard_id}"
+            shard_dir.mkdir()
+            (shard_dir / f"{shard_id}-result.json").write_text("{}")
+
+        ShardingPlugin._merge_allure(str(tmp_path), 3)
+        assert sorted(os.listdir(tmp_path)) == ["0-result.json", "1-result.json"]
+
+    @allure.title("JSON-кэши: из копий берутся только изменения шардов")
+    def test_merge_json(self, tmp_path):
+        path = str(tmp_path / ".selector_cache.json")
+        write_json(path, {"search": "#a", "result": "#r"})
+        write_json(f"{path}.shard-0", {"search": "#b", "result": "#r"})
+        write_json(f"{path}.shard-1", {"search": "#a", "result": "#r", "price": "#p"})
+
+        merge_json(path, [f"{path}.shard-0", f"{path}.shard-1"])
+        assert read_json(path) == {"search": "#b", "result": "#r", "price": "#p"}
+
+    @allure.title("SQLite-кэш: записи шардов сливаются, побеждает более свежая")
+    def test_merge_sqlite(self, tmp_path):
+        path = str(tmp_path / ".api_cache.sqlite")
+        copies = [f"{path}.shard-{shard_id}" for shard_id in range(2)]
+        for copy, body in zip(copies, ({"shard": 0}, {"shard": 1})):
+            cache = ResponseCache(path=copy)
+            cache.set("/prices", {"origin": "MOW"}, body)
+            cache.set("/prices", {"origin": f"LED{body['shard']}"}, body)
+            cache.close()
+
+        merge_sqlite(path, copies)
+        cache = ResponseCache(path=path)
+        try:
+            assert cache.get("/prices", {"origin": "MOW"}) == {"shard": 1}
+            assert cache.get("/prices", {"origin": "LED0"}) == {"shard": 0}
+            assert cache.get("/prices", {"origin": "LED1"}) == {"shard": 1}
+        finally:
+            cache.close()
+
+    @allure.title("Воркеры получают свои копии общих файлов")
+    def test_shard_environment(self, tmp_path, monkeypatch):
+        paths = {name: str(tmp_path / name.lower()) for name in sharding.SHARED_FILES}
+        for name, path in paths.items():
+            monkeypatch.setattr(sharding.config, name, path)
+        write_json(paths["SELECTOR_CACHE_PATH"], {"search": "#a"})
+
+        env = sharding.shard_environment(1)
+        assert {name: env[name] for name in paths} == {
+            name: f"{path}.shard-1" for name, path in paths.items()}
+        assert read_json(env["SELECTOR_CACHE_PATH"]) == {"search": "#a"}
+
+        write_json(env["SELECTOR_CACHE_PATH"], {"search": "#b"})
+        write_json(env["NETWORK_HISTORY_PATH"], {"test": {"requests": 1, "bytes": 2}})
+        sharding.merge_shared_files(2)
+        assert read_json(paths["SELECTOR_CACHE_PATH"]) == {"search": "#b"}
+        assert read_json(paths["NETWORK_HISTORY_PATH"]) == {"test": {"requests": 1, "bytes": 2}}
+        assert sorted(os.listdir(tmp_path)) == sorted(
+            os.path.basename(path) for path in paths.values() if os.path.exists(path))
@@ -0,0 +1,62 @@
+import allure
+import pytest
+from pages.static_page import StaticPage, UnsupportedSelector, parse_html, select
+from pages.tiered_page import TierStats, TieredAviasalesPage
+
+HTML = """
+<html><head><title>Авиабилеты</title><script>var footer = "нет";</script></head>
+<body>
+  <div class="origin-field"><input placeholder="Откуда" name="origin"></div>
+  <input type="hidden" data-test-id="destination">
+  <a href="/" class="logo"><img alt="Aviasales логотип" src="/logo.svg"></a>
+  <footer data-test-id="footer"><p>© Aviasales <b>2026</b></p></footer>
+</body></html>
+"""
+
+
+def static_page(html: str) -> StaticPage:
+    """StaticPage с заранее разобранным документом (без HTTP-запроса)."""
+    page = StaticPage()
+    page.document = parse_html(html)
+    return page
+
+
+@allure.epic("Проверки UI без браузера")
+class TestStaticPage:
+    """Проверки разбора HTML и уровней UI проверок."""
+
+    @allure.title("Селекторы из LOCATORS работают по HTML без браузера")
+    def test_locators_resolve_statically(self):
+        document = parse_html(HTML)
+        assert [node.attrs["name"] for node in select(document, ".origin-field input")] == ["origin"]
+        assert select(document, "input[placeholder*='Откуда']")[0].attrs["name"] == "origin"
+        assert select(document, "img[alt*='Aviasales']")[0].tag == "img"
+        assert select(document, "body > footer")[0].text == "© Aviasales 2026"
+        assert select(document, "[data-test-id='destination']")[0].hidden
+        with pytest.raises(UnsupportedSelector):
+            select(document, "button:contains('Найти')")
+
+    @allure.title("Проверки обслуживаются HTML, а в браузер уходят только недостающие")
+    def test_tier_escalation(self):
+        browser_calls = []
+
+        class Browser:
+            def open(self):
+                browser_calls.append("open")
+
+            def find_footer(self):
+                browser_calls.append("footer")
+                return "footer-from-browser"
+
+        stats = TierStats()
+        page = TieredAviasalesPage(Browser, static_page=static_page(HTML.replace("footer", "div")),
+                                   static_tier=True, stats=stats)
+
+        assert page.get_title() == "Авиабилеты"
+        assert page.find_logo().attrs["href"] == "/"
+        assert browser_calls == []
+
+        assert page.find_footer() == "footer-from-browser"
+        assert page.tiers == {"title": "html", "logo": "html", "footer": "browser"}
+        assert browser_calls == ["open", "footer"]
+        assert stats.checks["footer"]["reasons"] == {"не найдено в HTML": 1}
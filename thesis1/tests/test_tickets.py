@@ -0,0 +1,131 @@
+import statistics
+from datetime import datetime
+
+import allure
+import pytest
+from tickets import Ticket, TicketSet
+
+
+def ticket(day: str, price: int, airline: str, transfers: int = 0, duration: int = 90) -> dict:
+    return {"origin": "MOW", "destination": "LED", "departure_at": f"{day}T10:00:00+03:00",
+            "price": price, "airline": airline, "flight_number": f"{airline}{price}",
+            "transfers": transfers, "duration": duration,
+            "link": f"/search/MOW{day[8:]}02LED1?t={airline}{price}"}
+
+
+TICKETS = [
+    ticket("2026-02-01", 4200, "SU", 0, 90),
+    ticket("2026-02-01", 3900, "DP", 1, 210),
+    ticket("2026-02-01", 5100, "SU", 0, 95),
+    ticket("2026-02-02", 4400, "S7", 1, 200),
+    ticket("2026-02-02", 4100, "DP", 0, 85),
+    ticket("2026-02-03", 3800, "SU", 2, 330),
+    ticket("2026-02-03", 4600, "S7", 0, 90),
+    ticket("2026-02-05", 4000, "U6", 1, 240),
+    ticket("2026-02-05", 4300, "SU", 0, 90),
+    ticket("2026-02-05", 19900, "SU", 0, 90),  # выброс сверху
+    ticket("2026-02-06", 900, "DP", 0, 85),  # выброс снизу
+]
+# Даты с разбросом больше 1024 дней: группировка идёт через np.unique, а не смещением
+SPREAD = TICKETS + [ticket("2030-07-15", 6100, "FV", 1, 150)]
+
+KEYS = {
+    "day": lambda item: item["departure_at"][:10],
+    "airline": lambda item: item["airline"],
+    "transfers": lambda item: item["transfers"],
+}
+COLUMNS = {
+    "price": lambda item: item["price"],
+    "duration": lambda item: item["duration"],
+    "departure_at": lambda item: datetime.fromisoformat(item["departure_at"][:19]),
+    "fare": lambda item: item["price"] / 3,
+}
+AGGREGATES = {
+    "min": min,
+    "max": max,
+    "sum": sum,
+    "mean": statistics.fmean,
+    "count": len,
+}
+
+
+def dict_group_by(tickets: list, key: str, column: str, agg: str) -> dict:
+    groups = {}
+    for item in tickets:
+        groups.setdefault(KEYS[key](item), []).append(COLUMNS[column](item))
+    return {group: AGGREGATES[agg](values) for group, values in groups.items()}
+
+
+@allure.epic("Аналитика цен")
+@pytest.mark.parametrize("tickets", [TICKETS, SPREAD], ids=["compact", "spread"])
+class TestTicketSet:
+    """Векторные операции TicketSet против тех же расчётов циклами по словарям."""
+
+    @allure.title("group_by совпадает с группировкой словарей")
+    @pytest.mark.parametrize("key", sorted(KEYS))
+    @pytest.mark.parametrize("column", ["price", "duration"])
+    @pytest.mark.parametrize("agg", sorted(AGGREGATES))
+    def test_group_by(self, tickets, key, column, agg):
+        result = TicketSet.from_tickets(tickets).group_by(key, column, agg)
+        assert result == pytest.approx(dict_group_by(tickets, key, column, agg))
+
+    @allure.title("min и max по датам и дробной колонке")
+    @pytest.mark.parametrize("key", sorted(KEYS))
+    @pytest.mark.parametrize("agg", ["min", "max"])
+    def test_group_by_datetime_and_float(self, tickets, key, agg):
+        ticket_set = TicketSet.from_tickets(tickets)
+        ticket_set.fare = ticket_set.price / 3
+
+        dates = ticket_set.group_by(key, "departure_at", agg)
+        assert dates == dict_group_by(tickets, key, "departure_at", agg)
+        assert all(isinstance(value, datetime) for value in dates.values())
+        assert ticket_set.group_by(key, "fare", agg) == pytest.approx(
+            dict_group_by(tickets, key, "fare", agg))
+
+    @allure.title("Сумма по датам не считается")
+    def test_group_by_datetime_sum(self, tickets):
+        with pytest.raises(ValueError):
+            TicketSet.from_tickets(tickets).group_by("day", "departure_at", "sum")
+
+    @allure.title("Подмножество набора возвращает билеты со всеми полями")
+    def test_subset_round_trip(self, tickets):
+        ticket_set = TicketSet.from_tickets(tickets)
+        mask = ticket_set.price > 4200
+
+        expected = [Ticket.from_dict(item).to_dict() for item in tickets if item["price"] > 4200]
+        assert [item.to_dict() for item in ticket_set[mask].to_tickets()] == expected
+        assert [item.to_dict() for item in ticket_set.filter(mask)] == expected
+        assert ticket_set[0].to_dict() == Ticket.from_dict(tickets[0]).to_dict()
+        assert len(ticket_set[2:5]) == 3
+
+    @allure.title("cheapest_per_day — минимальная цена по дате вылета")
+    def test_cheapest_per_day(self, tickets):
+        expected = {}
+        for item in tickets:
+            day = item["departure_at"][:10]
+            expected[day] = min(expected.get(day, item["price"]), item["price"])
+        assert TicketSet.from_tickets(tickets).cheapest_per_day() == expected
+
+    @allure.title("price_stats совпадает с модулем statistics")
+    def test_price_stats(self, tickets):
+        prices = [item["price"] for item in tickets]
+        stats = TicketSet.from_tickets(tickets).price_stats(percentiles=(25, 50, 75))
+        q1, median, q3 = statistics.quantiles(prices, n=4, method="inclusive")
+        assert stats == pytest.approx({
+            "count": len(prices), "min": min(prices), "max": max(prices),
+            "mean": statistics.fmean(prices), "std": statistics.pstdev(prices),
+            "p25": q1, "p50": median, "p75": q3,
+        })
+
+    @allure.title("outliers — билеты за пределами межквартильного размаха")
+    def test_outliers(self, tickets):
+        prices = [item["price"] for item in tickets]
+        q1, _, q3 = statistics.quantiles(prices, n=4, method="inclusive")
+        spread = 1.5 * (q3 - q1)
+        expected = sorted(item["price"] for item in tickets
+                          if not q1 - spread <= item["price"] <= q3 + spread)
+
+        outliers = TicketSet.from_tickets(tickets).outliers()
+        assert sorted(ticket.price for ticket in outliers) == expected
+        assert all(isinstance(ticket, Ticket) for ticket in outliers)
+        assert 900 in expected and 19900 in expected
@@ -1,5 +1,6 @@
 import allure
 import pytest
+from config import config
 
 
 @allure.epic("UI Тесты Aviasales")
@@ -9,13 +10,12 @@ class TestUI:
     @allure.title("1. Главная страница доступна")
     @allure.story("Доступность сайта")
     @pytest.mark.ui
-    def test_open_main_page(self, aviasales_page):
+    def test_open_main_page(self, tiered_page):
         """Тест проверяет, что главная страница сайта загружается."""
-        aviasales_page.open()
-        title = aviasales_page.get_title()
+        title = tiered_page.get_title()
         # Проверяем что заголовок не пустой
         assert len(title) > 0, "Заголовок страницы пустой"
-        print(f"Заголовок страницы: {title}")
+        print(f"Заголовок страницы: {title} (уровень: {tiered_page.tiers['title']})")
 
     @allure.title("2. Форма поиска билетов отображается")
     @allure.story("Основные элементы интерфейса")
@@ -47,28 +47,31 @@ class TestUI:
     def test_simple_search(self, aviasales_page):
         """Тест проверяет работу поиска."""
         aviasales_page.open()
+        main_url = config.BASE_URL.rstrip("/") + "/"
 
-        # Пробуем выполнить поиск
+        # Сначала заполняем поля
         try:
-            # Сначала заполняем поля
             aviasales_page.set_origin("Москва")
             aviasales_page.set_destination("Санкт-Петербург")
+        except Exception as e:
+            print(f"Поля поиска не заполнены: {e}")
+            # Для курсовой - проверяем хотя бы что страница загрузилась
+            title = aviasales_page.get_title()
+            assert len(title) > 0, "Страница не загрузилась"
+            return
 
-            # Нажимаем поиск
-            aviasales_page.search()
-
-            # Ждем изменения URL (ждем до 10 секунд)
-            from selenium.webdriver.support.ui import WebDriverWait
-            from selenium.webdriver.support import expected_conditions as EC
+        # Нажимаем поиск: если кнопка не найдена, тест падает с объяснением WaitTimeout
+        aviasales_page.search()
 
-            wait = WebDriverWait(aviasales_page.driver, 10)
-            wait.until(lambda driver: driver.current_url != "https://www.aviasales.ru/")
+        try:
+            # Ждем изменения URL (в пределах бюджета ожидания действия)
+            aviasales_page.wait_for_url_change(main_url)
 
             url = aviasales_page.get_url()
             print(f"URL после поиска: {url}")
 
             # Проверяем что URL изменился
-            assert url != "https://www.aviasales.ru/", "URL не изменился после поиска"
+            assert url != main_url, "URL не изменился после поиска"
 
         except Exception as e:
             print(f"Поиск не сработал полностью: {e}")
@@ -79,12 +82,10 @@ class TestUI:
     @allure.title("4. Наличие футера")
     @allure.story("Структура страницы")
     @pytest.mark.ui
-    def test_footer_exists(self, aviasales_page):
+    def test_footer_exists(self, tiered_page):
         """Тест проверяет наличие футера сайта."""
-        aviasales_page.open()
-
         try:
-            footer = aviasales_page.find_footer()
+            footer = tiered_page.find_footer()
             assert footer.is_displayed(), "Футер не отображается"
             print("Футер найден и отображается")
 
@@ -92,28 +93,27 @@ class TestUI:
             footer_text = footer.text
             assert len(footer_text.strip()) > 0, "Футер пустой"
             print(f"Текст футера (первые 100 символов): {footer_text[:100]}")
+            print(f"Уровень проверки: {tiered_page.tiers['footer']}")
 
         except Exception as e:
             print(f"Футер не найден: {e}")
             # Для курсовой - проверяем хотя бы что страница загрузилась
-            title = aviasales_page.get_title()
+            title = tiered_page.get_title()
             assert len(title) > 0, "Страница не загрузилась"
 
     @allure.title("5. Логотип сайта")
     @allure.story("Брендинг и идентификация")
     @pytest.mark.ui
-    def test_logo_exists(self, aviasales_page):
+    def test_logo_exists(self, tiered_page):
         """Тест проверяет наличие логотипа Aviasales."""
-        aviasales_page.open()
-
         try:
-            logo = aviasales_page.find_logo()
+            logo = tiered_page.find_logo()
             assert logo is not None, "Логотип не найден"
             assert logo.is_displayed(), "Логотип не отображается"
-            print("Логотип найден и отображается")
+            print(f"Логотип найден и отображается (уровень: {tiered_page.tiers['logo']})")
 
         except Exception as e:
             print(f"Логотип не найден: {e}")
             # Для курсовой - проверяем хотя бы что страница загрузилась
-            title = aviasales_page.get_title()
+            title = tiered_page.get_title()
             assert len(title) > 0, "Страница не загрузилась"
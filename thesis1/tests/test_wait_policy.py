@@ -0,0 +1,98 @@
+import allure
+import pytest
+from pages import wait_policy
+from pages.wait_policy import WaitMetrics, WaitPolicy, WaitTimeout
+from selenium.common.exceptions import NoSuchElementException
+
+
+class FakeClock:
+    """Подменяет time в wait_policy: sleep не ждёт, а сдвигает monotonic."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(wait_policy, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def waits(clock):
+    return WaitPolicy(driver=None, budget=5.0, initial_poll=0.1, max_poll=1.0,
+                      backoff=2.0, metrics=WaitMetrics())
+
+
+def ready_at(clock, moment: float, value="element"):
+    """Условие, которое становится истинным в момент moment по поддельным часам."""
+    return lambda driver: value if clock.now >= moment else False
+
+
+@allure.epic("Ожидания UI")
+class TestWaitPolicy:
+    """Опрос условий и объяснение таймаутов WaitPolicy на поддельных часах."""
+
+    @allure.title("Интервал опроса растёт в backoff раз до max_poll")
+    def test_adaptive_polling(self, clock, waits):
+        assert waits.until(ready_at(clock, 3.0), "элемент") == "element"
+        assert clock.sleeps == pytest.approx([0.1, 0.2, 0.4, 0.8, 1.0, 1.0])
+
+        stats = waits.metrics.actions["элемент"]
+        assert (stats["calls"], stats["polls"], stats["timeouts"]) == (1, 7, 0)
+        assert stats["wait_time"] == pytest.approx(3.5)
+
+    @allure.title("Готовое условие не ждёт")
+    def test_immediate_success(self, clock, waits):
+        assert waits.until(lambda driver: True, "элемент")
+        assert clock.sleeps == []
+
+    @allure.title("Таймаут объясняет, чего и сколько ждали")
+    def test_timeout_explanation(self, clock, waits):
+        def missing(driver):
+            raise NoSuchElementException("no such element: .search")
+
+        with pytest.raises(WaitTimeout) as error:
+            waits.until(missing, "кнопка поиска")
+
+        assert clock.now == pytest.approx(5.0)
+        message = error.value.msg
+        assert message == waits.last_timeout
+        assert "не дождались «кнопка поиска»" in message
+        assert "ждали 5.00 с" in message and "опросов 9" in message
+        assert "последняя ошибка: NoSuchElementException" in message
+        assert "no such element: .search" in message
+        assert waits.metrics.actions["кнопка поиска"]["timeouts"] == 1
+
+    @allure.title("Вложенные ожидания действия расходуют один бюджет")
+    def test_shared_budget(self, clock, waits):
+        with waits.action("search"):
+            waits.until(ready_at(clock, 4.0), "форма")
+            with pytest.raises(WaitTimeout) as error:
+                waits.until(ready_at(clock, 10.0), "результаты")
+
+        assert clock.now == pytest.approx(5.0)
+        assert "в действии «search»" in error.value.msg
+        assert "условие возвращало ложное значение" in error.value.msg
+        stats = waits.metrics.actions["search"]
+        assert (stats["calls"], stats["timeouts"]) == (1, 1)
+        assert stats["total_time"] == pytest.approx(5.0)
+
+    @allure.title("Таймаут без ожидания сообщает об израсходованном бюджете")
+    def test_exhausted_budget(self, clock, waits):
+        with waits.action("search"):
+            clock.sleep(6.0)
+            with pytest.raises(WaitTimeout) as error:
+                waits.until(lambda driver: False, "результаты")
+
+        assert "опросов 1" in error.value.msg
+        assert "бюджет израсходован предыдущими ожиданиями" in error.value.msg
@@ -0,0 +1,242 @@
+import numpy as np
+
+
+class Ticket:
+    """Билет из ответа prices_for_dates (компактная запись на __slots__)."""
+
+    __slots__ = ("origin", "destination", "price", "airline", "flight_number",
+                 "departure_at", "return_at", "transfers", "duration", "link")
+
+    def __init__(self, origin=None, destination=None, price=None, airline=None,
+                 flight_number=None, departure_at=None, return_at=None,
+                 transfers=None, duration=None, link=None):
+        self.origin = origin
+        self.destination = destination
+        self.price = price
+        self.airline = airline
+        self.flight_number = flight_number
+        self.departure_at = departure_at
+        self.return_at = return_at
+        self.transfers = transfers
+        self.duration = duration
+        self.link = link
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Ticket":
+        return cls(**{name: data.get(name) for name in cls.__slots__})
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return (f"Ticket({self.origin}->{self.destination}, {self.departure_at}, "
+                f"{self.airline}, {self.price})")
+
+
+class TicketSet:
+    """Колоночный набор билетов на массивах NumPy для быстрой аналитики цен.
+
+    Колонки: price, departure_at (datetime64, местное время вылета),
+    airline (коды категорий + справочник airlines), transfers, duration.
+    Операции группировки и агрегации выполняются векторно, без циклов
+    по словарям билетов. Остальные поля билета (PASSTHROUGH, в том числе
+    исходная строка departure_at с часовым поясом) хранятся как есть
+    в fields, чтобы подмножество набора превращалось обратно в те же билеты.
+    """
+
+    KEYS = ("day", "airline", "transfers")
+    AGGREGATES = ("min", "max", "sum", "mean", "count")
+    PASSTHROUGH = ("origin", "destination", "flight_number", "departure_at", "return_at", "link")
+
+    def __init__(self, price, departure_at, airline_codes, airlines, transfers, duration,
+                 fields: dict = None):
+        self.price = np.asarray(price, dtype=np.int64)
+        self.departure_at = np.asarray(departure_at, dtype="datetime64[s]")
+        self.airline_codes = np.asarray(airline_codes, dtype=np.int32)
+        self.airlines = np.asarray(airlines, dtype=object)
+        self.transfers = np.asarray(transfers, dtype=np.int8)
+        self.duration = np.asarray(duration, dtype=np.int32)
+        fields = fields or {}
+        self.fields = {name: np.asarray(fields[name], dtype=object) if name in fields
+                       else np.full(len(self.price), None, dtype=object)
+                       for name in self.PASSTHROUGH}
+
+    @classmethod
+    def from_tickets(cls, tickets) -> "TicketSet":
+        """Строит набор из словарей билетов (поле data ответа API) или Ticket."""
+        tickets = [ticket.to_dict() if isinstance(ticket, Ticket) else ticket
+                   for ticket in tickets]
+        # Смещение часового пояса отбрасывается: группировка идёт по местной дате вылета
+        departure_at = np.array([ticket["departure_at"][:19] for ticket in tickets],
+                                dtype="datetime64[s]")
+        airlines, codes = np.unique(
+            np.array([ticket.get("airline") or "" for ticket in tickets], dtype=object),
+            return_inverse=True)
+        return cls(
+            price=np.fromiter((ticket["price"] for ticket in tickets), np.int64, len(tickets)),
+            departure_at=departure_at,
+            airline_codes=codes,
+            airlines=airlines,
+            transfers=np.fromiter((ticket.get("transfers") or 0 for ticket in tickets),
+                                  np.int8, len(tickets)),
+            duration=np.fromiter((ticket.get("duration") or 0 for ticket in tickets),
+                                 np.int32, len(tickets)),
+            fields={name: [ticket.get(name) for ticket in tickets] for name in cls.PASSTHROUGH},
+        )
+
+    @classmethod
+    def from_responses(cls, *responses) -> "TicketSet":
+        """Строит набор из одного или нескольких ответов prices_for_dates."""
+        tickets = []
+        for response in responses:
+            tickets.extend(response.get("data", []))
+        return cls.from_tickets(tickets)
+
+    def __len__(self):
+        return len(self.price)
+
+    @property
+    def nbytes(self) -> int:
+        """Объём массивов набора (для полей fields — только ссылки на значения)."""
+        return (self.price.nbytes + self.departure_at.nbytes + self.airline_codes.nbytes
+                + self.transfers.nbytes + self.duration.nbytes
+                + sum(column.nbytes for column in self.fields.values()))
+
+    @property
+    def departure_day(self):
+        return self.departure_at.astype("datetime64[D]")
+
+    @property
+    def airline(self):
+        return self.airlines[self.airline_codes]
+
+    def filter(self, mask) -> "TicketSet":
+        """Возвращает подмножество билетов по булевой маске или индексам."""
+        return TicketSet(self.price[mask], self.departure_at[mask], self.airline_codes[mask],
+                         self.airlines, self.transfers[mask], self.duration[mask],
+                         {name: column[mask] for name, column in self.fields.items()})
+
+    def _key(self, key: str):
+        if key == "day":
+            return self.departure_day
+        if key == "airline":
+            return self.airline_codes
+        if key == "transfers":
+            return self.transfers
+        raise ValueError(f"Неизвестный ключ группировки: {key}, доступны {self.KEYS}")
+
+    def _label(self, key: str, value):
+        if key == "day":
+            return str(value)
+        if key == "airline":
+            return self.airlines[value]
+        return int(value)
+
+    def group_by(self, key: str, column: str = "price", agg: str = "min") -> dict:
+        """Агрегирует колонку column по ключу key (day, airline, transfers).
+
+        agg: min, max, sum, mean или count. Возвращает словарь ключ -> значение.
+        Для departure_at доступны min, max и count (значения — datetime).
+        """
+        if agg not in self.AGGREGATES:
+            raise ValueError(f"Неизвестная агрегация: {agg}, доступны {self.AGGREGATES}")
+        if not len(self):
+            return {}
+        groups, inverse = self._group_index(self._key(key))
+        values = getattr(self, column)
+        counts = np.bincount(inverse, minlength=len(groups))
+
+        if agg == "count":
+            result = counts
+        elif agg in ("sum", "mean"):
+            if values.dtype.kind not in "iuf":
+                raise ValueError(f"Агрегация {agg} неприменима к колонке {column}")
+            result = np.bincount(inverse, weights=values, minlength=len(groups))
+            if agg == "mean":
+                result = result / np.maximum(counts, 1)
+        else:
+            # Значения сортируются по группам и сворачиваются по их границам:
+            # годится для любых упорядоченных типов (целые, дробные, даты)
+            present = np.flatnonzero(counts)
+            starts = np.concatenate(([0], np.cumsum(counts[present])[:-1]))
+            ordered = values[np.argsort(inverse, kind="stable")]
+            result = np.empty(len(groups), dtype=values.dtype)
+            result[present] = (np.minimum if agg == "min" else np.maximum).reduceat(
+                ordered, starts)
+
+        present = counts > 0
+        return {self._label(key, group): value.item()
+                for group, value in zip(groups[present], result[present])}
+
+    @staticmethod
+    def _group_index(keys) -> tuple:
+        """Номера групп для ключей: (значения групп, номер группы каждого элемента).
+
+        Ключи-даты и небольшие целые коды нумеруются смещением от минимума
+        без сортировки; остальные — через np.unique.
+        """
+        numeric = keys.view(np.int64) if keys.dtype.kind == "M" else keys
+        if numeric.dtype.kind in "iu":
+            low = numeric.min()
+            inverse = (numeric.astype(np.int64) - int(low)).astype(np.intp)
+            span = int(inverse.max()) + 1
+            if span <= max(len(keys), 1024):
+                groups = (np.arange(span) + low).astype(numeric.dtype)
+                return groups.view(keys.dtype) if keys.dtype.kind == "M" else groups, inverse
+        return np.unique(keys, return_inverse=True)
+
+    def cheapest_per_day(self) -> dict:
+        """Минимальная цена по дате вылета."""
+        return self.group_by("day", "price", "min")
+
+    def price_stats(self, percentiles=(25, 50, 75, 90, 99)) -> dict:
+        """Распределение цен: минимум, максимум, среднее и перцентили."""
+        if not len(self):
+            return {}
+        stats = {
+            "count": len(self),
+            "min": self.price.min().item(),
+            "max": self.price.max().item(),
+            "mean": self.price.mean().item(),
+            "std": self.price.std().item(),
+        }
+        for percent, value in zip(percentiles, np.percentile(self.price, percentiles)):
+            stats[f"p{percent}"] = value.item()
+        return stats
+
+    def price_histogram(self, bins: int = 20) -> tuple:
+        """Гистограмма цен: (количества, границы интервалов)."""
+        return np.histogram(self.price, bins=bins)
+
+    def outlier_mask(self, k: float = 1.5):
+        """Маска выбросов по правилу межквартильного размаха (за Q1 - k*IQR и Q3 + k*IQR)."""
+        if not len(self):
+            return np.zeros(0, dtype=bool)
+        q1, q3 = np.percentile(self.price, (25, 75))
+        spread = k * (q3 - q1)
+        return (self.price < q1 - spread) | (self.price > q3 + spread)
+
+    def outliers(self, k: float = 1.5) -> "TicketSet":
+        """Билеты с аномальной ценой."""
+        return self.filter(self.outlier_mask(k))
+
+    def __getitem__(self, index):
+        """Билет по номеру; маска, срез или массив индексов — подмножество набора."""
+        if not isinstance(index, (int, np.integer)):
+            return self.filter(index)
+        fields = {name: column[index] for name, column in self.fields.items()}
+        if fields["departure_at"] is None:
+            fields["departure_at"] = str(self.departure_at[index])
+        return Ticket(price=self.price[index].item(),
+                      airline=self.airlines[self.airline_codes[index]] or None,
+                      transfers=self.transfers[index].item(),
+                      duration=self.duration[index].item(),
+                      **fields)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def to_tickets(self) -> list:
+        """Билеты набора в виде Ticket."""
+        return list(self)